@@ -0,0 +1,42 @@
+"""on delete cascade
+
+Revision ID: 1c6f0e2a9d4b
+Revises: 73bfa9d984b0
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '1c6f0e2a9d4b'
+down_revision: str | None = '73bfa9d984b0'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('submenu_menu_id_fkey', 'submenu', type_='foreignkey')
+    op.create_foreign_key(
+        'submenu_menu_id_fkey', 'submenu', 'menu',
+        ['menu_id'], ['id'], ondelete='CASCADE'
+    )
+    op.drop_constraint('dish_submenu_id_fkey', 'dish', type_='foreignkey')
+    op.create_foreign_key(
+        'dish_submenu_id_fkey', 'dish', 'submenu',
+        ['submenu_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('dish_submenu_id_fkey', 'dish', type_='foreignkey')
+    op.create_foreign_key(
+        'dish_submenu_id_fkey', 'dish', 'submenu',
+        ['submenu_id'], ['id']
+    )
+    op.drop_constraint('submenu_menu_id_fkey', 'submenu', type_='foreignkey')
+    op.create_foreign_key(
+        'submenu_menu_id_fkey', 'submenu', 'menu',
+        ['menu_id'], ['id']
+    )
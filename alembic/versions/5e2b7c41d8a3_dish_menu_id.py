@@ -0,0 +1,50 @@
+"""dish menu_id
+
+Revision ID: 5e2b7c41d8a3
+Revises: 1c6f0e2a9d4b
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b7c41d8a3'
+down_revision: str | None = '1c6f0e2a9d4b'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column('dish', sa.Column('menu_id', sa.Uuid(), nullable=True))
+    op.execute(
+        'UPDATE dish SET menu_id = submenu.menu_id '
+        'FROM submenu WHERE dish.submenu_id = submenu.id'
+    )
+    op.alter_column('dish', 'menu_id', nullable=False)
+    op.create_unique_constraint(
+        'submenu_id_menu_id_key', 'submenu', ['id', 'menu_id']
+    )
+    op.drop_constraint('dish_submenu_id_fkey', 'dish', type_='foreignkey')
+    op.create_foreign_key(
+        'dish_submenu_id_menu_id_fkey', 'dish', 'submenu',
+        ['submenu_id', 'menu_id'], ['id', 'menu_id'],
+        ondelete='CASCADE', onupdate='CASCADE'
+    )
+    op.create_index(
+        'ix_dish_menu_id_submenu_id_id', 'dish', ['menu_id', 'submenu_id', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dish_menu_id_submenu_id_id', table_name='dish')
+    op.drop_constraint('dish_submenu_id_menu_id_fkey', 'dish', type_='foreignkey')
+    op.create_foreign_key(
+        'dish_submenu_id_fkey', 'dish', 'submenu',
+        ['submenu_id'], ['id'], ondelete='CASCADE'
+    )
+    op.drop_constraint('submenu_id_menu_id_key', 'submenu', type_='unique')
+    op.drop_column('dish', 'menu_id')
@@ -0,0 +1,52 @@
+"""search indexes
+
+Revision ID: 8d3f6a0b2c71
+Revises: 5e2b7c41d8a3
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f6a0b2c71'
+down_revision: str | None = '5e2b7c41d8a3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column(
+        'dish',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('russian', title || ' ' || description)",
+                persisted=True
+            ),
+            nullable=True
+        )
+    )
+    op.create_index(
+        'ix_dish_search_vector', 'dish', ['search_vector'],
+        postgresql_using='gin'
+    )
+    for table_name in ('menu', 'submenu', 'dish'):
+        op.create_index(
+            f'ix_{table_name}_title_trgm', table_name, ['title'],
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    for table_name in ('menu', 'submenu', 'dish'):
+        op.drop_index(f'ix_{table_name}_title_trgm', table_name=table_name)
+    op.drop_index('ix_dish_search_vector', table_name='dish')
+    op.drop_column('dish', 'search_vector')
@@ -0,0 +1,24 @@
+"""dish price index
+
+Revision ID: b4a9e17c5f20
+Revises: 8d3f6a0b2c71
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4a9e17c5f20'
+down_revision: str | None = '8d3f6a0b2c71'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_dish_submenu_id_price', 'dish', ['submenu_id', 'price'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dish_submenu_id_price', table_name='dish')
@@ -0,0 +1,40 @@
+"""menu soft delete
+
+Revision ID: e1a7c3d95b42
+Revises: b4a9e17c5f20
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c3d95b42'
+down_revision: str | None = 'b4a9e17c5f20'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'menu', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    op.create_index(
+        'ix_menu_deleted_at', 'menu', ['deleted_at'],
+        postgresql_where=sa.text('deleted_at IS NOT NULL')
+    )
+    op.drop_constraint('menu_title_key', 'menu', type_='unique')
+    op.create_index(
+        'ix_menu_title_active', 'menu', ['title'], unique=True,
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_menu_title_active', table_name='menu')
+    op.create_unique_constraint('menu_title_key', 'menu', ['title'])
+    op.drop_index('ix_menu_deleted_at', table_name='menu')
+    op.drop_column('menu', 'deleted_at')
@@ -1,3 +1,5 @@
 from app.api.endpoints.dish import router as dish_router  # noqa
 from app.api.endpoints.menu import router as menu_router  # noqa
 from app.api.endpoints.submenu import router as submenu_router  # noqa
+from app.api.endpoints.monitoring import router as monitoring_router  # noqa
+from app.api.endpoints.search import router as search_router  # noqa
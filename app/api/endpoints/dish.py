@@ -2,9 +2,11 @@ import uuid
 from http import HTTPStatus
 from typing import Sequence
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Path
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Path
 
 from app.core.constants import (
+    BULK_MAX_SIZE,
+    BULK_TAG,
     DELETE_TAG,
     DISH_ID_DESCR,
     GET_LIST_TAG,
@@ -16,7 +18,15 @@ from app.core.constants import (
 )
 from app.core.custom_types import DishCachedDiscountDict, DishDiscountDict
 from app.models import Dish
-from app.schemas.dish import DishCreate, DishDB, DishDiscountDB, DishUpdate
+from app.schemas.dish import (
+    DishBulkUpdate,
+    DishCreate,
+    DishDB,
+    DishDiscountCompactDB,
+    DishDiscountDB,
+    DishFilter,
+    DishUpdate,
+)
 from app.schemas.errors import DishNotFoundError, URLDoesNotExistError
 from app.services.dish import DishService
 
@@ -25,7 +35,7 @@ router = APIRouter()
 
 @router.get(
     '/{menu_id}/submenus/{submenu_id}/dishes',
-    response_model=list[DishDiscountDB],
+    response_model=list[DishDiscountDB] | list[DishDiscountCompactDB],
     responses={404: {'model': URLDoesNotExistError}},
     summary='Получение списка блюд',
     response_description='Успешное получение списка блюд',
@@ -34,11 +44,16 @@ router = APIRouter()
 async def get_all_dishes(
     menu_id: uuid.UUID = Path(..., description=MENU_ID_DESCR),
     submenu_id: uuid.UUID = Path(..., description=SUBMENU_ID_DESCR),
+    filters: DishFilter = Depends(),
     dish_service: DishService = Depends()
 ) -> Sequence[DishDiscountDict | DishCachedDiscountDict]:
     """
     Получить список всех блюд.
 
+    Блюда можно отфильтровать по цене (с учетом скидки) и наличию скидки,
+    а также отсортировать по цене или названию. В компактном режиме
+    (`compact=true`) описания блюд не возвращаются.
+
     - **id**: Идентификатор блюда.
     - **title**: Название блюда.
     - **description**: Описание блюда.
@@ -46,7 +61,7 @@ async def get_all_dishes(
     - **discount**: Скидка на блюдо.
     - **submenu_id**: Идентификатор связанного подменю.
     """
-    return await dish_service.get_list(menu_id, submenu_id)
+    return await dish_service.get_list(menu_id, submenu_id, filters)
 
 
 @router.post(
@@ -78,6 +93,98 @@ async def create_dish(
     return await dish_service.create(menu_id, submenu_id, dish, background_tasks)
 
 
+@router.post(
+    '/{menu_id}/submenus/{submenu_id}/dishes/bulk',
+    response_model=list[DishDB],
+    status_code=HTTPStatus.CREATED,
+    responses={404: {'model': URLDoesNotExistError}},
+    summary='Пакетное создание блюд',
+    response_description='Успешное создание блюд',
+    tags=[BULK_TAG]
+)
+async def create_dishes_bulk(
+    dishes: list[DishCreate] = Body(..., min_length=1, max_length=BULK_MAX_SIZE),
+    menu_id: uuid.UUID = Path(..., description=MENU_ID_DESCR),
+    submenu_id: uuid.UUID = Path(..., description=SUBMENU_ID_DESCR),
+    dish_service: DishService = Depends(),
+    *,
+    background_tasks: BackgroundTasks
+) -> list[Dish]:
+    """
+    Создать несколько блюд одним запросом.
+
+    Все блюда создаются в одной транзакции: при ошибке
+    не создается ни одно из них.
+
+    - **id**: Идентификатор блюда.
+    - **title**: Название блюда.
+    - **description**: Описание блюда.
+    - **price**: Цена блюда.
+    - **submenu_id**: Идентификатор связанного подменю.
+    """
+    return await dish_service.create_bulk(menu_id, submenu_id, dishes, background_tasks)
+
+
+@router.patch(
+    '/{menu_id}/submenus/{submenu_id}/dishes/bulk',
+    response_model=list[DishDB],
+    responses={404: {'model': DishNotFoundError}},
+    summary='Пакетное обновление блюд',
+    response_description='Успешное обновление блюд',
+    tags=[BULK_TAG]
+)
+async def update_dishes_bulk(
+    objs_in: list[DishBulkUpdate] = Body(..., min_length=1, max_length=BULK_MAX_SIZE),
+    menu_id: uuid.UUID = Path(..., description=MENU_ID_DESCR),
+    submenu_id: uuid.UUID = Path(..., description=SUBMENU_ID_DESCR),
+    dish_service: DishService = Depends(),
+    *,
+    background_tasks: BackgroundTasks
+) -> list[Dish]:
+    """
+    Изменить несколько блюд в одной транзакции.
+
+    Если хотя бы одно блюдо не найдено, изменения не применяются.
+
+    - **id**: Идентификатор блюда.
+    - **title**: Название блюда.
+    - **description**: Описание блюда.
+    - **price**: Цена блюда.
+    - **submenu_id**: Идентификатор связанного подменю.
+    """
+    return await dish_service.update_bulk(menu_id, submenu_id, objs_in, background_tasks)
+
+
+@router.delete(
+    '/{menu_id}/submenus/{submenu_id}/dishes/bulk',
+    response_model=list[DishDB],
+    responses={404: {'model': DishNotFoundError}},
+    summary='Пакетное удаление блюд',
+    response_description='Успешное удаление блюд',
+    tags=[BULK_TAG]
+)
+async def delete_dishes_bulk(
+    dish_ids: list[uuid.UUID] = Body(..., min_length=1, max_length=BULK_MAX_SIZE),
+    menu_id: uuid.UUID = Path(..., description=MENU_ID_DESCR),
+    submenu_id: uuid.UUID = Path(..., description=SUBMENU_ID_DESCR),
+    dish_service: DishService = Depends(),
+    *,
+    background_tasks: BackgroundTasks
+) -> list[Dish]:
+    """
+    Удалить несколько блюд по списку id.
+
+    Если хотя бы одно блюдо не найдено, ничего не удаляется.
+
+    - **id**: Идентификатор блюда.
+    - **title**: Название блюда.
+    - **description**: Описание блюда.
+    - **price**: Цена блюда.
+    - **submenu_id**: Идентификатор связанного подменю.
+    """
+    return await dish_service.delete_bulk(menu_id, submenu_id, dish_ids, background_tasks)
+
+
 @router.get(
     '/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}',
     response_model=DishDiscountDB,
@@ -19,10 +19,12 @@ from app.core.custom_types import (
     MenuNestedDiscountDict,
 )
 from app.models import Menu
-from app.schemas.errors import MenuNotFoundError
+from app.schemas.dish import DishFilter
+from app.schemas.errors import DatabaseTimeoutError, MenuNotFoundError
 from app.schemas.menu import (
     MenuCreate,
     MenuDB,
+    MenuNestedSubmenusCompactDB,
     MenuNestedSubmenusDB,
     MenuUpdate,
     MenuWithCountDB,
@@ -56,16 +58,24 @@ async def get_all_menus(
 
 @router.get(
     '/all',
-    response_model=list[MenuNestedSubmenusDB],
+    response_model=list[MenuNestedSubmenusDB] | list[MenuNestedSubmenusCompactDB],
+    responses={503: {'model': DatabaseTimeoutError}},
     summary='Получение списка меню с вложенными подменю и блюдами',
     response_description='Успешное получение списка меню',
     tags=[GET_LIST_TAG]
 )
 async def get_all_nested(
+    filters: DishFilter = Depends(),
     menu_service: MenuService = Depends()
 ) -> Sequence[MenuNestedDiscountDict | MenuCachedNestedDiscountDict]:
-    """Получить список всех меню с вложенными подменю и блюдами."""
-    return await menu_service.get_all_nested()
+    """
+    Получить список всех меню с вложенными подменю и блюдами.
+
+    Блюда можно отфильтровать по цене (с учетом скидки) и наличию скидки,
+    а также отсортировать по цене или названию. В компактном режиме
+    (`compact=true`) описания меню, подменю и блюд не возвращаются.
+    """
+    return await menu_service.get_all_nested(filters)
 
 
 @router.post(
@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+
+from app.core.custom_types import PoolStatsDict
+from app.core.db import engine, get_pool_stats
+from app.schemas.monitoring import PoolStatsDB
+
+router = APIRouter()
+
+
+@router.get(
+    '/db-pool',
+    response_model=PoolStatsDB,
+    summary='Получение статистики пула соединений',
+    response_description='Успешное получение статистики пула соединений'
+)
+async def get_db_pool_stats() -> PoolStatsDict:
+    """
+    Получить статистику пула соединений с базой данных.
+
+    - **pool_size**: Количество постоянных соединений в пуле.
+    - **checked_out**: Количество выданных соединений.
+    - **overflow**: Количество соединений сверх размера пула.
+    - **checkouts**: Общее количество выдач соединений.
+    - **wait_time_avg**: Среднее время ожидания соединения в секундах.
+    - **wait_time_max**: Максимальное время ожидания соединения в секундах.
+    - **statement_timeouts**: Количество запросов, прерванных по `statement_timeout`.
+    - **lock_timeouts**: Количество запросов, прерванных по `lock_timeout`.
+    """
+    return get_pool_stats(engine)
@@ -0,0 +1,52 @@
+from typing import Sequence
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.constants import (
+    SEARCH_LIMIT_DEFAULT,
+    SEARCH_LIMIT_MAX,
+    SEARCH_QUERY_MAX_LEN,
+)
+from app.core.custom_types import DishCachedSearchDict, DishSearchDict
+from app.schemas.dish import DishSearchDB
+from app.services.search import SearchService
+
+router = APIRouter()
+
+
+@router.get(
+    '/',
+    response_model=list[DishSearchDB],
+    summary='Поиск блюд',
+    response_description='Успешное получение результатов поиска'
+)
+async def search_dishes(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=SEARCH_QUERY_MAX_LEN,
+        description='Поисковый запрос'
+    ),
+    limit: int = Query(
+        SEARCH_LIMIT_DEFAULT,
+        ge=1,
+        le=SEARCH_LIMIT_MAX,
+        description='Количество результатов на странице'
+    ),
+    offset: int = Query(0, ge=0, description='Смещение от начала результатов'),
+    search_service: SearchService = Depends()
+) -> Sequence[DishSearchDict | DishCachedSearchDict]:
+    """
+    Найти блюда по названию и описанию, а также по названиям подменю и меню.
+
+    Результаты упорядочены по релевантности.
+
+    - **id**: Идентификатор блюда.
+    - **title**: Название блюда.
+    - **description**: Описание блюда.
+    - **price**: Цена блюда с учетом скидки.
+    - **discount**: Размер скидки.
+    - **submenu_id**: Идентификатор связанного подменю.
+    - **menu_id**: Идентификатор связанного меню.
+    """
+    return await search_service.search(q, limit, offset)
@@ -2,9 +2,11 @@ import uuid
 from http import HTTPStatus
 from typing import Sequence
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Path
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Path
 
 from app.core.constants import (
+    BULK_MAX_SIZE,
+    BULK_TAG,
     DELETE_TAG,
     GET_LIST_TAG,
     GET_TAG,
@@ -17,6 +19,7 @@ from app.core.custom_types import SubmenuAnnotatedDict, SubmenuCachedDict
 from app.models import Submenu
 from app.schemas.errors import SubmenuNotFoundError, URLDoesNotExistError
 from app.schemas.submenu import (
+    SubmenuBulkUpdate,
     SubmenuCreate,
     SubmenuDB,
     SubmenuUpdate,
@@ -78,6 +81,92 @@ async def create_submenu(
     return await submenu_service.create(menu_id, submenu, background_tasks)
 
 
+@router.post(
+    '/{menu_id}/submenus/bulk',
+    response_model=list[SubmenuDB],
+    status_code=HTTPStatus.CREATED,
+    responses={404: {'model': URLDoesNotExistError}},
+    summary='Пакетное создание подменю',
+    response_description='Успешное создание подменю',
+    tags=[BULK_TAG]
+)
+async def create_submenus_bulk(
+    submenus: list[SubmenuCreate] = Body(..., min_length=1, max_length=BULK_MAX_SIZE),
+    menu_id: uuid.UUID = Path(..., description=MENU_ID_DESCR),
+    submenu_service: SubmenuService = Depends(),
+    *,
+    background_tasks: BackgroundTasks
+) -> list[Submenu]:
+    """
+    Создать несколько подменю одним запросом.
+
+    Все подменю создаются в одной транзакции: при ошибке
+    не создается ни одно из них.
+
+    - **id**: Идентификатор подменю.
+    - **title**: Название подменю.
+    - **description**: Описание подменю.
+    - **menu_id**: Идентификатор связанного меню.
+    """
+    return await submenu_service.create_bulk(menu_id, submenus, background_tasks)
+
+
+@router.patch(
+    '/{menu_id}/submenus/bulk',
+    response_model=list[SubmenuDB],
+    responses={404: {'model': SubmenuNotFoundError}},
+    summary='Пакетное обновление подменю',
+    response_description='Успешное обновление подменю',
+    tags=[BULK_TAG]
+)
+async def update_submenus_bulk(
+    objs_in: list[SubmenuBulkUpdate] = Body(..., min_length=1, max_length=BULK_MAX_SIZE),
+    menu_id: uuid.UUID = Path(..., description=MENU_ID_DESCR),
+    submenu_service: SubmenuService = Depends(),
+    *,
+    background_tasks: BackgroundTasks
+) -> list[Submenu]:
+    """
+    Изменить несколько подменю в одной транзакции.
+
+    Если хотя бы одно подменю не найдено, изменения не применяются.
+
+    - **id**: Идентификатор подменю.
+    - **title**: Название подменю.
+    - **description**: Описание подменю.
+    - **menu_id**: Идентификатор связанного меню.
+    """
+    return await submenu_service.update_bulk(menu_id, objs_in, background_tasks)
+
+
+@router.delete(
+    '/{menu_id}/submenus/bulk',
+    response_model=list[SubmenuDB],
+    responses={404: {'model': SubmenuNotFoundError}},
+    summary='Пакетное удаление подменю',
+    response_description='Успешное удаление подменю',
+    tags=[BULK_TAG]
+)
+async def delete_submenus_bulk(
+    submenu_ids: list[uuid.UUID] = Body(..., min_length=1, max_length=BULK_MAX_SIZE),
+    menu_id: uuid.UUID = Path(..., description=MENU_ID_DESCR),
+    submenu_service: SubmenuService = Depends(),
+    *,
+    background_tasks: BackgroundTasks
+) -> list[Submenu]:
+    """
+    Удалить несколько подменю по списку id.
+
+    Если хотя бы одно подменю не найдено, ничего не удаляется.
+
+    - **id**: Идентификатор подменю.
+    - **title**: Название подменю.
+    - **description**: Описание подменю.
+    - **menu_id**: Идентификатор связанного меню.
+    """
+    return await submenu_service.delete_bulk(menu_id, submenu_ids, background_tasks)
+
+
 @router.get(
     '/{menu_id}/submenus/{submenu_id}',
     response_model=SubmenuWithCountDB,
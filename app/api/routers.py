@@ -1,7 +1,19 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import dish_router, menu_router, submenu_router
-from app.core.constants import DISH_TAG, MENU_TAG, SUBMENU_TAG
+from app.api.endpoints import (
+    dish_router,
+    menu_router,
+    monitoring_router,
+    search_router,
+    submenu_router,
+)
+from app.core.constants import (
+    DISH_TAG,
+    MENU_TAG,
+    MONITORING_TAG,
+    SEARCH_TAG,
+    SUBMENU_TAG,
+)
 
 PREFIX = '/menus'
 
@@ -9,3 +21,5 @@ main_router = APIRouter()
 main_router.include_router(menu_router, prefix=PREFIX, tags=[MENU_TAG])
 main_router.include_router(submenu_router, prefix=PREFIX, tags=[SUBMENU_TAG])
 main_router.include_router(dish_router, prefix=PREFIX, tags=[DISH_TAG])
+main_router.include_router(search_router, prefix='/search', tags=[SEARCH_TAG])
+main_router.include_router(monitoring_router, prefix='/monitoring', tags=[MONITORING_TAG])
@@ -10,15 +10,36 @@ class Settings(BaseSettings):
     db_password: str
     db_host: str
     db_port: str
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_connect_timeout: float = 10.0
+    db_statement_cache_size: int = 100
+    db_transaction_pooling: bool = False
+    db_replica_urls: str | None = None
+    db_replica_pin_seconds: int = 0
+    db_statement_timeout: int = 5000
+    db_lock_timeout: int = 2000
+    db_nested_statement_timeout: int = 30000
+    db_worker_statement_timeout: int = 600000
     redis_host: str = 'localhost'
     redis_port: int = 6379
     cache_lifetime: int = 60
+    menu_soft_delete: bool = False
+    menu_purge_interval: float = 15.0
     rabbitmq_default_user: str = 'guest'
     rabbitmq_default_pass: str = 'guest'
     rabbitmq_host: str = 'localhost'
     rabbitmq_port: int = 5672
     google_sheet_id: str
     use_google_sheets: bool = False
+    sync_fingerprint_lifetime: int = 3600
+    sync_poll_interval: float = 15.0
+    sync_watch: bool = False
+    sync_watch_poll_interval: float = 300.0
+    sync_watch_debounce: int = 1000
     type: str | None = None
     project_id: str | None = None
     private_key_id: str | None = None
@@ -39,6 +60,11 @@ db_url = (
     f'@{settings.db_host}:{settings.db_port}/{settings.db_name}'
 )
 
+replica_urls = [
+    url.strip() for url in (settings.db_replica_urls or '').split(',')
+    if url.strip()
+]
+
 broker_url = (
     f'amqp://{settings.rabbitmq_default_user}:{settings.rabbitmq_default_pass}'
     f'@{settings.rabbitmq_host}:{settings.rabbitmq_port}'
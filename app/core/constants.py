@@ -9,6 +9,17 @@ SUBMENU_DESCR_MAX_LEN = 200
 DISH_TITLE_MAX_LEN = 50
 DISH_DESCR_MAX_LEN = 1000
 PRICE_SCALE = 2
+BULK_MAX_SIZE = 1000
+MENU_PURGE_BATCH_SIZE = 1000
+TABLE_COLUMNS = 7
+TABLE_LAST_COLUMN = 'G'
+GOOGLE_SHEET_PAGE_ROWS = 1000
+GOOGLE_SHEET_BATCH_PAGES = 5
+GOOGLE_SHEET_WORKERS = 4
+SEARCH_CONFIG = 'russian'
+SEARCH_QUERY_MAX_LEN = 100
+SEARCH_LIMIT_DEFAULT = 20
+SEARCH_LIMIT_MAX = 100
 
 MENU_ID_DESCR = 'Идентификатор меню'
 SUBMENU_ID_DESCR = 'Идентификатор подменю'
@@ -19,9 +30,12 @@ POST_TAG = 'POST-запросы (создание объекта)'
 GET_TAG = 'GET-запросы (получение определенного объекта)'
 PATCH_TAG = 'PATCH-запросы (обновление объекта)'
 DELETE_TAG = 'DELETE-запросы (удаление объекта)'
+BULK_TAG = 'Пакетные запросы (несколько объектов)'
 MENU_TAG = 'Меню'
 SUBMENU_TAG = 'Подменю'
 DISH_TAG = 'Блюда'
+MONITORING_TAG = 'Мониторинг'
+SEARCH_TAG = 'Поиск'
 
 TAGS_METADATA = [
     {
@@ -36,6 +50,14 @@ TAGS_METADATA = [
         'name': f'{DISH_TAG}',
         'description': 'Взаимодействие с блюдами.',
     },
+    {
+        'name': f'{SEARCH_TAG}',
+        'description': 'Поиск блюд.',
+    },
+    {
+        'name': f'{MONITORING_TAG}',
+        'description': 'Состояние сервиса.',
+    },
     {
         'name': f'{GET_LIST_TAG}'
     },
@@ -51,4 +73,7 @@ TAGS_METADATA = [
     {
         'name': f'{DELETE_TAG}'
     },
+    {
+        'name': f'{BULK_TAG}'
+    },
 ]
@@ -1,5 +1,5 @@
 import uuid
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 
 class MenuAnnotatedDict(TypedDict):
@@ -42,8 +42,8 @@ class DishDiscountDict(TypedDict):
     """Словарь для данных о блюде со скидкой."""
     id: uuid.UUID
     title: str
-    description: str
-    price: str
+    description: NotRequired[str]
+    price: float
     discount: str
     submenu_id: uuid.UUID
 
@@ -52,17 +52,27 @@ class DishCachedDiscountDict(TypedDict):
     """Словарь для кэшированных данных о блюде со скидкой."""
     id: str
     title: str
-    description: str
+    description: NotRequired[str]
     price: float
     discount: str
     submenu_id: str
 
 
+class DishSearchDict(DishDiscountDict):
+    """Словарь для данных о найденном блюде со скидкой."""
+    menu_id: uuid.UUID
+
+
+class DishCachedSearchDict(DishCachedDiscountDict):
+    """Словарь для кэшированных данных о найденном блюде со скидкой."""
+    menu_id: str
+
+
 class DishDict(TypedDict):
     """Словарь для данных о блюде."""
     id: uuid.UUID
     title: str
-    description: str
+    description: NotRequired[str]
     price: float
     submenu_id: uuid.UUID
 
@@ -71,7 +81,7 @@ class SubmenuNestedDiscountDict(TypedDict):
     """Словарь для данных о подменю с вложенными блюдами со скидкой."""
     id: uuid.UUID
     title: str
-    description: str
+    description: NotRequired[str]
     menu_id: uuid.UUID
     dishes: list[DishDiscountDict]
 
@@ -83,7 +93,7 @@ class SubmenuCachedNestedDiscountDict(TypedDict):
     """
     id: str
     title: str
-    description: str
+    description: NotRequired[str]
     menu_id: str
     dishes: list[DishCachedDiscountDict]
 
@@ -95,7 +105,7 @@ class MenuNestedDiscountDict(TypedDict):
     """
     id: uuid.UUID
     title: str
-    description: str
+    description: NotRequired[str]
     submenus: list[SubmenuNestedDiscountDict]
 
 
@@ -106,7 +116,7 @@ class MenuCachedNestedDiscountDict(TypedDict):
     """
     id: str
     title: str
-    description: str
+    description: NotRequired[str]
     submenus: list[SubmenuCachedNestedDiscountDict]
 
 
@@ -114,7 +124,7 @@ class SubmenuNestedDict(TypedDict):
     """Словарь для данных о подменю с вложенными блюдами."""
     id: uuid.UUID
     title: str
-    description: str
+    description: NotRequired[str]
     menu_id: uuid.UUID
     dishes: list[DishDict]
 
@@ -126,5 +136,17 @@ class MenuNestedDict(TypedDict):
     """
     id: uuid.UUID
     title: str
-    description: str
+    description: NotRequired[str]
     submenus: list[SubmenuNestedDict]
+
+
+class PoolStatsDict(TypedDict):
+    """Словарь для статистики пула соединений с базой данных."""
+    pool_size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    wait_time_avg: float
+    wait_time_max: float
+    statement_timeouts: int
+    lock_timeouts: int
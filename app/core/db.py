@@ -1,16 +1,219 @@
-from typing import AsyncIterator
+import random
+import time
+import uuid
+from collections import Counter
+from typing import Any, AsyncIterator, Callable
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Connection, event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, NullPool
 
-from app.core.config import db_url
+from app.core.config import db_url, replica_urls, settings
+from app.core.custom_types import PoolStatsDict
 
-engine = create_async_engine(db_url)
+QUERY_CANCELED = '57014'
+LOCK_NOT_AVAILABLE = '55P03'
+
+query_timeouts: Counter[str] = Counter()
+
+
+class InstrumentedPoolMixin:
+    """
+    Примесь для пулов соединений, собирающая статистику.
+
+    Учитывает количество выданных соединений
+    и время ожидания свободного соединения.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checked_out = 0
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        record = super()._do_get()  # type: ignore[misc]
+        wait_time = time.perf_counter() - start
+        self.checked_out += 1
+        self.checkouts += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+        return record
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        self.checked_out -= 1
+        super()._do_return_conn(record)  # type: ignore[misc]
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """Пул соединений с ограниченным размером и сбором статистики."""
+    pass
+
+
+class InstrumentedNullPool(InstrumentedPoolMixin, NullPool):
+    """
+    Пул без хранения соединений со сбором статистики.
+
+    Используется при подключении через прокси с пулингом
+    на уровне транзакций (например, PgBouncer).
+    """
+    pass
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """
+    Создание движка с параметрами пула и драйвера из настроек.
+
+    Ограничения времени запросов задаются не для соединения,
+    а для каждой транзакции сессии (см. `SessionProvider`).
+    """
+    connect_args: dict[str, Any] = {'timeout': settings.db_connect_timeout}
+    if settings.db_transaction_pooling:
+        connect_args['statement_cache_size'] = 0
+        connect_args['prepared_statement_cache_size'] = 0
+        connect_args['prepared_statement_name_func'] = (
+            lambda: f'__asyncpg_{uuid.uuid4()}__'
+        )
+        return create_async_engine(
+            url,
+            poolclass=InstrumentedNullPool,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            connect_args=connect_args
+        )
+    connect_args['prepared_statement_cache_size'] = settings.db_statement_cache_size
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=connect_args
+    )
+
+
+def get_pool_stats(engine: AsyncEngine) -> PoolStatsDict:
+    """Получение статистики пула соединений движка `engine`."""
+    pool: Any = engine.pool
+    checkouts = getattr(pool, 'checkouts', 0)
+    wait_time_total = getattr(pool, 'wait_time_total', 0.0)
+    is_queue_pool = isinstance(pool, AsyncAdaptedQueuePool)
+    return {
+        'pool_size': pool.size() if is_queue_pool else 0,
+        'checked_out': getattr(pool, 'checked_out', 0),
+        'overflow': max(pool.overflow(), 0) if is_queue_pool else 0,
+        'checkouts': checkouts,
+        'wait_time_avg': wait_time_total / checkouts if checkouts else 0.0,
+        'wait_time_max': getattr(pool, 'wait_time_max', 0.0),
+        'statement_timeouts': query_timeouts[QUERY_CANCELED],
+        'lock_timeouts': query_timeouts[LOCK_NOT_AVAILABLE],
+    }
+
+
+engine = create_engine(db_url)
+
+read_engines = [create_engine(url) for url in replica_urls] or [engine]
 
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession)
 
 
-async def get_async_session() -> AsyncIterator[AsyncSession]:
-    """Асинхронный генератор сессий."""
-    async with AsyncSessionLocal() as session:
-        yield session
+def create_read_session() -> AsyncSession:
+    """Создание сессии, привязанной к случайной реплике из `replica_urls`."""
+    return AsyncSessionLocal(bind=random.choice(read_engines))
+
+
+class SessionProvider:
+    """
+    Ленивый источник сессий основной базы данных и реплики.
+
+    Сессия создается только при первом обращении к ней, поэтому запросы,
+    обслуженные из кэша, не создают сессий и не занимают соединения пула.
+    Если фабрика сессий для чтения не передана, чтение выполняется
+    в сессии основной базы данных.
+
+    В начале каждой транзакции сессий устанавливаются `statement_timeout`
+    (по умолчанию `db_statement_timeout`) и `lock_timeout` до конца
+    транзакции, поэтому ограничения не переходят к другим пользователям
+    соединения и работают при пулинге на уровне транзакций.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        read_session_factory: Callable[[], AsyncSession] | None = None,
+        statement_timeout: int | None = None
+    ) -> None:
+        self._session_factory = session_factory
+        self._read_session_factory = read_session_factory
+        self._session: AsyncSession | None = None
+        self._read_session: AsyncSession | None = None
+        self.statement_timeout = (
+            settings.db_statement_timeout if statement_timeout is None
+            else statement_timeout
+        )
+
+    def _set_timeouts(
+        self,
+        session: Session,
+        transaction: SessionTransaction,
+        connection: Connection
+    ) -> None:
+        """
+        Установка ограничений времени выполнения запросов и ожидания
+        блокировок (в миллисекундах, `0` - без ограничения)
+        до конца начатой транзакции.
+        """
+        connection.execute(
+            select(
+                func.set_config('statement_timeout', str(self.statement_timeout), True),
+                func.set_config('lock_timeout', str(settings.db_lock_timeout), True)
+            )
+        )
+
+    def _create_session(self, factory: Callable[[], AsyncSession]) -> AsyncSession:
+        """Создание сессии с ограничениями времени для каждой транзакции."""
+        session = factory()
+        event.listen(session.sync_session, 'after_begin', self._set_timeouts)
+        return session
+
+    @property
+    def session(self) -> AsyncSession:
+        """Сессия основной базы данных."""
+        if self._session is None:
+            self._session = self._create_session(self._session_factory)
+        return self._session
+
+    @property
+    def read_session(self) -> AsyncSession:
+        """Сессия только для чтения."""
+        if self._read_session_factory is None:
+            return self.session
+        if self._read_session is None:
+            self._read_session = self._create_session(self._read_session_factory)
+        return self._read_session
+
+    async def close(self) -> None:
+        """Закрыть созданные сессии."""
+        for session in (self._session, self._read_session):
+            if session is not None:
+                await session.close()
+
+
+async def get_session_provider() -> AsyncIterator[SessionProvider]:
+    """
+    Асинхронный генератор ленивых источников сессий.
+
+    Сессии для чтения привязываются к репликам, если они заданы.
+    """
+    provider = SessionProvider(
+        AsyncSessionLocal,
+        create_read_session if replica_urls else None
+    )
+    try:
+        yield provider
+    finally:
+        await provider.close()
@@ -0,0 +1,41 @@
+import os
+import threading
+import time
+import uuid
+
+_COUNTER_BITS = 12
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+_lock = threading.Lock()
+_last_timestamp = 0
+_last_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Генерация упорядоченного по времени UUID версии 7 (RFC 9562).
+
+    Старшие 48 бит содержат время в миллисекундах, поэтому новые значения
+    попадают в правый край B-tree индексов, а сортировка по id совпадает
+    с порядком создания. В пределах одной миллисекунды монотонность
+    обеспечивается 12-битным счетчиком; при его переполнении время
+    сдвигается на следующую миллисекунду. Значения совместимы
+    с существующими UUID версии 4 и хранятся в том же столбце.
+    """
+    global _last_timestamp, _last_counter
+    with _lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp <= _last_timestamp:
+            timestamp = _last_timestamp
+            counter = _last_counter + 1
+            if counter > _COUNTER_MAX:
+                timestamp += 1
+                counter = 0
+        else:
+            counter = int.from_bytes(os.urandom(2), 'big') & (_COUNTER_MAX >> 1)
+        _last_timestamp = timestamp
+        _last_counter = counter
+    tail = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    value = (timestamp & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76 | counter << 64 | 0b10 << 62 | tail
+    return uuid.UUID(int=value)
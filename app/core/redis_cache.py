@@ -1,17 +1,24 @@
 import json
 import uuid
-from typing import Any
+from fnmatch import fnmatchcase
+from typing import Any, Collection
 
 import redis.asyncio as redis
 from fastapi.encoders import jsonable_encoder
 from redis.asyncio.client import Redis
 
-from app.core.config import settings
+from app.core.config import replica_urls, settings
 
 LIST_PREFIX = 'list'
 OBJ_PREFIX = 'obj'
 ALL_NESTED_PREFIX = 'all_nested'
 DISCOUNT_PREFIX = 'discount'
+PRIMARY_PIN_KEY = 'primary_pin'
+SEARCH_PREFIX = 'search'
+SYNC_PREFIX = 'sync'
+SYNC_ALL_KEY = f'{SYNC_PREFIX}:all'
+SYNC_MENUS_KEY = f'{SYNC_PREFIX}:menus'
+SYNC_SOURCE_KEY = f'{SYNC_PREFIX}:source'
 
 
 class RedisCache:
@@ -49,25 +56,142 @@ class RedisCache:
             return None
         return json.loads(value)
 
+    async def get_many(self, keys: list[str]) -> list[Any]:
+        """Получить из кэша значения ключей `keys` одним запросом."""
+        if not keys:
+            return []
+        values = await self.client.mget(keys)
+        return [json.loads(value) if value is not None else None for value in values]
+
+    async def hset(self, key: str, field: str, value: Any) -> None:
+        """
+        Записать в хэш `key` поле `field` со значением `value`.
+
+        Время жизни устанавливается для всего хэша только при его создании,
+        поэтому новые поля не продлевают жизнь ранее записанных
+        и хэш целиком истекает не позже чем через `cache_lifetime` секунд.
+        """
+        value = json.dumps(jsonable_encoder(value))
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, field, value)
+            pipe.ttl(key)
+            _, ttl = await pipe.execute()
+        if ttl < 0:
+            await self.client.expire(key, settings.cache_lifetime)
+
+    async def get_search_generation(self) -> str:
+        """
+        Получить текущее поколение кэша поиска.
+
+        Результаты поиска хранятся в отдельных ключах
+        `search:<поколение>:<запрос>` со своим временем жизни. При изменении
+        данных ключ `search` удаляется, и следующий запрос создает новое
+        поколение, а результаты прежнего истекают сами. Поколение нужно
+        получать до запроса к бд, чтобы результат, прочитанный до изменения
+        данных, не попал в новое поколение.
+        """
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(SEARCH_PREFIX, uuid.uuid4().hex, nx=True)
+            pipe.get(SEARCH_PREFIX)
+            _, generation = await pipe.execute()
+        return generation
+
+    async def hget(self, key: str, field: str) -> Any:
+        """Получить из хэша `key` значение поля `field`."""
+        value = await self.client.hget(key, field)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    async def hgetall(self, key: str) -> dict[str, Any]:
+        """Получить из хэша `key` все поля со значениями."""
+        values = await self.client.hgetall(key)
+        return {field: json.loads(value) for field, value in values.items()}
+
+    async def set_sync_fingerprints(
+        self,
+        fingerprint: str,
+        menu_fingerprints: dict[str, str],
+        source_signature: str | None = None
+    ) -> None:
+        """
+        Записать отпечатки примененных табличных данных.
+
+        Общий отпечаток, отпечатки меню (по названию) и сигнатура
+        источника данных заменяются целиком и хранятся
+        `sync_fingerprint_lifetime` секунд, после чего выполняется
+        полная синхронизация.
+        """
+        lifetime = settings.sync_fingerprint_lifetime
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(SYNC_MENUS_KEY, SYNC_SOURCE_KEY)
+            if menu_fingerprints:
+                pipe.hset(
+                    SYNC_MENUS_KEY,
+                    mapping={
+                        title: json.dumps(value)
+                        for title, value in menu_fingerprints.items()
+                    }
+                )
+                pipe.expire(SYNC_MENUS_KEY, lifetime)
+            pipe.set(SYNC_ALL_KEY, json.dumps(fingerprint), ex=lifetime)
+            if source_signature is not None:
+                pipe.set(SYNC_SOURCE_KEY, json.dumps(source_signature), ex=lifetime)
+            await pipe.execute()
+
+    async def pin_primary(self) -> None:
+        """
+        Закрепить чтение за основной базой данных.
+
+        После изменения данных чтение на `db_replica_pin_seconds` секунд
+        направляется в основную базу, чтобы не получить (и не закэшировать)
+        устаревшие данные с отстающей реплики. Закрепление вызывается
+        до фиксации транзакции: иначе между фиксацией и установкой ключа
+        чтение с реплики могло бы закэшировать устаревшие данные.
+
+        Закрепление общее для всех клиентов (один ключ `primary_pin`):
+        любое изменение направляет все чтения в основную базу.
+        Поскольку ключи кэша не привязаны к клиенту, закрепление только
+        для автора изменения не защитило бы кэш от устаревших данных.
+        """
+        if not replica_urls or not settings.db_replica_pin_seconds:
+            return
+        await self.client.set(PRIMARY_PIN_KEY, 1, ex=settings.db_replica_pin_seconds)
+
+    async def is_primary_pinned(self) -> bool:
+        """Проверка, закреплено ли чтение за основной базой данных."""
+        if not replica_urls or not settings.db_replica_pin_seconds:
+            return False
+        return bool(await self.client.exists(PRIMARY_PIN_KEY))
+
     async def invalidate(
         self,
         keys: list[str] | None = None,
-        pattern: str | None = None
+        patterns: list[str] | None = None
     ) -> None:
         """
         Инвалидировать ключи.
 
         Удаляет из кэша ключи из списка `keys`, а также ключи,
-        соответствущие паттерну `pattern`.
+        соответствущие хотя бы одному из паттернов `patterns`.
+        Отпечатки табличных данных и сигнатура источника удаляются
+        при любом изменении, чтобы следующая синхронизация прочитала
+        таблицу и сверила все данные.
+        Для нескольких паттернов ключи перебираются за один проход SCAN
+        и сопоставляются на стороне приложения.
         """
-        keys_to_delete = []
-        if keys is not None:
-            keys_to_delete.extend(keys)
-        if pattern is not None:
-            cur: Any = b'0'
-            while cur:
-                cur, pattern_keys = await self.client.scan(cur, match=pattern)
-            keys_to_delete.extend(pattern_keys)
+        keys_to_delete = [*(keys or []), SYNC_ALL_KEY, SYNC_MENUS_KEY, SYNC_SOURCE_KEY]
+        if patterns:
+            match = patterns[0] if len(patterns) == 1 else None
+            cur: Any = 0
+            while True:
+                cur, found_keys = await self.client.scan(cur, match=match)
+                keys_to_delete.extend(
+                    key for key in found_keys
+                    if match is not None or any(fnmatchcase(key, pattern) for pattern in patterns)
+                )
+                if not cur:
+                    break
         await self.client.delete(*keys_to_delete)
 
     async def invalidate_on_menu_create(self) -> None:
@@ -84,6 +208,7 @@ class RedisCache:
         await self.invalidate(
             keys=[
                 f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
                 f'{LIST_PREFIX}',
                 f'{OBJ_PREFIX}:{menu_id}'
             ]
@@ -94,9 +219,10 @@ class RedisCache:
         await self.invalidate(
             keys=[
                 f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
                 f'{LIST_PREFIX}',
             ],
-            pattern=f'*{menu_id}*'
+            patterns=[f'*{menu_id}*']
         )
 
     async def invalidate_on_submenu_create(self, menu_id: uuid.UUID) -> None:
@@ -119,6 +245,7 @@ class RedisCache:
         await self.invalidate(
             keys=[
                 f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
                 f'{LIST_PREFIX}:{menu_id}',
                 f'{OBJ_PREFIX}:{menu_id}:{submenu_id}'
             ]
@@ -133,11 +260,12 @@ class RedisCache:
         await self.invalidate(
             keys=[
                 f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
                 f'{LIST_PREFIX}',
                 f'{LIST_PREFIX}:{menu_id}',
                 f'{OBJ_PREFIX}:{menu_id}',
             ],
-            pattern=f'*{submenu_id}*'
+            patterns=[f'*{submenu_id}*']
         )
 
     async def invalidate_on_dish_create(
@@ -149,6 +277,7 @@ class RedisCache:
         await self.invalidate(
             keys=[
                 f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
                 f'{LIST_PREFIX}',
                 f'{LIST_PREFIX}:{menu_id}',
                 f'{LIST_PREFIX}:{menu_id}:{submenu_id}',
@@ -167,6 +296,7 @@ class RedisCache:
         await self.invalidate(
             keys=[
                 f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
                 f'{LIST_PREFIX}:{menu_id}:{submenu_id}',
                 f'{OBJ_PREFIX}:{menu_id}:{submenu_id}:{dish_id}'
             ]
@@ -182,14 +312,104 @@ class RedisCache:
         await self.invalidate(
             keys=[
                 f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
                 f'{LIST_PREFIX}',
                 f'{LIST_PREFIX}:{menu_id}',
                 f'{LIST_PREFIX}:{menu_id}:{submenu_id}',
                 f'{OBJ_PREFIX}:{menu_id}',
                 f'{OBJ_PREFIX}:{menu_id}:{submenu_id}',
             ],
-            pattern=f'*{dish_id}*'
+            patterns=[f'*{dish_id}*']
+        )
+
+    async def invalidate_on_submenus_update(
+        self,
+        menu_id: uuid.UUID,
+        submenu_ids: list[uuid.UUID]
+    ) -> None:
+        """Инвалидация кэша при пакетном обновлении субменю."""
+        await self.invalidate(
+            keys=[
+                f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
+                f'{LIST_PREFIX}:{menu_id}',
+                *(f'{OBJ_PREFIX}:{menu_id}:{submenu_id}' for submenu_id in submenu_ids)
+            ]
         )
 
+    async def invalidate_on_submenus_delete(
+        self,
+        menu_id: uuid.UUID,
+        submenu_ids: list[uuid.UUID]
+    ) -> None:
+        """Инвалидация кэша при пакетном удалении субменю."""
+        await self.invalidate(
+            keys=[
+                f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
+                f'{LIST_PREFIX}',
+                f'{LIST_PREFIX}:{menu_id}',
+                f'{OBJ_PREFIX}:{menu_id}',
+            ],
+            patterns=[f'*{submenu_id}*' for submenu_id in submenu_ids]
+        )
+
+    async def invalidate_on_dishes_update(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        dish_ids: list[uuid.UUID]
+    ) -> None:
+        """Инвалидация кэша при пакетном обновлении блюд."""
+        await self.invalidate(
+            keys=[
+                f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
+                f'{LIST_PREFIX}:{menu_id}:{submenu_id}',
+                *(f'{OBJ_PREFIX}:{menu_id}:{submenu_id}:{dish_id}' for dish_id in dish_ids)
+            ]
+        )
+
+    async def invalidate_on_dishes_delete(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        dish_ids: list[uuid.UUID]
+    ) -> None:
+        """Инвалидация кэша при пакетном удалении блюд."""
+        await self.invalidate(
+            keys=[
+                f'{ALL_NESTED_PREFIX}',
+                f'{SEARCH_PREFIX}',
+                f'{LIST_PREFIX}',
+                f'{LIST_PREFIX}:{menu_id}',
+                f'{LIST_PREFIX}:{menu_id}:{submenu_id}',
+                f'{OBJ_PREFIX}:{menu_id}',
+                f'{OBJ_PREFIX}:{menu_id}:{submenu_id}',
+            ],
+            patterns=[f'*{dish_id}*' for dish_id in dish_ids]
+        )
+
+    async def apply_sync(
+        self,
+        values: dict[str, Any],
+        keys: Collection[str]
+    ) -> None:
+        """
+        Применить изменения кэша после синхронизации с таблицей.
+
+        Значения `values` записываются бессрочно, ключи `keys` удаляются
+        вместе с отпечатками табличных данных и сигнатурой источника.
+        Все команды отправляются одним конвейером в транзакции,
+        поэтому читатели не видят частично обновленного кэша.
+        """
+        if not values and not keys:
+            return
+        async with self.client.pipeline(transaction=True) as pipe:
+            for key, value in values.items():
+                pipe.set(key, json.dumps(jsonable_encoder(value)))
+            pipe.delete(*keys, SYNC_ALL_KEY, SYNC_MENUS_KEY, SYNC_SOURCE_KEY)
+            await pipe.execute()
+
 
 cache = RedisCache()
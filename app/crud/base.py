@@ -1,15 +1,28 @@
 import uuid
 from http import HTTPStatus
-from typing import Generic, TypeVar
+from typing import Any, Collection, Generic, Sequence, TypeVar
 
 from fastapi import Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Executable,
+    String,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_async_session
-from app.models import Base
+from app.core.config import settings
+from app.core.db import SessionProvider, get_session_provider
+from app.core.redis_cache import cache
+from app.models import Base, Menu
 
 ModelType = TypeVar('ModelType', bound=Base)
 CreateSchemaType = TypeVar('CreateSchemaType', bound=BaseModel)
@@ -17,15 +30,98 @@ UpdateSchemaType = TypeVar('UpdateSchemaType', bound=BaseModel)
 AnyType = TypeVar('AnyType')
 
 
+def menu_is_active(menu_id: Any) -> ColumnElement[bool]:
+    """
+    Условие существования меню `menu_id`, не помеченного удаленным.
+
+    `menu_id` может быть как значением, так и столбцом внешнего ключа.
+    """
+    return (
+        select(Menu.id)
+        .where(Menu.id == menu_id, Menu.deleted_at.is_(None))
+        .exists()
+    )
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Базовый класс для CRUD-операций."""
 
     def __init__(
         self,
-        session: AsyncSession = Depends(get_async_session)
+        sessions: SessionProvider = Depends(get_session_provider)
     ) -> None:
         self.model: type[ModelType]
-        self.session = session
+        self.sessions = sessions
+
+    @property
+    def session(self) -> AsyncSession:
+        """
+        Сессия основной базы данных.
+
+        Создается при первом обращении.
+        """
+        return self.sessions.session
+
+    @property
+    def read_session(self) -> AsyncSession:
+        """
+        Сессия для чтения.
+
+        Создается при первом обращении.
+        """
+        return self.sessions.read_session
+
+    async def get_read_session(self) -> AsyncSession:
+        """
+        Получение сессии для чтения.
+
+        Возвращает сессию реплики, либо сессию основной базы данных,
+        если чтение закреплено за ней после изменения данных.
+        """
+        if await cache.is_primary_pinned():
+            return self.session
+        return self.read_session
+
+    async def _set_statement_timeout(
+        self,
+        session: AsyncSession,
+        timeout: int
+    ) -> None:
+        """
+        Установка `statement_timeout` (в миллисекундах) для запросов сессии
+        `session` до конца текущей транзакции.
+
+        Используется для запросов, которым требуется больше времени,
+        чем задано для транзакций сессии в `SessionProvider`.
+        """
+        await session.execute(
+            select(func.set_config('statement_timeout', str(timeout), True))
+        )
+
+    async def _fetch_all(self, statement: Executable) -> list[Any]:
+        """
+        Выполнение запроса на чтение в обход ORM.
+
+        Запрос выполняется на уровне соединения (SQLAlchemy Core): строки
+        сразу преобразуются в словари, без создания ORM-объектов
+        и регистрации их в identity map сессии.
+        """
+        session = await self.get_read_session()
+        connection = await session.connection()
+        result = await connection.execute(statement)
+        return [dict(row) for row in result.mappings()]
+
+    async def _fetch_one(self, statement: Executable) -> Any:
+        """
+        Выполнение запроса на чтение одного объекта в обход ORM.
+
+        Возвращает словарь с данными объекта или `None`.
+        """
+        session = await self.get_read_session()
+        connection = await session.connection()
+        result = await connection.execute(statement)
+        row = result.mappings().first()
+        return dict(row) if row is not None else None
 
     def _exists_or_404(
         self,
@@ -44,6 +140,60 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             )
         return obj
 
+    async def _created_or_404(
+        self,
+        obj: AnyType | None,
+        duplicate: ColumnElement[bool],
+        duplicate_detail: str
+    ) -> AnyType:
+        """
+        Проверка результата создания объекта запросом `INSERT ... SELECT`.
+
+        Если объект не создан, а объект, удовлетворяющий условию `duplicate`,
+        уже существует, вызывает HTTPException со статусом 400
+        и сообщением `duplicate_detail`: дубликат названия проверяется раньше,
+        чем существование родительского объекта.
+        Иначе при отсутствии объекта вызывает HTTPException со статусом 404.
+        """
+        if obj is None and await self.session.scalar(select(exists().where(duplicate))):
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=duplicate_detail
+            )
+        return self._exists_or_404(obj, detail='url not found')
+
+    async def release_titles(self, titles: Collection[str]) -> None:
+        """
+        Освобождение названий `titles`, занятых объектами меню,
+        помеченных удаленными.
+
+        Названия подменю и блюд уникальны, в том числе у объектов скрытых меню,
+        поэтому такие объекты переименовываются в строковое представление
+        своего id и удаляются позже вместе с меню. Запрос затрагивает только
+        строки с переданными названиями, поэтому время выполнения не зависит
+        от размера удаленных меню. Выполняется только в режиме `menu_soft_delete`
+        для моделей с полем `menu_id`.
+        """
+        if not settings.menu_soft_delete or not titles:
+            return
+        columns = self.model.__table__.c
+        result: Any = await self.session.execute(
+            update(self.model)
+            .where(columns.title.in_(titles), ~menu_is_active(columns.menu_id))
+            .values(title=cast(self.model.id, String))
+        )
+        if result.rowcount:
+            await self.session.commit()
+
+    async def _menu_is_active_or_404(self, menu_id: uuid.UUID) -> None:
+        """
+        Проверка существования меню `menu_id`, не помеченного удаленным.
+
+        При отсутствии меню вызывает HTTPException со статусом 404.
+        """
+        is_active = await self.session.scalar(select(menu_is_active(menu_id)))
+        self._exists_or_404(is_active or None, detail='url not found')
+
     async def get(
         self,
         obj_id: uuid.UUID
@@ -68,44 +218,265 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_objs = await self.session.execute(select(self.model))
         return db_objs.scalars().all()
 
+    async def _execute_returning(
+        self,
+        statement: Executable
+    ) -> Any:
+        """
+        Выполнение DML-запроса с `RETURNING` и фиксация транзакции.
+
+        Возвращенный объект отсоединяется от сессии, чтобы его атрибуты
+        оставались доступны после commit без повторного запроса к базе.
+        При нарушении ограничений целостности транзакция откатывается,
+        а IntegrityError пробрасывается дальше.
+        """
+        try:
+            db_obj = await self.session.scalar(statement)
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+        if db_obj is not None:
+            self.session.expunge(db_obj)
+        await self.session.commit()
+        return db_obj
+
+    async def _execute_returning_all(
+        self,
+        statement: Executable,
+        params: list[dict[str, Any]] | None = None
+    ) -> list[Any]:
+        """
+        Выполнение DML-запроса с `RETURNING` для нескольких объектов
+        и фиксация транзакции.
+
+        Возвращенные объекты отсоединяются от сессии.
+        При нарушении ограничений целостности транзакция откатывается,
+        а IntegrityError пробрасывается дальше.
+        """
+        try:
+            db_objs = (await self.session.scalars(statement, params)).all()
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+        for db_obj in db_objs:
+            self.session.expunge(db_obj)
+        await self.session.commit()
+        return list(db_objs)
+
     async def create(
         self,
         obj_in: CreateSchemaType,
         **kwargs
     ) -> ModelType:
         """
-        Создание объекта.
+        Создание объекта одним запросом `INSERT ... RETURNING`.
 
         В `**kwargs` передаются поля, отсутствующие в Pydantic-схеме.
         """
         obj_in_data = obj_in.model_dump()
-        db_obj = self.model(**obj_in_data, **kwargs)
-        self.session.add(db_obj)
-        await self.session.commit()
-        await self.session.refresh(db_obj)
-        return db_obj
+        return await self._execute_returning(
+            insert(self.model)
+            .values(**obj_in_data, **kwargs)
+            .returning(self.model)
+        )
+
+    async def create_multi(
+        self,
+        objs_in: list[CreateSchemaType],
+        **kwargs
+    ) -> list[ModelType]:
+        """
+        Создание объектов пакетным запросом `INSERT ... RETURNING`.
+
+        В `**kwargs` передаются общие для всех объектов поля,
+        отсутствующие в Pydantic-схеме. Объекты возвращаются
+        в порядке передачи схем.
+        """
+        return await self._execute_returning_all(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            [{**obj_in.model_dump(), **kwargs} for obj_in in objs_in]
+        )
+
+    async def _update(
+        self,
+        obj_in: UpdateSchemaType,
+        *whereclause: ColumnElement[bool]
+    ) -> ModelType | None:
+        """
+        Частичное обновление объекта, удовлетворяющего условиям `whereclause`,
+        одним запросом `UPDATE ... RETURNING`.
+
+        Если в схеме не передано ни одного поля, объект только запрашивается.
+        """
+        update_data = obj_in.model_dump(exclude_unset=True)
+        if not update_data:
+            return await self.session.scalar(
+                select(self.model).where(*whereclause)
+            )
+        return await self._execute_returning(
+            update(self.model)
+            .where(*whereclause)
+            .values(**update_data)
+            .returning(self.model)
+        )
 
     async def update(
         self,
-        db_obj: ModelType,
+        obj_id: uuid.UUID,
+        obj_in: UpdateSchemaType
+    ) -> ModelType | None:
+        """Частичное обновление объекта по id."""
+        return await self._update(obj_in, self.model.id == obj_id)
+
+    async def update_or_404(
+        self,
+        obj_id: uuid.UUID,
         obj_in: UpdateSchemaType
     ) -> ModelType:
-        """Частичное обновление объекта."""
-        obj_data = jsonable_encoder(db_obj)
-        update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        self.session.add(db_obj)
+        """
+        Частичное обновление объекта по id.
+
+        При отсутствии объекта вызывает HTTPException со статусом 404.
+        """
+        obj = await self.update(obj_id, obj_in)
+        return self._exists_or_404(obj)
+
+    async def _update_multi(
+        self,
+        objs_in: Sequence[UpdateSchemaType],
+        *whereclause: ColumnElement[bool]
+    ) -> list[ModelType] | None:
+        """
+        Частичное обновление объектов, удовлетворяющих условиям `whereclause`.
+
+        Каждая схема в `objs_in` содержит `id` объекта. Наличие объектов
+        проверяется (и строки блокируются) одним запросом, затем все
+        обновления передаются одним вызовом ORM-обновления по первичному
+        ключу (SQLAlchemy сама группирует строки с одинаковым набором
+        полей в `executemany`) в общей транзакции. Объекты возвращаются
+        в порядке передачи схем. Если хотя бы один объект не найден,
+        изменения не выполняются и возвращается `None`.
+        """
+        ids = {obj_in.id for obj_in in objs_in}  # type: ignore[attr-defined]
+        found_ids = set(
+            await self.session.scalars(
+                select(self.model.id)
+                .where(self.model.id.in_(ids), *whereclause)
+                .with_for_update()
+            )
+        )
+        if found_ids != ids:
+            await self.session.rollback()
+            return None
+        update_data = [
+            data for data in (
+                obj_in.model_dump(exclude_unset=True) for obj_in in objs_in
+            ) if data.keys() - {'id'}
+        ]
+        if update_data:
+            try:
+                await self.session.execute(
+                    update(self.model)
+                    .where(*whereclause)
+                    .execution_options(synchronize_session=False),
+                    update_data
+                )
+            except IntegrityError:
+                await self.session.rollback()
+                raise
+        db_objs = {
+            db_obj.id: db_obj for db_obj in
+            await self.session.scalars(select(self.model).where(self.model.id.in_(ids)))
+        }
+        for db_obj in db_objs.values():
+            self.session.expunge(db_obj)
         await self.session.commit()
-        await self.session.refresh(db_obj)
-        return db_obj
+        return [db_objs[obj_in.id] for obj_in in objs_in]  # type: ignore[attr-defined]
+
+    async def _remove(
+        self,
+        *whereclause: ColumnElement[bool]
+    ) -> ModelType | None:
+        """
+        Удаление объекта, удовлетворяющего условиям `whereclause`,
+        одним запросом `DELETE ... RETURNING`.
+
+        Связанные объекты удаляются каскадно на уровне базы данных.
+        """
+        return await self._execute_returning(
+            delete(self.model)
+            .where(*whereclause)
+            .returning(self.model)
+        )
+
+    async def _remove_multi(
+        self,
+        obj_ids: list[uuid.UUID],
+        *whereclause: ColumnElement[bool]
+    ) -> list[ModelType] | None:
+        """
+        Удаление объектов по списку id одним запросом `DELETE ... RETURNING`.
+
+        Если хотя бы один объект не найден среди удовлетворяющих условиям
+        `whereclause`, транзакция откатывается и возвращается `None`.
+        """
+        ids = set(obj_ids)
+        db_objs = (
+            await self.session.scalars(
+                delete(self.model)
+                .where(self.model.id.in_(ids), *whereclause)
+                .returning(self.model)
+            )
+        ).all()
+        if len(db_objs) != len(ids):
+            await self.session.rollback()
+            return None
+        for db_obj in db_objs:
+            self.session.expunge(db_obj)
+        await self.session.commit()
+        return list(db_objs)
+
+    async def bulk_insert(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Вставка строк `rows` пакетным запросом `INSERT`
+        без фиксации транзакции.
+        """
+        if rows:
+            await self.session.execute(insert(self.model), rows)
+
+    async def bulk_update(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Обновление строк по первичному ключу `id` пакетным запросом
+        `UPDATE` без фиксации транзакции.
+        """
+        if rows:
+            await self.session.execute(
+                update(self.model).execution_options(synchronize_session=False),
+                rows
+            )
+
+    async def bulk_delete(self, obj_ids: list[uuid.UUID]) -> None:
+        """Удаление объектов по списку id без фиксации транзакции."""
+        if obj_ids:
+            await self.session.execute(
+                delete(self.model).where(self.model.id.in_(obj_ids))
+            )
 
     async def remove(
         self,
-        db_obj: ModelType
+        obj_id: uuid.UUID
+    ) -> ModelType | None:
+        """Удаление объекта по id."""
+        return await self._remove(self.model.id == obj_id)
+
+    async def remove_or_404(
+        self,
+        obj_id: uuid.UUID
     ) -> ModelType:
-        """Удаление объекта."""
-        await self.session.delete(db_obj)
-        await self.session.commit()
-        return db_obj
+        """
+        Удаление объекта по id.
+
+        При отсутствии объекта вызывает HTTPException со статусом 404.
+        """
+        obj = await self.remove(obj_id)
+        return self._exists_or_404(obj)
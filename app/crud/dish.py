@@ -1,15 +1,54 @@
 import uuid
+from typing import Any
 
 from fastapi import Depends
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    StatementLambdaElement,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    or_,
+    select,
+    union,
+)
 
-from app.core.custom_types import DishDiscountDict
-from app.core.db import get_async_session
+from app.core.constants import SEARCH_CONFIG
+from app.core.custom_types import DishDiscountDict, DishSearchDict
+from app.core.db import SessionProvider, get_session_provider
 from app.core.redis_cache import DISCOUNT_PREFIX, cache
-from app.crud.base import CRUDBase
-from app.models import Dish, Submenu
-from app.schemas.dish import DishCreate, DishUpdate
+from app.crud.base import CRUDBase, menu_is_active
+from app.models import Dish, Menu, Submenu
+from app.schemas.dish import (
+    DishBulkUpdate,
+    DishCreate,
+    DishFilter,
+    DishSort,
+    DishUpdate,
+)
+
+
+def filter_discounted(
+    dishes: list[DishDiscountDict],
+    filters: DishFilter
+) -> list[DishDiscountDict]:
+    """
+    Отбор блюд по наличию скидки и цене с учетом скидки,
+    сортировка по цене с учетом скидки.
+
+    Скидка только уменьшает цену, поэтому в запросе к базе блюда
+    предварительно отбираются по `min_price` и сортируются по цене
+    без учета скидки, а окончательная проверка выполняется здесь.
+    """
+    if filters.has_discount is not None:
+        dishes = [dish for dish in dishes if (dish['discount'] != '0%') is filters.has_discount]
+    if filters.min_price is not None:
+        dishes = [dish for dish in dishes if dish['price'] >= filters.min_price]
+    if filters.max_price is not None:
+        dishes = [dish for dish in dishes if dish['price'] <= filters.max_price]
+    if filters.sort == DishSort.PRICE:
+        dishes.sort(key=lambda dish: (dish['price'], dish['title']))
+    return dishes
 
 
 class CRUDDish(
@@ -19,37 +58,99 @@ class CRUDDish(
 
     def __init__(
         self,
-        session: AsyncSession = Depends(get_async_session)
+        sessions: SessionProvider = Depends(get_session_provider)
     ) -> None:
         self.model = Dish
-        self.session = session
+        self.sessions = sessions
 
-    async def get_multi_filtered(
+    def _filtered_statement(
         self,
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID
-    ) -> list[DishDiscountDict]:
-        """Получение списка отфильтрованных по `menu_id` и `submenu_id` объектов."""
-        db_objs = await self.session.execute(
-            select(Dish)
-            .join(Submenu, Submenu.id == Dish.submenu_id)
-            .where(Dish.submenu_id == submenu_id, Submenu.menu_id == menu_id)
+    ) -> StatementLambdaElement:
+        """
+        Запрос данных о блюдах подменю `submenu_id` меню `menu_id`.
+
+        Запрос строится один раз и кэшируется как lambda-выражение,
+        `menu_id` и `submenu_id` передаются связанными параметрами.
+        """
+        return lambda_stmt(
+            lambda: select(
+                Dish.id,
+                Dish.title,
+                Dish.description,
+                Dish.price,
+                Dish.submenu_id
+            )
+            .where(
+                Dish.menu_id == menu_id,
+                Dish.submenu_id == submenu_id,
+                menu_is_active(Dish.menu_id)
+            )
         )
-        dishes: list[DishDiscountDict] = []
-        for dish in db_objs.scalars():
-            discount = await cache.get(f'{DISCOUNT_PREFIX}:{menu_id}:{submenu_id}:{dish.id}')
-            discount = discount or 0
-            dishes.append(
-                {
-                    'id': dish.id,
-                    'title': dish.title,
-                    'description': dish.description,
-                    'price': dish.price * (1 - discount),
-                    'discount': f'{(discount * 100):.0f}%',
-                    'submenu_id': dish.submenu_id
-                }
+
+    def _apply_filter(
+        self,
+        statement: StatementLambdaElement,
+        filters: DishFilter
+    ) -> StatementLambdaElement:
+        """
+        Добавление к запросу предварительного отбора по цене и сортировки.
+
+        Цена в базе хранится без учета скидки, поэтому в запросе блюда
+        отбираются только по `min_price` с использованием индекса
+        `(submenu_id, price)`; остальные условия проверяются по цене
+        со скидкой в `filter_discounted`.
+        В компактном режиме описание исключается из запроса.
+        """
+        if filters.compact:
+            statement += lambda s: s.with_only_columns(
+                Dish.id,
+                Dish.title,
+                Dish.price,
+                Dish.submenu_id
             )
-        return dishes
+        min_price = filters.min_price
+        if min_price is not None:
+            statement += lambda s: s.where(Dish.price >= min_price)
+        if filters.sort == DishSort.PRICE:
+            statement += lambda s: s.order_by(Dish.price, Dish.title)
+        elif filters.sort == DishSort.TITLE:
+            statement += lambda s: s.order_by(Dish.title)
+        return statement
+
+    async def _apply_discount(
+        self,
+        menu_id: uuid.UUID,
+        dish: dict[str, Any]
+    ) -> DishDiscountDict:
+        """Добавление поля `discount` и пересчет цены с учетом скидки."""
+        discount = await cache.get(f'{DISCOUNT_PREFIX}:{menu_id}:{dish["submenu_id"]}:{dish["id"]}')
+        discount = discount or 0
+        dish['price'] = dish['price'] * (1 - discount)
+        dish['discount'] = f'{(discount * 100):.0f}%'
+        return dish  # type: ignore
+
+    async def get_multi_filtered(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        filters: DishFilter
+    ) -> list[DishDiscountDict]:
+        """
+        Получение списка отфильтрованных по `menu_id` и `submenu_id` объектов.
+
+        Предварительный отбор по цене и сортировка выполняются в запросе,
+        окончательная фильтрация и сортировка по цене со скидкой -
+        после получения скидок из кэша.
+        """
+        dishes = await self._fetch_all(
+            self._apply_filter(self._filtered_statement(menu_id, submenu_id), filters)
+        )
+        return filter_discounted(
+            [await self._apply_discount(menu_id, dish) for dish in dishes],
+            filters
+        )
 
     async def get_filtered_discounted(
         self,
@@ -62,28 +163,12 @@ class CRUDDish(
 
         Добавляется поле `discount`. Цена отображается со скидкой.
         """
-        dish = await self.session.execute(
-            select(Dish)
-            .join(Submenu, Submenu.id == Dish.submenu_id)
-            .where(
-                Dish.id == obj_id,
-                Dish.submenu_id == submenu_id,
-                Submenu.menu_id == menu_id
-            )
-        )
-        dish = dish.scalars().first()
+        statement = self._filtered_statement(menu_id, submenu_id)
+        statement += lambda s: s.where(Dish.id == obj_id)
+        dish = await self._fetch_one(statement)
         if dish is None:
             return None
-        discount = await cache.get(f'{DISCOUNT_PREFIX}:{menu_id}:{submenu_id}:{dish.id}')
-        discount = discount or 0
-        return {
-            'id': dish.id,
-            'title': dish.title,
-            'description': dish.description,
-            'price': dish.price * (1 - discount),
-            'discount': f'{(discount * 100):.0f}%',
-            'submenu_id': dish.submenu_id
-        }
+        return await self._apply_discount(menu_id, dish)
 
     async def get_filtered_discounted_or_404(
         self,
@@ -100,6 +185,65 @@ class CRUDDish(
         obj = await self.get_filtered_discounted(menu_id, submenu_id, obj_id)
         return self._exists_or_404(obj, detail='dish not found')
 
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int
+    ) -> list[DishSearchDict]:
+        """
+        Поиск блюд по названию и описанию, а также по названиям подменю и меню.
+
+        Описание и название блюда ищутся полнотекстовым поиском по столбцу
+        `search_vector`, названия - по подстроке и по сходству триграмм.
+        Совпадения по каждой таблице отбираются отдельными подзапросами,
+        чтобы каждый из них мог использовать свой GIN-индекс.
+        Результаты упорядочиваются по релевантности. Добавляется поле
+        `discount`, цена отображается со скидкой.
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        matches = union(
+            select(Dish.id).where(
+                or_(
+                    Dish.search_vector.bool_op('@@')(ts_query),
+                    Dish.title.icontains(query, autoescape=True),
+                    literal(query).bool_op('<%')(Dish.title)
+                )
+            ),
+            select(Dish.id)
+            .join(
+                Submenu,
+                (Submenu.menu_id == Dish.menu_id) & (Submenu.id == Dish.submenu_id)
+            )
+            .where(literal(query).bool_op('<%')(Submenu.title)),
+            select(Dish.id)
+            .join(Menu, Menu.id == Dish.menu_id)
+            .where(literal(query).bool_op('<%')(Menu.title))
+        )
+        similarity = func.greatest(
+            func.word_similarity(query, Dish.title),
+            func.word_similarity(query, Submenu.title),
+            func.word_similarity(query, Menu.title)
+        )
+        rank = func.ts_rank(Dish.search_vector, ts_query) + similarity
+        dishes = await self._fetch_all(
+            select(
+                Dish.id,
+                Dish.title,
+                Dish.description,
+                Dish.price,
+                Dish.submenu_id,
+                Dish.menu_id
+            )
+            .join(Submenu, Submenu.id == Dish.submenu_id)
+            .join(Menu, Menu.id == Dish.menu_id)
+            .where(Dish.id.in_(matches), Menu.deleted_at.is_(None))
+            .order_by(rank.desc(), Dish.title)
+            .limit(limit)
+            .offset(offset)
+        )
+        return [await self._apply_discount(dish['menu_id'], dish) for dish in dishes]  # type: ignore
+
     async def get_filtered(
         self,
         menu_id: uuid.UUID,
@@ -109,11 +253,11 @@ class CRUDDish(
         """Получение объекта по id, если он связан с соответствующими меню и субменю."""
         dish = await self.session.execute(
             select(Dish)
-            .join(Submenu, Submenu.id == Dish.submenu_id)
             .where(
-                Dish.id == obj_id,
+                Dish.menu_id == menu_id,
                 Dish.submenu_id == submenu_id,
-                Submenu.menu_id == menu_id
+                Dish.id == obj_id,
+                menu_is_active(menu_id)
             )
         )
         return dish.scalars().first()
@@ -131,3 +275,177 @@ class CRUDDish(
         """
         obj = await self.get_filtered(menu_id, submenu_id, obj_id)
         return self._exists_or_404(obj, detail='dish not found')
+
+    async def create_filtered(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        obj_in: DishCreate
+    ) -> Dish | None:
+        """
+        Создание объекта, если существует подменю, связанное с соответствующим меню.
+
+        Проверка подменю и вставка выполняются одним запросом
+        `INSERT ... SELECT ... RETURNING`.
+        """
+        obj_in_data = obj_in.model_dump()
+        return await self._execute_returning(
+            insert(Dish)
+            .from_select(
+                ['title', 'description', 'price', 'submenu_id', 'menu_id'],
+                select(
+                    literal(obj_in_data['title']),
+                    literal(obj_in_data['description']),
+                    literal(obj_in_data['price']),
+                    Submenu.id,
+                    Submenu.menu_id
+                )
+                .where(
+                    Submenu.id == submenu_id,
+                    Submenu.menu_id == menu_id,
+                    menu_is_active(menu_id)
+                )
+            )
+            .returning(Dish)
+        )
+
+    async def create_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        obj_in: DishCreate,
+        duplicate_detail: str
+    ) -> Dish:
+        """
+        Создание объекта, если существует подменю, связанное с соответствующим меню.
+
+        При отсутствии подменю вызывает HTTPException со статусом 404,
+        а если название уже занято - со статусом 400 и сообщением `duplicate_detail`.
+        """
+        obj = await self.create_filtered(menu_id, submenu_id, obj_in)
+        return await self._created_or_404(
+            obj,
+            Dish.title == obj_in.title,
+            duplicate_detail
+        )
+
+    async def update_filtered(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        obj_id: uuid.UUID,
+        obj_in: DishUpdate
+    ) -> Dish | None:
+        """
+        Частичное обновление объекта по id,
+        если он связан с соответствующими меню и субменю.
+        """
+        return await self._update(
+            obj_in,
+            Dish.menu_id == menu_id,
+            Dish.submenu_id == submenu_id,
+            Dish.id == obj_id,
+            menu_is_active(menu_id)
+        )
+
+    async def update_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        obj_id: uuid.UUID,
+        obj_in: DishUpdate
+    ) -> Dish:
+        """
+        Частичное обновление объекта по id,
+        если он связан с соответствующими меню и субменю.
+
+        При отсутствии объекта вызывает HTTPException со статусом 404.
+        """
+        obj = await self.update_filtered(menu_id, submenu_id, obj_id, obj_in)
+        return self._exists_or_404(obj, detail='dish not found')
+
+    async def remove_filtered(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        obj_id: uuid.UUID
+    ) -> Dish | None:
+        """Удаление объекта по id, если он связан с соответствующими меню и субменю."""
+        return await self._remove(
+            Dish.menu_id == menu_id,
+            Dish.submenu_id == submenu_id,
+            Dish.id == obj_id,
+            menu_is_active(menu_id)
+        )
+
+    async def remove_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        obj_id: uuid.UUID
+    ) -> Dish:
+        """
+        Удаление объекта по id, если он связан с соответствующими меню и субменю.
+
+        При отсутствии объекта вызывает HTTPException со статусом 404.
+        """
+        obj = await self.remove_filtered(menu_id, submenu_id, obj_id)
+        return self._exists_or_404(obj, detail='dish not found')
+
+    async def create_multi_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        objs_in: list[DishCreate]
+    ) -> list[Dish]:
+        """
+        Создание нескольких объектов, связанных с подменю `submenu_id`
+        меню `menu_id`.
+
+        Существование подменю проверяется составным внешним ключом.
+        Если меню помечено удаленным, вызывает HTTPException со статусом 404.
+        """
+        await self._menu_is_active_or_404(menu_id)
+        return await self.create_multi(objs_in, menu_id=menu_id, submenu_id=submenu_id)
+
+    async def update_multi_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        objs_in: list[DishBulkUpdate]
+    ) -> list[Dish]:
+        """
+        Частичное обновление нескольких объектов, связанных с подменю
+        `submenu_id` меню `menu_id`.
+
+        Если хотя бы один объект не найден, вызывает HTTPException
+        со статусом 404.
+        """
+        objs = await self._update_multi(
+            objs_in,
+            Dish.menu_id == menu_id,
+            Dish.submenu_id == submenu_id,
+            menu_is_active(menu_id)
+        )
+        return self._exists_or_404(objs, detail='dish not found')
+
+    async def remove_multi_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        obj_ids: list[uuid.UUID]
+    ) -> list[Dish]:
+        """
+        Удаление нескольких объектов, связанных с подменю `submenu_id`
+        меню `menu_id`.
+
+        Если хотя бы один объект не найден, вызывает HTTPException
+        со статусом 404.
+        """
+        objs = await self._remove_multi(
+            obj_ids,
+            Dish.menu_id == menu_id,
+            Dish.submenu_id == submenu_id,
+            menu_is_active(menu_id)
+        )
+        return self._exists_or_404(objs, detail='dish not found')
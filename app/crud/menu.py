@@ -1,20 +1,47 @@
 import uuid
+from typing import Any, Collection, TypeVar
 
 from fastapi import Depends
-from sqlalchemy import distinct, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    StatementLambdaElement,
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
+from app.core.config import settings
 from app.core.custom_types import (
     MenuAnnotatedDict,
     MenuNestedDict,
     MenuNestedDiscountDict,
 )
-from app.core.db import get_async_session
+from app.core.db import SessionProvider, get_session_provider
 from app.core.redis_cache import DISCOUNT_PREFIX, cache
 from app.crud.base import CRUDBase
+from app.crud.dish import filter_discounted
 from app.models import Dish, Menu, Submenu
+from app.schemas.dish import DishFilter, DishSort
 from app.schemas.menu import MenuCreate, MenuUpdate
 
+PurgedType = TypeVar('PurgedType', Dish, Submenu)
+
+
+def build_object(**fields: Any) -> Any:
+    """
+    Построение выражения `jsonb_build_object` из именованных аргументов.
+
+    Поля со значением `None` в объект не включаются.
+    """
+    args: list[Any] = []
+    for key, value in fields.items():
+        if value is not None:
+            args.extend((key, value))
+    return func.jsonb_build_object(*args)
+
 
 class CRUDMenu(
     CRUDBase[Menu, MenuCreate, MenuUpdate]
@@ -23,54 +50,44 @@ class CRUDMenu(
 
     def __init__(
         self,
-        session: AsyncSession = Depends(get_async_session)
+        sessions: SessionProvider = Depends(get_session_provider)
     ) -> None:
         self.model = Menu
-        self.session = session
+        self.sessions = sessions
 
-    async def get_multi_annotated(self) -> list[MenuAnnotatedDict]:
-        """Получение списка объектов с аннотациями."""
-        db_objs = await self.session.execute(
-            select(Menu, func.count(distinct(Submenu.id)), func.count(Dish.id))
+    def _annotated_statement(self) -> StatementLambdaElement:
+        """
+        Запрос данных о меню с количеством подменю и блюд.
+
+        Запрос строится один раз и кэшируется как lambda-выражение.
+        """
+        return lambda_stmt(
+            lambda: select(
+                Menu.id,
+                Menu.title,
+                Menu.description,
+                func.count(distinct(Submenu.id)).label('submenus_count'),
+                func.count(Dish.id).label('dishes_count')
+            )
             .select_from(Menu)
-            .join(Submenu, isouter=True)
-            .join(Submenu.dishes, isouter=True)
+            .join(Submenu, Submenu.menu_id == Menu.id, isouter=True)
+            .join(Dish, Dish.submenu_id == Submenu.id, isouter=True)
+            .where(Menu.deleted_at.is_(None))
             .group_by(Menu.id)
         )
-        return [
-            {
-                'id': menu.id,
-                'title': menu.title,
-                'description': menu.description,
-                'submenus_count': submenus_count,
-                'dishes_count': dishes_count
-            } for menu, submenus_count, dishes_count in db_objs
-        ]
+
+    async def get_multi_annotated(self) -> list[MenuAnnotatedDict]:
+        """Получение списка объектов с аннотациями."""
+        return await self._fetch_all(self._annotated_statement())
 
     async def get_annotated(
         self,
         obj_id: uuid.UUID
     ) -> MenuAnnotatedDict | None:
         """Получение объекта с аннотациями по id."""
-        db_obj = await self.session.execute(
-            select(Menu, func.count(distinct(Submenu.id)), func.count(Dish.id))
-            .select_from(Menu)
-            .join(Submenu, isouter=True)
-            .join(Submenu.dishes, isouter=True)
-            .where(Menu.id == obj_id)
-            .group_by(Menu.id)
-        )
-        db_obj = db_obj.first()
-        if db_obj is None:
-            return None
-        menu, submenus_count, dishes_count = db_obj
-        return {
-            'id': menu.id,
-            'title': menu.title,
-            'description': menu.description,
-            'submenus_count': submenus_count,
-            'dishes_count': dishes_count
-        }
+        statement = self._annotated_statement()
+        statement += lambda s: s.where(Menu.id == obj_id)
+        return await self._fetch_one(statement)
 
     async def get_annotated_or_404(
         self,
@@ -84,58 +101,194 @@ class CRUDMenu(
         obj = await self.get_annotated(obj_id)
         return self._exists_or_404(obj, detail='menu not found')
 
-    async def get_all(self) -> list[MenuNestedDict]:
-        """Получение списка меню с вложенными подменю и блюдами."""
-        dish_subq = (
-            select(
-                Dish.submenu_id,
-                func.array_agg(
-                    func.jsonb_build_object(
-                        'id', Dish.id,
-                        'title', Dish.title,
-                        'description', Dish.description,
-                        'price', Dish.price,
-                        'submenu_id', Dish.submenu_id
-                    )
-                ).label('dishes')
-            )
-            .group_by(Dish.submenu_id)
-            .subquery()
+    async def update(
+        self,
+        obj_id: uuid.UUID,
+        obj_in: MenuUpdate
+    ) -> Menu | None:
+        """Частичное обновление объекта по id, если он не помечен удаленным."""
+        return await self._update(obj_in, Menu.id == obj_id, Menu.deleted_at.is_(None))
+
+    async def remove(self, obj_id: uuid.UUID) -> Menu | None:
+        """Удаление объекта по id, если он не помечен удаленным."""
+        return await self._remove(Menu.id == obj_id, Menu.deleted_at.is_(None))
+
+    async def soft_remove(self, obj_id: uuid.UUID) -> Menu | None:
+        """
+        Пометка объекта удаленным.
+
+        Выполняется одним запросом `UPDATE ... RETURNING` к строке меню,
+        поэтому время ответа не зависит от количества подменю и блюд.
+        Помеченное меню исключается из всех запросов на чтение,
+        а связанные данные удаляются позже методом `purge_batch`.
+        """
+        return await self._execute_returning(
+            update(Menu)
+            .where(Menu.id == obj_id, Menu.deleted_at.is_(None))
+            .values(deleted_at=func.now())
+            .returning(Menu)
+        )
+
+    async def soft_remove_or_404(self, obj_id: uuid.UUID) -> Menu:
+        """
+        Пометка объекта удаленным.
+
+        При отсутствии объекта вызывает HTTPException со статусом 404.
+        """
+        obj = await self.soft_remove(obj_id)
+        return self._exists_or_404(obj, detail='menu not found')
+
+    async def get_deleted_ids(self) -> list[uuid.UUID]:
+        """Получение id меню, помеченных удаленными."""
+        db_objs = await self.session.scalars(
+            select(Menu.id).where(Menu.deleted_at.is_not(None))
+        )
+        return list(db_objs)
+
+    async def _purge_rows(
+        self,
+        model: type[PurgedType],
+        menu_id: uuid.UUID,
+        batch_size: int
+    ) -> int:
+        """
+        Удаление не более `batch_size` строк `model`, связанных с меню,
+        отдельной транзакцией. Возвращает количество удаленных строк.
+        """
+        batch = (
+            select(model.id)
+            .where(model.menu_id == menu_id)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result: Any = await self.session.execute(
+            delete(model).where(model.id.in_(batch))
+        )
+        if result.rowcount:
+            await self.session.commit()
+        return result.rowcount
+
+    async def purge_batch(self, menu_id: uuid.UUID, batch_size: int) -> int:
+        """
+        Удаление очередной порции данных меню `menu_id`, помеченного удаленным.
+
+        Сначала порциями по `batch_size` строк удаляются блюда, затем
+        подменю, и в последнюю очередь сама строка меню. Каждая порция
+        фиксируется отдельной транзакцией, чтобы не удерживать блокировки
+        надолго. Возвращает количество удаленных строк; `0` означает,
+        что меню удалено полностью.
+        """
+        deleted = await self._purge_rows(Dish, menu_id, batch_size)
+        if not deleted:
+            deleted = await self._purge_rows(Submenu, menu_id, batch_size)
+        if deleted:
+            return deleted
+        await self.session.execute(
+            delete(Menu).where(Menu.id == menu_id, Menu.deleted_at.is_not(None))
         )
-        submenu_subq = (
+        await self.session.commit()
+        return 0
+
+    async def purge_deleted(self, batch_size: int) -> int:
+        """
+        Удаление порциями всех меню, помеченных удаленными.
+
+        Возвращает количество удаленных меню.
+        """
+        menu_ids = await self.get_deleted_ids()
+        for menu_id in menu_ids:
+            while await self.purge_batch(menu_id, batch_size):
+                pass
+        return len(menu_ids)
+
+    async def get_all(
+        self,
+        filters: DishFilter | None = None,
+        titles: Collection[str] | None = None
+    ) -> list[MenuNestedDict]:
+        """
+        Получение списка меню с вложенными подменю и блюдами.
+
+        Блюда предварительно отбираются по `min_price` и сортируются
+        согласно `filters` по цене без учета скидки.
+        Если передан `titles`, запрашиваются только меню с этими названиями.
+        В компактном режиме описания меню, подменю и блюд не запрашиваются.
+        Запрос выполняется с увеличенным ограничением времени
+        `db_nested_statement_timeout`.
+        """
+        filters = filters or DishFilter()
+        descriptions = not filters.compact
+        dish_obj: Any = build_object(
+            id=Dish.id,
+            title=Dish.title,
+            description=Dish.description if descriptions else None,
+            price=Dish.price,
+            submenu_id=Dish.submenu_id
+        )
+        if filters.sort == DishSort.PRICE:
+            dish_obj = aggregate_order_by(dish_obj, Dish.price, Dish.title)
+        elif filters.sort == DishSort.TITLE:
+            dish_obj = aggregate_order_by(dish_obj, Dish.title)
+        dish_stmt = select(
+            Dish.submenu_id,
+            func.array_agg(dish_obj).label('dishes')
+        )
+        if filters.min_price is not None:
+            dish_stmt = dish_stmt.where(Dish.price >= filters.min_price)
+        if titles is not None:
+            menu_ids = select(Menu.id).where(Menu.title.in_(titles))
+            dish_stmt = dish_stmt.where(Dish.menu_id.in_(menu_ids))
+        dish_subq = dish_stmt.group_by(Dish.submenu_id).subquery()
+        submenu_stmt = (
             select(
                 Submenu.menu_id,
                 func.array_agg(
-                    func.jsonb_build_object(
-                        'id', Submenu.id,
-                        'title', Submenu.title,
-                        'description', Submenu.description,
-                        'menu_id', Submenu.menu_id,
-                        'dishes', func.coalesce(dish_subq.c.dishes, [])
+                    build_object(
+                        id=Submenu.id,
+                        title=Submenu.title,
+                        description=Submenu.description if descriptions else None,
+                        menu_id=Submenu.menu_id,
+                        dishes=func.coalesce(dish_subq.c.dishes, [])
                     )
                 ).label('submenus')
             )
             .join(dish_subq, Submenu.id == dish_subq.c.submenu_id, isouter=True)
             .group_by(Submenu.menu_id)
-            .subquery()
         )
-        db_objs = await self.session.execute(
+        if titles is not None:
+            submenu_stmt = submenu_stmt.where(Submenu.menu_id.in_(menu_ids))
+        submenu_subq = submenu_stmt.subquery()
+        menu_stmt = (
             select(
-                func.jsonb_build_object(
-                    'id', Menu.id,
-                    'title', Menu.title,
-                    'description', Menu.description,
-                    'submenus', func.coalesce(submenu_subq.c.submenus, [])
+                build_object(
+                    id=Menu.id,
+                    title=Menu.title,
+                    description=Menu.description if descriptions else None,
+                    submenus=func.coalesce(submenu_subq.c.submenus, [])
                 )
             )
             .join(submenu_subq, Menu.id == submenu_subq.c.menu_id, isouter=True)
+            .where(Menu.deleted_at.is_(None))
             .group_by(Menu.id, submenu_subq.c.submenus)
         )
+        if titles is not None:
+            menu_stmt = menu_stmt.where(Menu.title.in_(titles))
+        session = await self.get_read_session()
+        await self._set_statement_timeout(session, settings.db_nested_statement_timeout)
+        db_objs = await session.execute(menu_stmt)
         return db_objs.scalars().all()
 
-    async def get_all_with_discount(self) -> list[MenuNestedDiscountDict]:
-        """Получение списка меню с вложенными подменю и блюдами со скидками."""
-        menus = await self.get_all()
+    async def get_all_with_discount(
+        self,
+        filters: DishFilter | None = None
+    ) -> list[MenuNestedDiscountDict]:
+        """
+        Получение списка меню с вложенными подменю и блюдами со скидками.
+
+        Блюда фильтруются и сортируются согласно `filters`
+        по цене с учетом скидки.
+        """
+        menus = await self.get_all(filters)
         for menu in menus:
             for submenu in menu['submenus']:
                 for dish in submenu['dishes']:
@@ -143,4 +296,9 @@ class CRUDMenu(
                     discount = discount or 0
                     dish['price'] = dish['price'] * (1 - discount)
                     dish['discount'] = f'{(discount * 100):.0f}%'  # type: ignore
+                if filters is not None:
+                    submenu['dishes'] = filter_discounted(
+                        submenu['dishes'],  # type: ignore
+                        filters
+                    )
         return menus  # type: ignore
@@ -1,14 +1,20 @@
 import uuid
 
 from fastapi import Depends
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    StatementLambdaElement,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    select,
+)
 
 from app.core.custom_types import SubmenuAnnotatedDict
-from app.core.db import get_async_session
-from app.crud.base import CRUDBase
-from app.models import Dish, Submenu
-from app.schemas.submenu import SubmenuCreate, SubmenuUpdate
+from app.core.db import SessionProvider, get_session_provider
+from app.crud.base import CRUDBase, menu_is_active
+from app.models import Dish, Menu, Submenu
+from app.schemas.submenu import SubmenuBulkUpdate, SubmenuCreate, SubmenuUpdate
 
 
 class CRUDSubmenu(
@@ -18,31 +24,37 @@ class CRUDSubmenu(
 
     def __init__(
         self,
-        session: AsyncSession = Depends(get_async_session)
+        sessions: SessionProvider = Depends(get_session_provider)
     ) -> None:
         self.model = Submenu
-        self.session = session
+        self.sessions = sessions
+
+    def _annotated_statement(self, menu_id: uuid.UUID) -> StatementLambdaElement:
+        """
+        Запрос данных о подменю меню `menu_id` с количеством блюд.
+
+        Запрос строится один раз и кэшируется как lambda-выражение,
+        `menu_id` передается связанным параметром.
+        """
+        return lambda_stmt(
+            lambda: select(
+                Submenu.id,
+                Submenu.title,
+                Submenu.description,
+                Submenu.menu_id,
+                func.count(Dish.id).label('dishes_count')
+            )
+            .join(Dish, Dish.submenu_id == Submenu.id, isouter=True)
+            .where(Submenu.menu_id == menu_id, menu_is_active(Submenu.menu_id))
+            .group_by(Submenu.id)
+        )
 
     async def get_multi_filtered_annotated(
         self,
         menu_id: uuid.UUID
     ) -> list[SubmenuAnnotatedDict]:
         """Получение списка отфильтрованных по `menu_id` объектов с аннотациями."""
-        db_objs = await self.session.execute(
-            select(Submenu, func.count(Dish.id))
-            .join(Dish, isouter=True)
-            .where(Submenu.menu_id == menu_id)
-            .group_by(Submenu.id)
-        )
-        return [
-            {
-                'id': submenu.id,
-                'title': submenu.title,
-                'description': submenu.description,
-                'menu_id': submenu.menu_id,
-                'dishes_count': dishes_count
-            } for submenu, dishes_count in db_objs
-        ]
+        return await self._fetch_all(self._annotated_statement(menu_id))
 
     async def get_filtered_annotated(
         self,
@@ -53,23 +65,9 @@ class CRUDSubmenu(
         Получение объекта с аннотациями по id,
         если он связан с соответствующим меню.
         """
-        db_obj = await self.session.execute(
-            select(Submenu, func.count(Dish.id))
-            .join(Dish, isouter=True)
-            .where(Submenu.id == obj_id, Submenu.menu_id == menu_id)
-            .group_by(Submenu.id)
-        )
-        db_obj = db_obj.first()
-        if db_obj is None:
-            return None
-        submenu, dishes_count = db_obj
-        return {
-            'id': submenu.id,
-            'title': submenu.title,
-            'description': submenu.description,
-            'menu_id': submenu.menu_id,
-            'dishes_count': dishes_count
-        }
+        statement = self._annotated_statement(menu_id)
+        statement += lambda s: s.where(Submenu.id == obj_id)
+        return await self._fetch_one(statement)
 
     async def get_filtered_annotated_or_404(
         self,
@@ -93,7 +91,11 @@ class CRUDSubmenu(
         """Получение объекта по id, если он связан с соответствующим меню."""
         submenu = await self.session.execute(
             select(Submenu)
-            .where(Submenu.id == obj_id, Submenu.menu_id == menu_id)
+            .where(
+                Submenu.id == obj_id,
+                Submenu.menu_id == menu_id,
+                menu_is_active(menu_id)
+            )
         )
         return submenu.scalars().first()
 
@@ -109,3 +111,151 @@ class CRUDSubmenu(
         """
         obj = await self.get_filtered(menu_id, obj_id)
         return self._exists_or_404(obj, detail='submenu not found')
+
+    async def create_filtered(
+        self,
+        menu_id: uuid.UUID,
+        obj_in: SubmenuCreate
+    ) -> Submenu | None:
+        """
+        Создание объекта, если существует соответствующее меню.
+
+        Проверка меню и вставка выполняются одним запросом
+        `INSERT ... SELECT ... RETURNING`.
+        """
+        obj_in_data = obj_in.model_dump()
+        return await self._execute_returning(
+            insert(Submenu)
+            .from_select(
+                ['title', 'description', 'menu_id'],
+                select(
+                    literal(obj_in_data['title']),
+                    literal(obj_in_data['description']),
+                    Menu.id
+                )
+                .where(Menu.id == menu_id, Menu.deleted_at.is_(None))
+            )
+            .returning(Submenu)
+        )
+
+    async def create_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        obj_in: SubmenuCreate,
+        duplicate_detail: str
+    ) -> Submenu:
+        """
+        Создание объекта, если существует соответствующее меню.
+
+        При отсутствии меню вызывает HTTPException со статусом 404,
+        а если название уже занято - со статусом 400 и сообщением `duplicate_detail`.
+        """
+        obj = await self.create_filtered(menu_id, obj_in)
+        return await self._created_or_404(
+            obj,
+            Submenu.title == obj_in.title,
+            duplicate_detail
+        )
+
+    async def update_filtered(
+        self,
+        menu_id: uuid.UUID,
+        obj_id: uuid.UUID,
+        obj_in: SubmenuUpdate
+    ) -> Submenu | None:
+        """Частичное обновление объекта по id, если он связан с соответствующим меню."""
+        return await self._update(
+            obj_in,
+            Submenu.id == obj_id,
+            Submenu.menu_id == menu_id,
+            menu_is_active(menu_id)
+        )
+
+    async def update_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        obj_id: uuid.UUID,
+        obj_in: SubmenuUpdate
+    ) -> Submenu:
+        """
+        Частичное обновление объекта по id, если он связан с соответствующим меню.
+
+        При отсутствии объекта вызывает HTTPException со статусом 404.
+        """
+        obj = await self.update_filtered(menu_id, obj_id, obj_in)
+        return self._exists_or_404(obj, detail='submenu not found')
+
+    async def remove_filtered(
+        self,
+        menu_id: uuid.UUID,
+        obj_id: uuid.UUID
+    ) -> Submenu | None:
+        """Удаление объекта по id, если он связан с соответствующим меню."""
+        return await self._remove(
+            Submenu.id == obj_id,
+            Submenu.menu_id == menu_id,
+            menu_is_active(menu_id)
+        )
+
+    async def remove_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        obj_id: uuid.UUID
+    ) -> Submenu:
+        """
+        Удаление объекта по id, если он связан с соответствующим меню.
+
+        При отсутствии объекта вызывает HTTPException со статусом 404.
+        """
+        obj = await self.remove_filtered(menu_id, obj_id)
+        return self._exists_or_404(obj, detail='submenu not found')
+
+    async def create_multi_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        objs_in: list[SubmenuCreate]
+    ) -> list[Submenu]:
+        """
+        Создание нескольких объектов, связанных с меню `menu_id`.
+
+        Если меню не существует или помечено удаленным,
+        вызывает HTTPException со статусом 404.
+        """
+        await self._menu_is_active_or_404(menu_id)
+        return await self.create_multi(objs_in, menu_id=menu_id)
+
+    async def update_multi_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        objs_in: list[SubmenuBulkUpdate]
+    ) -> list[Submenu]:
+        """
+        Частичное обновление нескольких объектов, связанных с меню `menu_id`.
+
+        Если хотя бы один объект не найден, вызывает HTTPException
+        со статусом 404.
+        """
+        objs = await self._update_multi(
+            objs_in,
+            Submenu.menu_id == menu_id,
+            menu_is_active(menu_id)
+        )
+        return self._exists_or_404(objs, detail='submenu not found')
+
+    async def remove_multi_filtered_or_404(
+        self,
+        menu_id: uuid.UUID,
+        obj_ids: list[uuid.UUID]
+    ) -> list[Submenu]:
+        """
+        Удаление нескольких объектов, связанных с меню `menu_id`.
+
+        Если хотя бы один объект не найден, вызывает HTTPException
+        со статусом 404.
+        """
+        objs = await self._remove_multi(
+            obj_ids,
+            Submenu.menu_id == menu_id,
+            menu_is_active(menu_id)
+        )
+        return self._exists_or_404(objs, detail='submenu not found')
@@ -1,8 +1,13 @@
-from fastapi import FastAPI
+from http import HTTPStatus
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
 
 from app.api.routers import main_router
 from app.core.config import settings
 from app.core.constants import TAGS_METADATA
+from app.core.db import LOCK_NOT_AVAILABLE, QUERY_CANCELED, query_timeouts
 from app.core.redis_cache import cache
 
 app = FastAPI(
@@ -15,3 +20,22 @@ app.include_router(main_router, prefix='/api/v1')
 
 app.add_event_handler('startup', cache.clean)
 app.add_event_handler('shutdown', cache.disconnect)
+
+
+@app.exception_handler(DBAPIError)
+async def database_timeout_handler(request: Request, exc: DBAPIError) -> JSONResponse:
+    """
+    Преобразование прерванных по таймауту запросов в ответ со статусом 503.
+
+    Учитывает таймауты выполнения запроса и ожидания блокировки
+    в статистике; остальные ошибки базы данных пробрасываются дальше.
+    """
+    pgcode = getattr(exc.orig, 'pgcode', None)
+    if pgcode not in (QUERY_CANCELED, LOCK_NOT_AVAILABLE):
+        raise exc
+    query_timeouts[pgcode] += 1
+    return JSONResponse(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        content={'detail': 'database timeout'},
+        headers={'Retry-After': '1'}
+    )
@@ -1,6 +1,18 @@
 import uuid
+from datetime import datetime
 
-from sqlalchemy import CheckConstraint, ForeignKey, String
+from sqlalchemy import (
+    CheckConstraint,
+    Computed,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    String,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -14,9 +26,21 @@ from app.core.constants import (
     DISH_TITLE_MAX_LEN,
     MENU_DESCR_MAX_LEN,
     MENU_TITLE_MAX_LEN,
+    SEARCH_CONFIG,
     SUBMENU_DESCR_MAX_LEN,
     SUBMENU_TITLE_MAX_LEN,
 )
+from app.core.identifiers import uuid7
+
+
+def trigram_index(table_name: str, column_name: str) -> Index:
+    """GIN-индекс триграмм для нечеткого поиска по столбцу."""
+    return Index(
+        f'ix_{table_name}_{column_name}_trgm',
+        column_name,
+        postgresql_using='gin',
+        postgresql_ops={column_name: 'gin_trgm_ops'}
+    )
 
 
 class Base(DeclarativeBase):
@@ -27,19 +51,32 @@ class Base(DeclarativeBase):
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
 
 
 class Menu(Base):
     """Модель для меню."""
-    title: Mapped[str] = mapped_column(
-        String(MENU_TITLE_MAX_LEN),
-        unique=True
-    )
+    title: Mapped[str] = mapped_column(String(MENU_TITLE_MAX_LEN))
     description: Mapped[str] = mapped_column(String(MENU_DESCR_MAX_LEN))
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     submenus: Mapped[list['Submenu']] = relationship(
-        cascade='all, delete-orphan'
+        cascade='all, delete-orphan',
+        passive_deletes=True
+    )
+    __table_args__ = (
+        Index(
+            'ix_menu_title_active',
+            'title',
+            unique=True,
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+        trigram_index('menu', 'title'),
+        Index(
+            'ix_menu_deleted_at',
+            'deleted_at',
+            postgresql_where=text('deleted_at IS NOT NULL')
+        ),
     )
 
 
@@ -52,9 +89,18 @@ class Submenu(Base):
     description: Mapped[str] = mapped_column(
         String(SUBMENU_DESCR_MAX_LEN)
     )
-    menu_id: Mapped[uuid.UUID] = mapped_column(ForeignKey('menu.id'))
+    menu_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey('menu.id', ondelete='CASCADE')
+    )
     menu: Mapped['Menu'] = relationship(back_populates='submenus')
-    dishes: Mapped[list['Dish']] = relationship(cascade='all, delete-orphan')
+    dishes: Mapped[list['Dish']] = relationship(
+        cascade='all, delete-orphan',
+        passive_deletes=True
+    )
+    __table_args__ = (
+        UniqueConstraint('id', 'menu_id', name='submenu_id_menu_id_key'),
+        trigram_index('submenu', 'title'),
+    )
 
 
 class Dish(Base):
@@ -65,8 +111,28 @@ class Dish(Base):
     )
     description: Mapped[str] = mapped_column(String(DISH_DESCR_MAX_LEN))
     price: Mapped[float] = mapped_column()
-    submenu_id: Mapped[uuid.UUID] = mapped_column(ForeignKey('submenu.id'))
+    submenu_id: Mapped[uuid.UUID] = mapped_column()
+    menu_id: Mapped[uuid.UUID] = mapped_column()
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{SEARCH_CONFIG}', title || ' ' || description)",
+            persisted=True
+        ),
+        deferred=True
+    )
     submenu: Mapped['Submenu'] = relationship(back_populates='dishes')
     __table_args__ = (
         CheckConstraint('price >= 0', name='price_not_negative'),
+        ForeignKeyConstraint(
+            ['submenu_id', 'menu_id'],
+            ['submenu.id', 'submenu.menu_id'],
+            name='dish_submenu_id_menu_id_fkey',
+            ondelete='CASCADE',
+            onupdate='CASCADE'
+        ),
+        Index('ix_dish_menu_id_submenu_id_id', 'menu_id', 'submenu_id', 'id'),
+        Index('ix_dish_submenu_id_price', 'submenu_id', 'price'),
+        Index('ix_dish_search_vector', 'search_vector', postgresql_using='gin'),
+        trigram_index('dish', 'title'),
     )
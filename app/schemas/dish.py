@@ -1,9 +1,17 @@
 import uuid
+from dataclasses import dataclass
+from enum import Enum
+from typing import Annotated
 
+from fastapi import Query
 from pydantic import BaseModel, ConfigDict, Field, field_validator, validator
 
-from app.core.constants import DISH_DESCR_MAX_LEN, DISH_TITLE_MAX_LEN, PRICE_SCALE
-from app.schemas.validators import convert_price_to_float, field_cannot_be_null
+from app.core.constants import DISH_DESCR_MAX_LEN, DISH_TITLE_MAX_LEN
+from app.schemas.validators import (
+    convert_price_to_float,
+    convert_price_to_str,
+    field_cannot_be_null,
+)
 
 PRICE_EXAMPLE = '20.50'
 DISH_TITLE_EXAMPLE = 'Название блюда'
@@ -62,6 +70,11 @@ class DishUpdate(DishBase):
     _forbid_null = validator('*', pre=True, allow_reuse=True)(field_cannot_be_null)
 
 
+class DishBulkUpdate(DishUpdate):
+    """Схема для изменения блюд в пакетном запросе."""
+    id: uuid.UUID = Field(description='Идентификатор блюда')
+
+
 class DishDB(BaseModel):
     """Схема для отображения данных о блюдах."""
     model_config = ConfigDict(from_attributes=True)
@@ -81,11 +94,79 @@ class DishDB(BaseModel):
     )
     submenu_id: uuid.UUID = Field(description='id связанного подменю')
 
-    @field_validator('price', mode='before')
-    @classmethod
-    def convert_price_to_str(cls, value: float) -> str:
-        return f'{value:.{PRICE_SCALE}f}'
+    _convert_price = field_validator('price', mode='before')(convert_price_to_str)
 
 
 class DishDiscountDB(DishDB):
     discount: str = Field(description='Размер скидки', examples=['0%'])
+
+
+class DishDiscountCompactDB(BaseModel):
+    """Схема для отображения данных о блюдах со скидкой без описания."""
+    id: uuid.UUID
+    title: str = Field(
+        description=DISH_TITLE_DESCR,
+        examples=[DISH_TITLE_EXAMPLE]
+    )
+    price: str = Field(
+        description=PRICE_DESCR,
+        examples=[PRICE_EXAMPLE]
+    )
+    discount: str = Field(description='Размер скидки', examples=['0%'])
+    submenu_id: uuid.UUID = Field(description='id связанного подменю')
+
+    _convert_price = field_validator('price', mode='before')(convert_price_to_str)
+
+
+class DishSearchDB(DishDiscountDB):
+    """Схема для отображения результатов поиска блюд."""
+    menu_id: uuid.UUID = Field(description='id связанного меню')
+
+
+class DishSort(str, Enum):
+    """Поле сортировки блюд."""
+    PRICE = 'price'
+    TITLE = 'title'
+
+
+@dataclass
+class DishFilter:
+    """
+    Параметры фильтрации, сортировки и состава полей списков блюд.
+
+    В компактном режиме (`compact`) описания не запрашиваются из базы
+    данных, не кэшируются и не возвращаются.
+    """
+    min_price: Annotated[
+        float | None,
+        Query(ge=0, description='Минимальная цена блюда с учетом скидки')
+    ] = None
+    max_price: Annotated[
+        float | None,
+        Query(ge=0, description='Максимальная цена блюда с учетом скидки')
+    ] = None
+    sort: Annotated[
+        DishSort | None,
+        Query(description='Поле сортировки блюд')
+    ] = None
+    has_discount: Annotated[
+        bool | None,
+        Query(description='Только блюда со скидкой (`true`) или без скидки (`false`)')
+    ] = None
+    compact: Annotated[
+        bool,
+        Query(description='Не возвращать описания')
+    ] = False
+
+    def cache_field(self) -> str:
+        """Нормализованное представление параметров для ключа кэша."""
+        return ':'.join(
+            '' if value is None else str(value)
+            for value in (
+                self.min_price,
+                self.max_price,
+                self.sort.value if self.sort is not None else None,
+                self.has_discount,
+                self.compact
+            )
+        )
@@ -19,3 +19,8 @@ class SubmenuNotFoundError(BaseModel):
 class DishNotFoundError(BaseModel):
     """Блюдо не найдено."""
     detail: str = Field(examples=['dish not found'])
+
+
+class DatabaseTimeoutError(BaseModel):
+    """Запрос к базе данных прерван по таймауту."""
+    detail: str = Field(examples=['database timeout'])
@@ -3,7 +3,7 @@ import uuid
 from pydantic import BaseModel, ConfigDict, Field, validator
 
 from app.core.constants import MENU_DESCR_MAX_LEN, MENU_TITLE_MAX_LEN
-from app.schemas.submenu import SubmenuNestedDishesDB
+from app.schemas.submenu import SubmenuNestedDishesCompactDB, SubmenuNestedDishesDB
 from app.schemas.validators import field_cannot_be_null
 
 MENU_TITLE_EXAMPLE = 'Название меню'
@@ -79,3 +79,16 @@ class MenuNestedSubmenusDB(MenuDB):
     о меню с вложенными подменю и блюдами.
     """
     submenus: list[SubmenuNestedDishesDB] = Field(description='Список подменю в меню')
+
+
+class MenuNestedSubmenusCompactDB(BaseModel):
+    """
+    Схема для отображения данных о меню
+    с вложенными подменю и блюдами без описаний.
+    """
+    id: uuid.UUID
+    title: str = Field(
+        examples=[MENU_TITLE_EXAMPLE],
+        description=MENU_TITLE_DESCR
+    )
+    submenus: list[SubmenuNestedDishesCompactDB] = Field(description='Список подменю в меню')
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+
+class PoolStatsDB(BaseModel):
+    """Схема для отображения статистики пула соединений."""
+    pool_size: int = Field(description='Количество постоянных соединений в пуле')
+    checked_out: int = Field(description='Количество выданных соединений')
+    overflow: int = Field(description='Количество соединений сверх размера пула')
+    checkouts: int = Field(description='Общее количество выдач соединений')
+    wait_time_avg: float = Field(description='Среднее время ожидания соединения, с')
+    wait_time_max: float = Field(description='Максимальное время ожидания соединения, с')
+    statement_timeouts: int = Field(description='Количество запросов, прерванных по таймауту')
+    lock_timeouts: int = Field(description='Количество запросов, прерванных по таймауту блокировки')
@@ -3,7 +3,7 @@ import uuid
 from pydantic import BaseModel, ConfigDict, Field, validator
 
 from app.core.constants import SUBMENU_DESCR_MAX_LEN, SUBMENU_TITLE_MAX_LEN
-from app.schemas.dish import DishDiscountDB
+from app.schemas.dish import DishDiscountCompactDB, DishDiscountDB
 from app.schemas.validators import field_cannot_be_null
 
 SUBMENU_TITLE_EXAMPLE = 'Название подменю'
@@ -49,6 +49,11 @@ class SubmenuUpdate(SubmenuBase):
     _forbid_null = validator('*', pre=True, allow_reuse=True)(field_cannot_be_null)
 
 
+class SubmenuBulkUpdate(SubmenuUpdate):
+    """Схема для изменения подменю в пакетном запросе."""
+    id: uuid.UUID = Field(description='Идентификатор подменю')
+
+
 class SubmenuDB(BaseModel):
     """Схема для отображения данных о подменю."""
     model_config = ConfigDict(from_attributes=True)
@@ -79,3 +84,17 @@ class SubmenuNestedDishesDB(SubmenuDB):
     о подменю с вложенными блюдами.
     """
     dishes: list[DishDiscountDB] = Field(description='Список блюд в подменю')
+
+
+class SubmenuNestedDishesCompactDB(BaseModel):
+    """
+    Схема для отображения данных о подменю
+    с вложенными блюдами без описаний.
+    """
+    id: uuid.UUID
+    title: str = Field(
+        description=SUBMENU_TITLE_DESCR,
+        examples=[SUBMENU_TITLE_EXAMPLE]
+    )
+    menu_id: uuid.UUID = Field(description='id связанного меню')
+    dishes: list[DishDiscountCompactDB] = Field(description='Список блюд в подменю')
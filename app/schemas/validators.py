@@ -1,5 +1,7 @@
 from typing import TypeVar
 
+from app.core.constants import PRICE_SCALE
+
 ValueType = TypeVar('ValueType')
 
 
@@ -15,6 +17,11 @@ def convert_price_to_float(value: str) -> float:
     return price
 
 
+def convert_price_to_str(value: float) -> str:
+    """Конвертация цены во `str` с фиксированным количеством знаков."""
+    return f'{value:.{PRICE_SCALE}f}'
+
+
 def field_cannot_be_null(value: ValueType) -> ValueType:
     """Валидация на недопустимость передачи полю значения null."""
     if value is None:
@@ -7,8 +7,8 @@ from app.core.custom_types import DishCachedDiscountDict, DishDiscountDict
 from app.core.redis_cache import LIST_PREFIX, OBJ_PREFIX, cache
 from app.crud.dish import CRUDDish
 from app.models import Dish
-from app.schemas.dish import DishCreate, DishUpdate
-from app.services.validators import check_dish_title_duplicate, check_submenu_url_exists
+from app.schemas.dish import DishBulkUpdate, DishCreate, DishFilter, DishUpdate
+from app.services.validators import ErrorMessages, check_integrity
 
 
 class DishService:
@@ -21,13 +21,21 @@ class DishService:
         self,
         menu_id: uuid.UUID,
         submenu_id: uuid.UUID,
+        filters: DishFilter
     ) -> Sequence[DishDiscountDict | DishCachedDiscountDict]:
-        """Получить список блюд."""
-        dish_list_cache: list[DishCachedDiscountDict] | None = await cache.get(f'{LIST_PREFIX}:{menu_id}:{submenu_id}')
+        """
+        Получить список блюд.
+
+        Списки с разными параметрами фильтрации кэшируются
+        в полях одного хэша.
+        """
+        dish_list_cache: list[DishCachedDiscountDict] | None = await cache.hget(
+            f'{LIST_PREFIX}:{menu_id}:{submenu_id}', filters.cache_field()
+        )
         if dish_list_cache is not None:
             return dish_list_cache
-        dish_list = await self.crud.get_multi_filtered(menu_id, submenu_id)
-        await cache.set(f'{LIST_PREFIX}:{menu_id}:{submenu_id}', dish_list)
+        dish_list = await self.crud.get_multi_filtered(menu_id, submenu_id, filters)
+        await cache.hset(f'{LIST_PREFIX}:{menu_id}:{submenu_id}', filters.cache_field(), dish_list)
         return dish_list
 
     async def create(
@@ -38,9 +46,12 @@ class DishService:
         background_tasks: BackgroundTasks
     ) -> Dish:
         """Создать блюдо."""
-        await check_dish_title_duplicate(dish.title, self.crud.session)
-        await check_submenu_url_exists(menu_id, submenu_id, self.crud.session)
-        new_dish = await self.crud.create(dish, submenu_id=submenu_id)
+        await cache.pin_primary()
+        await self.crud.release_titles([dish.title])
+        with check_integrity(ErrorMessages.DISH_TITLE_DUPLICATE):
+            new_dish = await self.crud.create_filtered_or_404(
+                menu_id, submenu_id, dish, ErrorMessages.DISH_TITLE_DUPLICATE
+            )
         background_tasks.add_task(cache.invalidate_on_dish_create, menu_id, submenu_id)
         return new_dish
 
@@ -67,10 +78,11 @@ class DishService:
         background_tasks: BackgroundTasks
     ) -> Dish:
         """Обновить блюдо."""
-        dish = await self.crud.get_filtered_or_404(menu_id, submenu_id, dish_id)
-        if obj_in.title is not None and obj_in.title != dish.title:
-            await check_dish_title_duplicate(obj_in.title, self.crud.session)
-        updated_dish = await self.crud.update(dish, obj_in)
+        await cache.pin_primary()
+        if obj_in.title is not None:
+            await self.crud.release_titles([obj_in.title])
+        with check_integrity(ErrorMessages.DISH_TITLE_DUPLICATE):
+            updated_dish = await self.crud.update_filtered_or_404(menu_id, submenu_id, dish_id, obj_in)
         background_tasks.add_task(cache.invalidate_on_dish_update, menu_id, submenu_id, dish_id)
         return updated_dish
 
@@ -82,7 +94,60 @@ class DishService:
         background_tasks: BackgroundTasks
     ) -> Dish:
         """Удалить блюдо."""
-        dish = await self.crud.get_filtered_or_404(menu_id, submenu_id, dish_id)
-        deleted_dish = await self.crud.remove(dish)
+        await cache.pin_primary()
+        deleted_dish = await self.crud.remove_filtered_or_404(menu_id, submenu_id, dish_id)
         background_tasks.add_task(cache.invalidate_on_dish_delete, menu_id, submenu_id, dish_id)
         return deleted_dish
+
+    async def create_bulk(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        dishes: list[DishCreate],
+        background_tasks: BackgroundTasks
+    ) -> list[Dish]:
+        """Создать несколько блюд одним запросом."""
+        await cache.pin_primary()
+        await self.crud.release_titles([dish.title for dish in dishes])
+        with check_integrity(ErrorMessages.DISH_TITLE_DUPLICATE):
+            new_dishes = await self.crud.create_multi_filtered_or_404(menu_id, submenu_id, dishes)
+        background_tasks.add_task(cache.invalidate_on_dish_create, menu_id, submenu_id)
+        return new_dishes
+
+    async def update_bulk(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        objs_in: list[DishBulkUpdate],
+        background_tasks: BackgroundTasks
+    ) -> list[Dish]:
+        """Обновить несколько блюд в одной транзакции."""
+        await cache.pin_primary()
+        await self.crud.release_titles([obj.title for obj in objs_in if obj.title is not None])
+        with check_integrity(ErrorMessages.DISH_TITLE_DUPLICATE):
+            updated_dishes = await self.crud.update_multi_filtered_or_404(menu_id, submenu_id, objs_in)
+        background_tasks.add_task(
+            cache.invalidate_on_dishes_update,
+            menu_id,
+            submenu_id,
+            [dish.id for dish in updated_dishes]
+        )
+        return updated_dishes
+
+    async def delete_bulk(
+        self,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        dish_ids: list[uuid.UUID],
+        background_tasks: BackgroundTasks
+    ) -> list[Dish]:
+        """Удалить несколько блюд одним запросом."""
+        await cache.pin_primary()
+        deleted_dishes = await self.crud.remove_multi_filtered_or_404(menu_id, submenu_id, dish_ids)
+        background_tasks.add_task(
+            cache.invalidate_on_dishes_delete,
+            menu_id,
+            submenu_id,
+            [dish.id for dish in deleted_dishes]
+        )
+        return deleted_dishes
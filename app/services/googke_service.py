@@ -1,9 +1,16 @@
-from typing import Any
-
-from google.oauth2.service_account import Credentials
-from googleapiclient import discovery
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cache
+from typing import Any, Iterator
 
 from app.core.config import settings
+from app.core.constants import (
+    GOOGLE_SHEET_BATCH_PAGES,
+    GOOGLE_SHEET_PAGE_ROWS,
+    GOOGLE_SHEET_WORKERS,
+    TABLE_LAST_COLUMN,
+)
 
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
@@ -11,39 +18,158 @@ SCOPES = [
 ]
 
 
-INFO = {
-    'type': settings.type,
-    'project_id': settings.project_id,
-    'private_key_id': settings.private_key_id,
-    'private_key': settings.private_key,
-    'client_email': settings.client_email,
-    'client_id': settings.client_id,
-    'auth_uri': settings.auth_uri,
-    'token_uri': settings.token_uri,
-    'auth_provider_x509_cert_url': settings.auth_provider_x509_cert_url,
-    'client_x509_cert_url': settings.client_x509_cert_url
-}
+@cache
+def get_credentials() -> Any:
+    """Учетные данные сервисного аккаунта, создаются один раз."""
+    from google.oauth2.service_account import Credentials
+
+    info = {
+        'type': settings.type,
+        'project_id': settings.project_id,
+        'private_key_id': settings.private_key_id,
+        'private_key': settings.private_key,
+        'client_email': settings.client_email,
+        'client_id': settings.client_id,
+        'auth_uri': settings.auth_uri,
+        'token_uri': settings.token_uri,
+        'auth_provider_x509_cert_url': settings.auth_provider_x509_cert_url,
+        'client_x509_cert_url': settings.client_x509_cert_url
+    }
+    return Credentials.from_service_account_info(info=info, scopes=SCOPES)
+
 
+def build_client(name: str, version: str) -> Any:
+    """
+    Создание клиента API.
 
-CREDENTIALS = Credentials.from_service_account_info(
-    info=INFO, scopes=SCOPES)
+    Используется документ обнаружения, поставляемый вместе
+    с googleapiclient, поэтому сетевой запрос за ним не выполняется.
+    """
+    from googleapiclient import discovery
+
+    return discovery.build(
+        name,
+        version,
+        credentials=get_credentials(),
+        static_discovery=True
+    )
 
 
 class GoogleService:
-    """Взаимодействие с гугл таблицами."""
+    """
+    Взаимодействие с гугл таблицами.
+
+    Учетные данные и клиенты API создаются при первом обращении
+    к гугл-таблице и переиспользуются между синхронизациями, поэтому
+    при работе с локальным файлом библиотеки Google не импортируются,
+    а учетные данные не требуются. Клиенты `service` и `drive` можно
+    передать явно (например, локальную подделку для тестов).
+    """
+
+    def __init__(self, service: Any = None, drive: Any = None) -> None:
+        self._service = service
+        self._drive = drive
+        self._authorized = service is None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def service(self) -> Any:
+        """Клиент Google Sheets API."""
+        with self._lock:
+            if self._service is None:
+                self._service = build_client('sheets', 'v4')
+        return self._service
+
+    @property
+    def drive(self) -> Any:
+        """Клиент Google Drive API."""
+        with self._lock:
+            if self._drive is None:
+                self._drive = build_client('drive', 'v3')
+        return self._drive
+
+    def _http(self) -> Any:
+        """
+        HTTP-клиент текущего потока.
+
+        Клиент httplib2 не потокобезопасен, поэтому каждый поток
+        использует собственный экземпляр.
+        """
+        if not self._authorized:
+            return None
+        if not hasattr(self._local, 'http'):
+            import httplib2
+            from google_auth_httplib2 import AuthorizedHttp
 
-    def __init__(self) -> None:
-        self.service = discovery.build('sheets', 'v4', credentials=CREDENTIALS)
+            self._local.http = AuthorizedHttp(get_credentials(), http=httplib2.Http())
+        return self._local.http
 
-    def read_values(self, spreadsheet_id: str) -> list[list[Any]]:
-        """Прочитать данные из гугл-таблицы."""
-        range = 'A1:G100'
-        response = self.service.spreadsheets().values().get(
+    def get_revision(self, spreadsheet_id: str) -> str:
+        """
+        Получить версию гугл-таблицы.
+
+        Версия файла в Google Drive увеличивается при каждом изменении,
+        поэтому по ней можно определить, менялась ли таблица,
+        не загружая ее содержимое.
+        """
+        response = self.drive.files().get(
+            fileId=spreadsheet_id,
+            fields='version'
+        ).execute()
+        return response['version']
+
+    def _get_grid(self, spreadsheet_id: str) -> tuple[str, int]:
+        """Получить название и количество строк первого листа таблицы."""
+        response = self.service.spreadsheets().get(
             spreadsheetId=spreadsheet_id,
-            range=range,
-            valueRenderOption='FORMULA'
+            fields='sheets.properties(title,gridProperties.rowCount)'
         ).execute()
-        return response.get('values', [])
+        properties = response['sheets'][0]['properties']
+        return properties['title'], properties['gridProperties']['rowCount']
+
+    def _batch_get(self, spreadsheet_id: str, ranges: list[str]) -> list[dict[str, Any]]:
+        """Прочитать несколько диапазонов таблицы одним запросом."""
+        response = self.service.spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=ranges,
+            valueRenderOption='FORMULA'
+        ).execute(http=self._http())
+        return response.get('valueRanges', [])
+
+    def read_values(self, spreadsheet_id: str) -> Iterator[list[Any]]:
+        """
+        Прочитать данные из гугл-таблицы.
+
+        Используемые строки первого листа делятся на страницы
+        по `GOOGLE_SHEET_PAGE_ROWS` строк, страницы запрашиваются
+        пакетами через `batchGet` в нескольких потоках. Строки
+        возвращаются по порядку по мере получения пакетов.
+        Одновременно запрашивается не больше `GOOGLE_SHEET_WORKERS` пакетов:
+        следующий пакет запрашивается только после того, как возвращены
+        строки самого раннего, поэтому в памяти не накапливается вся таблица.
+        """
+        title, row_count = self._get_grid(spreadsheet_id)
+        sheet = "'{}'".format(title.replace("'", "''"))
+        pages = [
+            f'{sheet}!A{start}:{TABLE_LAST_COLUMN}{min(start + GOOGLE_SHEET_PAGE_ROWS - 1, row_count)}'
+            for start in range(1, row_count + 1, GOOGLE_SHEET_PAGE_ROWS)
+        ]
+        batches = (
+            pages[index:index + GOOGLE_SHEET_BATCH_PAGES]
+            for index in range(0, len(pages), GOOGLE_SHEET_BATCH_PAGES)
+        )
+        with ThreadPoolExecutor(max_workers=GOOGLE_SHEET_WORKERS) as executor:
+            futures: deque[Future[list[dict[str, Any]]]] = deque()
+            for batch in batches:
+                futures.append(executor.submit(self._batch_get, spreadsheet_id, batch))
+                if len(futures) < GOOGLE_SHEET_WORKERS:
+                    continue
+                for value_range in futures.popleft().result():
+                    yield from value_range.get('values', [])
+            while futures:
+                for value_range in futures.popleft().result():
+                    yield from value_range.get('values', [])
 
 
 google_service = GoogleService()
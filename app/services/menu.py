@@ -3,6 +3,7 @@ from typing import Sequence
 
 from fastapi import BackgroundTasks, Depends
 
+from app.core.config import settings
 from app.core.custom_types import (
     MenuAnnotatedDict,
     MenuCachedDict,
@@ -12,8 +13,9 @@ from app.core.custom_types import (
 from app.core.redis_cache import ALL_NESTED_PREFIX, LIST_PREFIX, OBJ_PREFIX, cache
 from app.crud.menu import CRUDMenu
 from app.models import Menu
+from app.schemas.dish import DishFilter
 from app.schemas.menu import MenuCreate, MenuUpdate
-from app.services.validators import check_menu_title_duplicate
+from app.services.validators import ErrorMessages, check_integrity
 
 
 class MenuService:
@@ -23,14 +25,22 @@ class MenuService:
         self.crud = crud
 
     async def get_all_nested(
-        self
+        self,
+        filters: DishFilter
     ) -> Sequence[MenuNestedDiscountDict | MenuCachedNestedDiscountDict]:
-        """Получить список меню с вложенными подменю и блюдами."""
-        menu_list_cache: list[MenuCachedNestedDiscountDict] | None = await cache.get(f'{ALL_NESTED_PREFIX}')
+        """
+        Получить список меню с вложенными подменю и блюдами.
+
+        Списки с разными параметрами фильтрации блюд кэшируются
+        в полях одного хэша.
+        """
+        menu_list_cache: list[MenuCachedNestedDiscountDict] | None = await cache.hget(
+            f'{ALL_NESTED_PREFIX}', filters.cache_field()
+        )
         if menu_list_cache is not None:
             return menu_list_cache
-        menu_list = await self.crud.get_all_with_discount()
-        await cache.set(f'{ALL_NESTED_PREFIX}', menu_list)
+        menu_list = await self.crud.get_all_with_discount(filters)
+        await cache.hset(f'{ALL_NESTED_PREFIX}', filters.cache_field(), menu_list)
         return menu_list
 
     async def get_list(self) -> Sequence[MenuAnnotatedDict | MenuCachedDict]:
@@ -48,8 +58,9 @@ class MenuService:
         background_tasks: BackgroundTasks
     ) -> Menu:
         """Создать меню."""
-        await check_menu_title_duplicate(menu.title, self.crud.session)
-        new_menu = await self.crud.create(menu)
+        await cache.pin_primary()
+        with check_integrity(ErrorMessages.MENU_TITLE_DUPLICATE):
+            new_menu = await self.crud.create(menu)
         background_tasks.add_task(cache.invalidate_on_menu_create)
         return new_menu
 
@@ -72,10 +83,9 @@ class MenuService:
         background_tasks: BackgroundTasks
     ) -> Menu:
         """Обновить меню."""
-        menu = await self.crud.get_or_404(menu_id)
-        if obj_in.title is not None and obj_in.title != menu.title:
-            await check_menu_title_duplicate(obj_in.title, self.crud.session)
-        updated_menu = await self.crud.update(menu, obj_in)
+        await cache.pin_primary()
+        with check_integrity(ErrorMessages.MENU_TITLE_DUPLICATE):
+            updated_menu = await self.crud.update_or_404(menu_id, obj_in)
         background_tasks.add_task(cache.invalidate_on_menu_update, menu_id)
         return updated_menu
 
@@ -84,8 +94,16 @@ class MenuService:
         menu_id: uuid.UUID,
         background_tasks: BackgroundTasks
     ) -> Menu:
-        """Удалить меню."""
-        menu = await self.crud.get_or_404(menu_id)
-        deleted_menu = await self.crud.remove(menu)
+        """
+        Удалить меню.
+
+        В режиме `menu_soft_delete` меню только помечается удаленным,
+        а подменю и блюда удаляются порциями фоновой задачей.
+        """
+        await cache.pin_primary()
+        if settings.menu_soft_delete:
+            deleted_menu = await self.crud.soft_remove_or_404(menu_id)
+        else:
+            deleted_menu = await self.crud.remove_or_404(menu_id)
         background_tasks.add_task(cache.invalidate_on_menu_delete, menu_id)
         return deleted_menu
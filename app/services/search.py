@@ -0,0 +1,37 @@
+from typing import Sequence
+
+from fastapi import Depends
+
+from app.core.custom_types import DishCachedSearchDict, DishSearchDict
+from app.core.redis_cache import SEARCH_PREFIX, cache
+from app.crud.dish import CRUDDish
+
+
+class SearchService:
+    """Поиск блюд."""
+
+    def __init__(self, crud: CRUDDish = Depends()) -> None:
+        self.crud = crud
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int
+    ) -> Sequence[DishSearchDict | DishCachedSearchDict]:
+        """
+        Найти блюда.
+
+        Результаты кэшируются в отдельном ключе для каждого запроса
+        и страницы в пределах текущего поколения кэша поиска,
+        которое сменяется при изменении данных.
+        """
+        query = ' '.join(query.lower().split())
+        generation = await cache.get_search_generation()
+        key = f'{SEARCH_PREFIX}:{generation}:{query}:{limit}:{offset}'
+        result_cache: list[DishCachedSearchDict] | None = await cache.get(key)
+        if result_cache is not None:
+            return result_cache
+        result = await self.crud.search(query, limit, offset)
+        await cache.set(key, result)
+        return result
@@ -7,8 +7,8 @@ from app.core.custom_types import SubmenuAnnotatedDict, SubmenuCachedDict
 from app.core.redis_cache import LIST_PREFIX, OBJ_PREFIX, cache
 from app.crud.submenu import CRUDSubmenu
 from app.models import Submenu
-from app.schemas.submenu import SubmenuCreate, SubmenuUpdate
-from app.services.validators import check_menu_url_exists, check_submenu_title_duplicate
+from app.schemas.submenu import SubmenuBulkUpdate, SubmenuCreate, SubmenuUpdate
+from app.services.validators import ErrorMessages, check_integrity
 
 
 class SubmenuService:
@@ -36,9 +36,12 @@ class SubmenuService:
         background_tasks: BackgroundTasks
     ) -> Submenu:
         """Создать субменю."""
-        await check_submenu_title_duplicate(submenu.title, self.crud.session)
-        await check_menu_url_exists(menu_id, self.crud.session)
-        new_submenu = await self.crud.create(submenu, menu_id=menu_id)
+        await cache.pin_primary()
+        await self.crud.release_titles([submenu.title])
+        with check_integrity(ErrorMessages.SUBMENU_TITLE_DUPLICATE):
+            new_submenu = await self.crud.create_filtered_or_404(
+                menu_id, submenu, ErrorMessages.SUBMENU_TITLE_DUPLICATE
+            )
         background_tasks.add_task(cache.invalidate_on_submenu_create, menu_id)
         return new_submenu
 
@@ -63,10 +66,11 @@ class SubmenuService:
         background_tasks: BackgroundTasks
     ) -> Submenu:
         """Обновить субменю."""
-        submenu = await self.crud.get_filtered_or_404(menu_id, submenu_id)
-        if obj_in.title is not None and obj_in.title != submenu.title:
-            await check_submenu_title_duplicate(obj_in.title, self.crud.session)
-        updated_submenu = await self.crud.update(submenu, obj_in)
+        await cache.pin_primary()
+        if obj_in.title is not None:
+            await self.crud.release_titles([obj_in.title])
+        with check_integrity(ErrorMessages.SUBMENU_TITLE_DUPLICATE):
+            updated_submenu = await self.crud.update_filtered_or_404(menu_id, submenu_id, obj_in)
         background_tasks.add_task(cache.invalidate_on_submenu_update, menu_id, submenu_id)
         return updated_submenu
 
@@ -77,7 +81,55 @@ class SubmenuService:
         background_tasks: BackgroundTasks
     ) -> Submenu:
         """Удалить субменю."""
-        submenu = await self.crud.get_filtered_or_404(menu_id, submenu_id)
-        deleted_submenu = await self.crud.remove(submenu)
+        await cache.pin_primary()
+        deleted_submenu = await self.crud.remove_filtered_or_404(menu_id, submenu_id)
         background_tasks.add_task(cache.invalidate_on_submenu_delete, menu_id, submenu_id)
         return deleted_submenu
+
+    async def create_bulk(
+        self,
+        menu_id: uuid.UUID,
+        submenus: list[SubmenuCreate],
+        background_tasks: BackgroundTasks
+    ) -> list[Submenu]:
+        """Создать несколько субменю одним запросом."""
+        await cache.pin_primary()
+        await self.crud.release_titles([submenu.title for submenu in submenus])
+        with check_integrity(ErrorMessages.SUBMENU_TITLE_DUPLICATE):
+            new_submenus = await self.crud.create_multi_filtered_or_404(menu_id, submenus)
+        background_tasks.add_task(cache.invalidate_on_submenu_create, menu_id)
+        return new_submenus
+
+    async def update_bulk(
+        self,
+        menu_id: uuid.UUID,
+        objs_in: list[SubmenuBulkUpdate],
+        background_tasks: BackgroundTasks
+    ) -> list[Submenu]:
+        """Обновить несколько субменю в одной транзакции."""
+        await cache.pin_primary()
+        await self.crud.release_titles([obj.title for obj in objs_in if obj.title is not None])
+        with check_integrity(ErrorMessages.SUBMENU_TITLE_DUPLICATE):
+            updated_submenus = await self.crud.update_multi_filtered_or_404(menu_id, objs_in)
+        background_tasks.add_task(
+            cache.invalidate_on_submenus_update,
+            menu_id,
+            [submenu.id for submenu in updated_submenus]
+        )
+        return updated_submenus
+
+    async def delete_bulk(
+        self,
+        menu_id: uuid.UUID,
+        submenu_ids: list[uuid.UUID],
+        background_tasks: BackgroundTasks
+    ) -> list[Submenu]:
+        """Удалить несколько субменю одним запросом."""
+        await cache.pin_primary()
+        deleted_submenus = await self.crud.remove_multi_filtered_or_404(menu_id, submenu_ids)
+        background_tasks.add_task(
+            cache.invalidate_on_submenus_delete,
+            menu_id,
+            [submenu.id for submenu in deleted_submenus]
+        )
+        return deleted_submenus
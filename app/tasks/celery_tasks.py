@@ -2,32 +2,43 @@ import asyncio
 
 from celery import Celery
 
-from app.core.config import broker_url
-from app.core.db import AsyncSessionLocal
-from app.crud.dish import CRUDDish
+from app.core.config import broker_url, settings
+from app.core.constants import MENU_PURGE_BATCH_SIZE
+from app.core.db import AsyncSessionLocal, SessionProvider
 from app.crud.menu import CRUDMenu
-from app.crud.submenu import CRUDSubmenu
-from app.tasks.utils import SyncDatabaseData, get_table_data
+from app.tasks.utils import sync_table_source
 
 celery_app = Celery('hello', broker=broker_url)
 
 
-async def update_db() -> None:
-    table_data = get_table_data()
-    async with AsyncSessionLocal() as session:
+def create_worker_sessions() -> SessionProvider:
+    """
+    Источник сессий фоновых задач.
+
+    Пакетные запросы синхронизации и очистки выполняются дольше запросов API,
+    поэтому ограничены `db_worker_statement_timeout`.
+    """
+    return SessionProvider(
+        AsyncSessionLocal,
+        statement_timeout=settings.db_worker_statement_timeout
+    )
 
-        menu_crud = CRUDMenu()
-        menu_crud.session = session
-        submenu_crud = CRUDSubmenu()
-        submenu_crud.session = session
-        dish_crud = CRUDDish()
-        dish_crud.session = session
-        sync = SyncDatabaseData(menu_crud, submenu_crud, dish_crud)
 
-        db_data = await menu_crud.get_all()
+async def update_db() -> None:
+    sessions = create_worker_sessions()
+    try:
+        await sync_table_source(sessions)
+    finally:
+        await sessions.close()
 
-        await sync.delete_inconsistent_db_data(table_data, db_data)
-        await sync.update_db_data(table_data, db_data)
+
+async def purge_deleted_menus() -> None:
+    """Удаление порциями данных меню, помеченных удаленными."""
+    sessions = create_worker_sessions()
+    try:
+        await CRUDMenu(sessions).purge_deleted(MENU_PURGE_BATCH_SIZE)
+    finally:
+        await sessions.close()
 
 
 @celery_app.task
@@ -36,9 +47,23 @@ def sync_table_db() -> None:
     loop.run_until_complete(update_db())
 
 
+@celery_app.task
+def purge_menus() -> None:
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(purge_deleted_menus())
+
+
 celery_app.conf.beat_schedule = {
-    'run-every-15-seconds': {
+    'sync-table': {
         'task': 'app.tasks.celery_tasks.sync_table_db',
-        'schedule': 15.0
+        'schedule': (
+            settings.sync_watch_poll_interval if settings.sync_watch
+            else settings.sync_poll_interval
+        )
     }
 }
+if settings.menu_soft_delete:
+    celery_app.conf.beat_schedule['purge-deleted-menus'] = {
+        'task': 'app.tasks.celery_tasks.purge_menus',
+        'schedule': settings.menu_purge_interval
+    }
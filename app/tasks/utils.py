@@ -1,12 +1,30 @@
-from typing import Any
+import asyncio
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TypeVar
 
-import pandas
+import openpyxl
 
 from app.core.config import settings
-from app.core.constants import BASE_DIR
-from app.core.custom_types import MenuNestedDict
+from app.core.constants import BASE_DIR, MENU_PURGE_BATCH_SIZE, TABLE_COLUMNS
+from app.core.custom_types import DishDict, MenuNestedDict, SubmenuNestedDict
+from app.core.db import SessionProvider
 from app.core.exceptions import IncorrectTableError
-from app.core.redis_cache import DISCOUNT_PREFIX, cache
+from app.core.identifiers import uuid7
+from app.core.redis_cache import (
+    ALL_NESTED_PREFIX,
+    DISCOUNT_PREFIX,
+    LIST_PREFIX,
+    OBJ_PREFIX,
+    SEARCH_PREFIX,
+    SYNC_ALL_KEY,
+    SYNC_MENUS_KEY,
+    SYNC_SOURCE_KEY,
+    cache,
+)
 from app.crud.dish import CRUDDish
 from app.crud.menu import CRUDMenu
 from app.crud.submenu import CRUDSubmenu
@@ -17,22 +35,73 @@ from app.schemas.table import DishTable, MenuTable, SubmenuTable
 from app.services import google_service
 
 
+def read_workbook_rows(file_path: Path) -> Iterator[list[Any]]:
+    """
+    Построчное чтение первого листа xlsx-файла.
+
+    Книга открывается в режиме только для чтения, поэтому строки
+    разбираются по мере итерации и лист целиком в память не загружается.
+    Выгрузки из Google Sheets содержат пустые строки до конца размеченного
+    диапазона листа, поэтому пустые строки только подсчитываются
+    и возвращаются перед следующей строкой с данными:
+    пустые строки в конце листа не возвращаются.
+    """
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        blank_rows = 0
+        for row in workbook.worksheets[0].iter_rows(max_col=TABLE_COLUMNS, values_only=True):
+            if all(value is None for value in row):
+                blank_rows += 1
+                continue
+            for _ in range(blank_rows):
+                yield [None] * TABLE_COLUMNS
+            blank_rows = 0
+            yield list(row)
+    finally:
+        workbook.close()
+
+
+def _normalize_rows(rows: Iterable[list[Any]]) -> Iterator[list[Any]]:
+    """Замена пустых ячеек пустыми строками и дополнение строк до 7 столбцов."""
+    for row in rows:
+        row = ['' if value is None else value for value in row[:TABLE_COLUMNS]]
+        row.extend([''] * (TABLE_COLUMNS - len(row)))
+        yield row
+
+
+def get_source_path() -> Path:
+    """Путь к локальному xlsx-файлу с меню."""
+    return BASE_DIR / 'admin' / 'Menu.xlsx'
+
+
+def get_source_signature() -> str:
+    """
+    Сигнатура источника табличных данных.
+
+    Для локального файла состоит из номера inode, размера и времени
+    изменения, для гугл-таблицы - из версии файла в Google Drive.
+    Получение сигнатуры не требует чтения содержимого таблицы.
+    """
+    if settings.use_google_sheets:
+        return f'google:{google_service.get_revision(settings.google_sheet_id)}'
+    stat = os.stat(get_source_path())
+    return f'file:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
 def get_table_data() -> list[MenuTable]:
-    """Получение данных из таблицы."""
-    data: Any
+    """
+    Получение данных из таблицы.
+
+    Строки проверяются и преобразуются в схемы по одной,
+    без промежуточных копий всей таблицы.
+    """
+    rows: Iterable[list[Any]]
     if settings.use_google_sheets:
-        data = google_service.read_values(settings.google_sheet_id)
+        rows = google_service.read_values(settings.google_sheet_id)
     else:
-        file_path = BASE_DIR / 'admin' / 'Menu.xlsx'
-        data = pandas.read_excel(file_path, header=None)
-        data.fillna('', inplace=True)
-        data = data.values.tolist()
-    for row in data:
-        while len(row) < 7:
-            row.append('')
-    _check_table_data(data)
+        rows = read_workbook_rows(get_source_path())
     table_data = []
-    for row in data:
+    for row in _check_table_data(_normalize_rows(rows)):
         if _is_menu(row):
             menu = MenuTable(title=row[1], description=row[2])
             table_data.append(menu)
@@ -60,29 +129,179 @@ def _is_dish(row: list[Any]) -> bool:
     return bool(row[3] and row[4] and row[5])
 
 
-def _check_table_data(data: list[list[Any]]) -> None:
-    """Проверка структуры таблицы."""
+def _check_table_data(rows: Iterable[list[Any]]) -> Iterator[list[Any]]:
+    """
+    Проверка структуры таблицы.
+
+    Строки возвращаются по мере проверки; при нарушении структуры
+    вызывается IncorrectTableError.
+    """
     prev_menu = False
-    if data and data[0] and not _is_menu(data[0]):
-        raise IncorrectTableError(
-            'Некорректная структура таблицы. Первая строка должна содержать меню.'
-        )
-    for row in data:
+    for index, row in enumerate(rows):
+        if index == 0 and not _is_menu(row):
+            raise IncorrectTableError(
+                'Некорректная структура таблицы. Первая строка должна содержать меню.'
+            )
         if _is_menu(row) and not (row[3] or row[4] or row[5] or row[6]):
             prev_menu = True
-            continue
-        if _is_submenu(row) and not (row[0] or row[4] or row[5] or row[6]):
+        elif _is_submenu(row) and not (row[0] or row[4] or row[5] or row[6]):
             prev_menu = False
-            continue
-        if _is_dish(row) and not (row[0] or row[1] or prev_menu):
-            continue
-        if not any(row):
-            continue
-        raise IncorrectTableError('Некорректная структура таблицы')
+        elif not (_is_dish(row) and not (row[0] or row[1] or prev_menu)) and any(row):
+            raise IncorrectTableError('Некорректная структура таблицы')
+        yield row
+
+
+def get_fingerprint(menu: MenuTable) -> str:
+    """Отпечаток табличных данных меню со всеми подменю и блюдами."""
+    return hashlib.sha256(menu.model_dump_json().encode()).hexdigest()
+
+
+def get_table_fingerprint(menu_fingerprints: dict[str, str]) -> str:
+    """Общий отпечаток таблицы по отпечаткам меню."""
+    digest = hashlib.sha256()
+    for title, fingerprint in menu_fingerprints.items():
+        digest.update(f'{title}\0{fingerprint}\0'.encode())
+    return digest.hexdigest()
+
+
+TitledType = TypeVar('TitledType')
+
+
+def index_by_title(
+    items: Iterable[TitledType],
+    get_title: Callable[[TitledType], str]
+) -> dict[str, TitledType]:
+    """
+    Построение словаря объектов по названию.
+
+    При повторяющихся названиях сохраняется первый объект.
+    """
+    index: dict[str, TitledType] = {}
+    for item in items:
+        index.setdefault(get_title(item), item)
+    return index
+
+
+@dataclass
+class DishPair:
+    """Блюдо из таблицы и соответствующее ему блюдо из бд."""
+    table: DishTable
+    db: DishDict | None
+
+
+@dataclass
+class SubmenuPair:
+    """Подменю из таблицы и соответствующее ему подменю из бд."""
+    table: SubmenuTable
+    db: SubmenuNestedDict | None
+    dishes: list[DishPair]
+
+
+@dataclass
+class MenuPair:
+    """Меню из таблицы и соответствующее ему меню из бд."""
+    table: MenuTable
+    db: MenuNestedDict | None
+    submenus: list[SubmenuPair]
+
+
+@dataclass
+class SyncDiff:
+    """
+    Расхождения между данными таблицы и бд.
+
+    `menus` содержит все объекты таблицы с найденными по названию
+    объектами бд, остальные поля - объекты бд, отсутствующие в таблице
+    (блюда - вместе с id меню).
+    """
+    menus: list[MenuPair] = field(default_factory=list)
+    deleted_menus: list[MenuNestedDict] = field(default_factory=list)
+    deleted_submenus: list[SubmenuNestedDict] = field(default_factory=list)
+    deleted_dishes: list[tuple[uuid.UUID, DishDict]] = field(default_factory=list)
+
+
+def compare_data(
+    table_data: list[MenuTable],
+    db_data: list[MenuNestedDict]
+) -> SyncDiff:
+    """
+    Сопоставление данных таблицы и бд по названиям.
+
+    Для каждого уровня вложенности строятся словари по названию,
+    поэтому сравнение выполняется за линейное время.
+    """
+    diff = SyncDiff()
+    table_menus = index_by_title(table_data, lambda menu: menu.title)
+    db_menus = index_by_title(db_data, lambda menu: menu['title'])
+    for db_menu in db_data:
+        if db_menu['title'] not in table_menus:
+            diff.deleted_menus.append(db_menu)
+    for table_menu in table_data:
+        matched_menu = db_menus.get(table_menu.title)
+        db_submenu_list = matched_menu['submenus'] if matched_menu is not None else []
+        table_submenus = index_by_title(table_menu.submenus, lambda submenu: submenu.title)
+        db_submenus = index_by_title(db_submenu_list, lambda submenu: submenu['title'])
+        for db_submenu in db_submenu_list:
+            table_submenu = table_submenus.get(db_submenu['title'])
+            if table_submenu is None:
+                diff.deleted_submenus.append(db_submenu)
+                continue
+            table_dish_titles = {dish.title for dish in table_submenu.dishes}
+            for db_dish in db_submenu['dishes']:
+                if db_dish['title'] not in table_dish_titles:
+                    diff.deleted_dishes.append((db_submenu['menu_id'], db_dish))
+        submenu_pairs = []
+        for table_submenu in table_menu.submenus:
+            matched_submenu = db_submenus.get(table_submenu.title)
+            db_dishes = index_by_title(
+                matched_submenu['dishes'] if matched_submenu is not None else [],
+                lambda dish: dish['title']
+            )
+            dish_pairs = [
+                DishPair(table_dish, db_dishes.get(table_dish.title))
+                for table_dish in table_submenu.dishes
+            ]
+            submenu_pairs.append(SubmenuPair(table_submenu, matched_submenu, dish_pairs))
+        diff.menus.append(MenuPair(table_menu, matched_menu, submenu_pairs))
+    return diff
+
+
+@dataclass
+class SyncPlan:
+    """
+    Набор изменений бд и кэша, вычисленный по расхождениям.
+
+    `discounts` сопоставляет ключу скидки блюда скидку из таблицы
+    и ключи кэша, устаревающие при ее изменении. `cache_keys` -
+    ключи кэша, которые нужно удалить после фиксации транзакции.
+    """
+    menus_to_create: list[dict[str, Any]] = field(default_factory=list)
+    menus_to_update: list[dict[str, Any]] = field(default_factory=list)
+    submenus_to_create: list[dict[str, Any]] = field(default_factory=list)
+    submenus_to_update: list[dict[str, Any]] = field(default_factory=list)
+    dishes_to_create: list[dict[str, Any]] = field(default_factory=list)
+    dishes_to_update: list[dict[str, Any]] = field(default_factory=list)
+    discounts: dict[str, tuple[Any, tuple[str, ...]]] = field(default_factory=dict)
+    cache_keys: set[str] = field(default_factory=set)
+
+    def invalidate(self, *keys: str) -> None:
+        """Добавление ключей к удалению вместе с общими списками."""
+        self.cache_keys.update((ALL_NESTED_PREFIX, SEARCH_PREFIX, LIST_PREFIX, *keys))
 
 
 class SyncDatabaseData:
-    """Класс для обновления данных в базе."""
+    """
+    Класс для обновления данных в базе.
+
+    Расхождения применяются пакетными запросами `INSERT`, `UPDATE`
+    и `DELETE` в одной транзакции, поэтому читатели не видят
+    частично синхронизированных данных. Идентификаторы новых объектов
+    генерируются заранее, что позволяет вставлять вложенные объекты
+    без получения id родителей из базы.
+
+    Ключи кэша, затронутые изменениями, собираются при вычислении
+    плана, поэтому инвалидация не требует перебора ключей по паттернам.
+    """
 
     def __init__(
         self,
@@ -94,175 +313,278 @@ class SyncDatabaseData:
         self.submenu_crud = submenu_crud
         self.dish_crud = dish_crud
 
-    async def delete_inconsistent_db_data(
-        self,
-        table_data: list[MenuTable],
-        db_data: list[MenuNestedDict]
-    ) -> None:
-        """Удаление из бд данных, отсутствующих в таблице."""
-        for db_menu in db_data:
-
-            table_menu = None
-            for menu in table_data:
-                if menu.title == db_menu['title']:
-                    table_menu = menu
-                    break
-            if table_menu is None:
-                menu_obj: Any
-                menu_obj = await self.menu_crud.get(db_menu['id'])
-                await self.menu_crud.remove(menu_obj)
-                await cache.invalidate_on_menu_delete(db_menu['id'])
-                continue
-
-            for db_submenu in db_menu['submenus']:
-                table_submenu = None
-                for submenu in table_menu.submenus:
-                    if submenu.title == db_submenu['title']:
-                        table_submenu = submenu
-                        break
-                if table_submenu is None:
-                    submenu_obj: Any
-                    submenu_obj = await self.submenu_crud.get(db_submenu['id'])
-                    await self.submenu_crud.remove(submenu_obj)
-                    await cache.invalidate_on_submenu_delete(db_menu['id'], db_submenu['id'])
-                    continue
-
-                for db_dish in db_submenu['dishes']:
-                    table_dish = None
-                    for dish in table_submenu.dishes:
-                        if dish.title == db_dish['title']:
-                            table_dish = dish
-                            break
-                    if table_dish is None:
-                        dish_obj: Any
-                        dish_obj = await self.dish_crud.get(db_dish['id'])
-                        await self.dish_crud.remove(dish_obj)
-                        await cache.invalidate_on_dish_delete(db_menu['id'], db_submenu['id'], db_dish['id'])
-
-    async def update_db_data(
-        self,
-        table_data: list[MenuTable],
-        db_data: list[MenuNestedDict]
-    ) -> None:
-        """Добавление в бд данных из таблицы."""
-        for table_menu in table_data:
-            db_menu: Any = None
-            menu_created = False
-            for menu in db_data:
-                if menu['title'] == table_menu.title:
-                    db_menu = menu
-                    break
+    def _plan_menus(self, diff: SyncDiff, plan: SyncPlan) -> None:
+        """Вычисление изменений меню и вложенных объектов."""
+        for menu_pair in diff.menus:
+            table_menu, db_menu = menu_pair.table, menu_pair.db
             if db_menu is None:
-                db_menu_obj = await self.menu_crud.create(
-                    MenuCreate(
-                        title=table_menu.title,
-                        description=table_menu.description
-                    )
+                menu_id = uuid7()
+                plan.menus_to_create.append(
+                    {
+                        'id': menu_id,
+                        **MenuCreate(
+                            title=table_menu.title,
+                            description=table_menu.description
+                        ).model_dump()
+                    }
                 )
-                db_menu = {'id': db_menu_obj.id}
-                await cache.invalidate_on_menu_create()
-                menu_created = True
+                plan.invalidate()
             else:
-                if table_menu.description != db_menu['description']:
-                    menu_obj: Any
-                    menu_obj = await self.menu_crud.get(db_menu['id'])
-                    await self.menu_crud.update(
-                        menu_obj,
-                        MenuUpdate(description=table_menu.description)
+                menu_id = db_menu['id']
+                if table_menu.description != db_menu.get('description'):
+                    plan.menus_to_update.append(
+                        {
+                            'id': menu_id,
+                            **MenuUpdate(description=table_menu.description).model_dump(exclude_unset=True)
+                        }
                     )
-                    await cache.invalidate_on_menu_update(db_menu['id'])
-
-            await self._update_db_submenus(table_menu, db_menu, menu_created)
+                    plan.invalidate(f'{OBJ_PREFIX}:{menu_id}')
+            self._plan_submenus(menu_pair, menu_id, plan)
 
-    async def _update_db_submenus(
+    def _plan_submenus(
         self,
-        table_menu: MenuTable,
-        db_menu: Any,
-        menu_created: bool
+        menu_pair: MenuPair,
+        menu_id: uuid.UUID,
+        plan: SyncPlan
     ) -> None:
-        """Добавление в бд данных о подменю из таблицы."""
-        for table_submenu in table_menu.submenus:
-            db_submenu = None
-            submenu_created = False
-            if menu_created is False:
-                for submenu in db_menu['submenus']:
-                    if submenu['title'] == table_submenu.title:
-                        db_submenu = submenu
-                        break
+        """Вычисление изменений подменю и блюд меню `menu_id`."""
+        for submenu_pair in menu_pair.submenus:
+            table_submenu, db_submenu = submenu_pair.table, submenu_pair.db
             if db_submenu is None:
-                db_submenu_obj = await self.submenu_crud.create(
-                    SubmenuCreate(
-                        title=table_submenu.title,
-                        description=table_submenu.description
-                    ),
-                    menu_id=db_menu['id']
+                submenu_id = uuid7()
+                plan.submenus_to_create.append(
+                    {
+                        'id': submenu_id,
+                        'menu_id': menu_id,
+                        **SubmenuCreate(
+                            title=table_submenu.title,
+                            description=table_submenu.description
+                        ).model_dump()
+                    }
                 )
-                db_submenu = {'id': db_submenu_obj.id}
-                await cache.invalidate_on_submenu_create(db_menu['id'])
-                submenu_created = True
+                plan.invalidate(f'{LIST_PREFIX}:{menu_id}', f'{OBJ_PREFIX}:{menu_id}')
             else:
-                if table_submenu.description != db_submenu['description']:
-                    submenu_obj: Any
-                    submenu_obj = await self.submenu_crud.get(db_submenu['id'])
-                    await self.submenu_crud.update(
-                        submenu_obj,
-                        SubmenuUpdate(description=table_submenu.description)
+                submenu_id = db_submenu['id']
+                if table_submenu.description != db_submenu.get('description'):
+                    plan.submenus_to_update.append(
+                        {
+                            'id': submenu_id,
+                            **SubmenuUpdate(description=table_submenu.description).model_dump(exclude_unset=True)
+                        }
                     )
-                    await cache.invalidate_on_submenu_update(db_menu['id'], db_submenu['id'])
-            await self._update_db_dishes(table_submenu, db_menu, db_submenu, submenu_created)
+                    plan.invalidate(f'{LIST_PREFIX}:{menu_id}', f'{OBJ_PREFIX}:{menu_id}:{submenu_id}')
+            self._plan_dishes(submenu_pair, menu_id, submenu_id, plan)
 
-    async def _update_db_dishes(
+    def _plan_dishes(
         self,
-        table_submenu: SubmenuTable,
-        db_menu: Any,
-        db_submenu: Any,
-        submenu_created: bool
+        submenu_pair: SubmenuPair,
+        menu_id: uuid.UUID,
+        submenu_id: uuid.UUID,
+        plan: SyncPlan
     ) -> None:
-        for table_dish in table_submenu.dishes:
-            db_dish = None
-            if submenu_created is False:
-                for dish in db_submenu['dishes']:
-                    if dish['title'] == table_dish.title:
-                        db_dish = dish
-                        break
+        """Вычисление изменений блюд подменю `submenu_id`."""
+        for dish_pair in submenu_pair.dishes:
+            table_dish, db_dish = dish_pair.table, dish_pair.db
             if db_dish is None:
-                db_dish_obj = await self.dish_crud.create(
-                    DishCreate(
-                        title=table_dish.title,
-                        description=table_dish.description,
-                        price=str(table_dish.price)
-                    ),
-                    submenu_id=db_submenu['id']
+                dish_id = uuid7()
+                plan.dishes_to_create.append(
+                    {
+                        'id': dish_id,
+                        'menu_id': menu_id,
+                        'submenu_id': submenu_id,
+                        **DishCreate(
+                            title=table_dish.title,
+                            description=table_dish.description,
+                            price=str(table_dish.price)
+                        ).model_dump()
+                    }
+                )
+                plan.invalidate(
+                    f'{LIST_PREFIX}:{menu_id}',
+                    f'{LIST_PREFIX}:{menu_id}:{submenu_id}',
+                    f'{OBJ_PREFIX}:{menu_id}',
+                    f'{OBJ_PREFIX}:{menu_id}:{submenu_id}'
                 )
-                db_dish = {'id': db_dish_obj.id}
-                await cache.invalidate_on_dish_create(db_menu['id'], db_submenu['id'])
-                if table_dish.discount:
-                    await cache.set(
-                        f'{DISCOUNT_PREFIX}:{db_menu["id"]}:{db_submenu["id"]}:{db_dish["id"]}',
-                        table_dish.discount,
-                        lifetime=False
-                    )
             else:
+                dish_id = db_dish['id']
                 to_update = {}
-                if table_dish.description != db_dish['description']:
+                if table_dish.description != db_dish.get('description'):
                     to_update['description'] = table_dish.description
                 if table_dish.price != db_dish['price']:
                     to_update['price'] = str(table_dish.price)
                 if to_update:
-                    dish_obj: Any
-                    dish_obj = await self.dish_crud.get(db_dish['id'])
-                    await self.dish_crud.update(
-                        dish_obj,
-                        DishUpdate.model_validate(to_update)
+                    plan.dishes_to_update.append(
+                        {
+                            'id': dish_id,
+                            **DishUpdate.model_validate(to_update).model_dump(exclude_unset=True)
+                        }
                     )
-                cache_discount = await cache.get(
-                    f'{DISCOUNT_PREFIX}:{db_menu["id"]}:{db_submenu["id"]}:{db_dish["id"]}'
-                )
-                if table_dish.discount and table_dish.discount != cache_discount:
-                    await cache.set(
-                        f'{DISCOUNT_PREFIX}:{db_menu["id"]}:{db_submenu["id"]}:{db_dish["id"]}',
-                        table_dish.discount,
-                        lifetime=False
+                    plan.invalidate(
+                        f'{LIST_PREFIX}:{menu_id}:{submenu_id}',
+                        f'{OBJ_PREFIX}:{menu_id}:{submenu_id}:{dish_id}'
                     )
-                if to_update or table_dish.discount and table_dish.discount != cache_discount:
-                    await cache.invalidate_on_dish_update(db_menu['id'], db_submenu['id'], db_dish['id'])
+            plan.discounts[f'{DISCOUNT_PREFIX}:{menu_id}:{submenu_id}:{dish_id}'] = (
+                table_dish.discount or None,
+                (
+                    f'{LIST_PREFIX}:{menu_id}:{submenu_id}',
+                    f'{OBJ_PREFIX}:{menu_id}:{submenu_id}:{dish_id}'
+                )
+            )
+
+    def _plan_dish_removal(self, menu_id: uuid.UUID, dish: DishDict, plan: SyncPlan) -> None:
+        """Ключи кэша, устаревающие при удалении блюда."""
+        submenu_id, dish_id = dish['submenu_id'], dish['id']
+        plan.invalidate(
+            f'{LIST_PREFIX}:{menu_id}',
+            f'{LIST_PREFIX}:{menu_id}:{submenu_id}',
+            f'{OBJ_PREFIX}:{menu_id}',
+            f'{OBJ_PREFIX}:{menu_id}:{submenu_id}',
+            f'{OBJ_PREFIX}:{menu_id}:{submenu_id}:{dish_id}',
+            f'{DISCOUNT_PREFIX}:{menu_id}:{submenu_id}:{dish_id}'
+        )
+
+    def _plan_submenu_removal(self, submenu: SubmenuNestedDict, plan: SyncPlan) -> None:
+        """Ключи кэша, устаревающие при удалении подменю вместе с блюдами."""
+        menu_id = submenu['menu_id']
+        plan.invalidate(
+            f'{LIST_PREFIX}:{menu_id}',
+            f'{OBJ_PREFIX}:{menu_id}',
+            f'{LIST_PREFIX}:{menu_id}:{submenu["id"]}',
+            f'{OBJ_PREFIX}:{menu_id}:{submenu["id"]}'
+        )
+        for dish in submenu['dishes']:
+            self._plan_dish_removal(menu_id, dish, plan)
+
+    def _plan_removals(self, diff: SyncDiff, plan: SyncPlan) -> None:
+        """Вычисление ключей кэша удаляемых объектов и их вложенных объектов."""
+        for menu in diff.deleted_menus:
+            for submenu in menu['submenus']:
+                self._plan_submenu_removal(submenu, plan)
+            plan.invalidate(f'{LIST_PREFIX}:{menu["id"]}', f'{OBJ_PREFIX}:{menu["id"]}')
+        for submenu in diff.deleted_submenus:
+            self._plan_submenu_removal(submenu, plan)
+        for menu_id, dish in diff.deleted_dishes:
+            self._plan_dish_removal(menu_id, dish, plan)
+
+    async def _plan_discounts(self, plan: SyncPlan) -> dict[str, Any]:
+        """
+        Сравнение скидок из таблицы со скидками в кэше.
+
+        Текущие скидки читаются одним запросом. Возвращает скидки
+        для записи; ключи отмененных скидок и кэш блюд с изменившейся
+        скидкой добавляются к удалению.
+        """
+        keys = list(plan.discounts)
+        cached = await cache.get_many(keys)
+        to_set = {}
+        for key, cached_discount in zip(keys, cached):
+            discount, dish_keys = plan.discounts[key]
+            if discount == cached_discount:
+                continue
+            if discount:
+                to_set[key] = discount
+            else:
+                plan.cache_keys.add(key)
+            plan.invalidate(*dish_keys)
+        return to_set
+
+    async def _apply_plan(self, diff: SyncDiff, plan: SyncPlan) -> None:
+        """Применение изменений к бд в одной транзакции."""
+        session = self.menu_crud.session
+        try:
+            await self.dish_crud.bulk_delete([dish['id'] for _, dish in diff.deleted_dishes])
+            await self.submenu_crud.bulk_delete([submenu['id'] for submenu in diff.deleted_submenus])
+            await self.menu_crud.bulk_delete([menu['id'] for menu in diff.deleted_menus])
+            await self.menu_crud.bulk_update(plan.menus_to_update)
+            await self.menu_crud.bulk_insert(plan.menus_to_create)
+            await self.submenu_crud.bulk_update(plan.submenus_to_update)
+            await self.submenu_crud.bulk_insert(plan.submenus_to_create)
+            await self.dish_crud.bulk_update(plan.dishes_to_update)
+            await self.dish_crud.bulk_insert(plan.dishes_to_create)
+        except Exception:
+            await session.rollback()
+            raise
+        await session.commit()
+
+    async def apply(self, diff: SyncDiff) -> None:
+        """
+        Применение расхождений к бд и кэшу.
+
+        Меню, помеченные удаленными, не попадают в данные бд, но их подменю
+        и блюда по-прежнему занимают свои названия. Поэтому перед
+        созданием новых объектов они удаляются порциями, а меню,
+        оставшееся в таблице, создается заново: мягкое удаление меню,
+        управляемого таблицей, отменяется следующей синхронизацией.
+        Скидки из кэша читаются одним запросом до начала транзакции.
+        После ее фиксации новые скидки и удаление всех собранных
+        ключей отправляются в Redis одним конвейером.
+        """
+        plan = SyncPlan()
+        self._plan_menus(diff, plan)
+        self._plan_removals(diff, plan)
+        discounts = await self._plan_discounts(plan)
+        if plan.menus_to_create or plan.submenus_to_create or plan.dishes_to_create:
+            await self.menu_crud.purge_deleted(MENU_PURGE_BATCH_SIZE)
+        await self._apply_plan(diff, plan)
+        await cache.apply_sync(discounts, plan.cache_keys)
+
+
+async def apply_table_data(
+    sessions: SessionProvider,
+    table_data: list[MenuTable],
+    source_signature: str | None = None
+) -> None:
+    """
+    Синхронизация бд с табличными данными.
+
+    Если общий отпечаток таблицы совпадает с отпечатком последней
+    примененной версии, синхронизация не выполняется. Иначе сверяются
+    только меню, отпечатки которых изменились (в том числе удаленные
+    из таблицы). При отсутствии сохраненных отпечатков сверяются все данные.
+    Сигнатура источника `source_signature` сохраняется вместе с отпечатками.
+    """
+    menu_fingerprints = {menu.title: get_fingerprint(menu) for menu in table_data}
+    table_fingerprint = get_table_fingerprint(menu_fingerprints)
+    if await cache.get(SYNC_ALL_KEY) == table_fingerprint:
+        if source_signature is not None:
+            await cache.set_sync_fingerprints(table_fingerprint, menu_fingerprints, source_signature)
+        return
+    applied_fingerprints = await cache.hgetall(SYNC_MENUS_KEY)
+    titles = None
+    if applied_fingerprints:
+        titles = {
+            title for title, fingerprint in menu_fingerprints.items()
+            if applied_fingerprints.get(title) != fingerprint
+        }
+        titles |= applied_fingerprints.keys() - menu_fingerprints.keys()
+        table_data = [menu for menu in table_data if menu.title in titles]
+
+    menu_crud = CRUDMenu(sessions)
+    submenu_crud = CRUDSubmenu(sessions)
+    dish_crud = CRUDDish(sessions)
+    sync = SyncDatabaseData(menu_crud, submenu_crud, dish_crud)
+
+    db_data = await menu_crud.get_all(titles=titles)
+    diff = compare_data(table_data, db_data)
+
+    await cache.pin_primary()
+    await sync.apply(diff)
+    await cache.set_sync_fingerprints(table_fingerprint, menu_fingerprints, source_signature)
+
+
+async def sync_table_source(sessions: SessionProvider) -> None:
+    """
+    Синхронизация бд с источником табличных данных.
+
+    Если сигнатура источника не изменилась с последней успешной
+    синхронизации, таблица не загружается и не разбирается.
+    Сигнатура получается до чтения таблицы, поэтому изменение,
+    сделанное во время чтения, будет обнаружено при следующем запуске.
+    Получение сигнатуры, загрузка и разбор таблицы выполняются
+    в отдельном потоке и не блокируют цикл событий.
+    """
+    source_signature = await asyncio.to_thread(get_source_signature)
+    if await cache.get(SYNC_SOURCE_KEY) == source_signature:
+        return
+    table_data = await asyncio.to_thread(get_table_data)
+    await apply_table_data(sessions, table_data, source_signature)
@@ -0,0 +1,57 @@
+"""
+Запуск синхронизации при изменении xlsx-файла с меню.
+
+Запуск: `python -m app.tasks.watcher`.
+Наблюдатель ставит задачу синхронизации в очередь при старте и после
+каждой серии изменений файла. Поскольку редакторы часто сохраняют файл
+через создание нового и переименование, отслеживается каталог файла.
+При `SYNC_WATCH=True` периодический опрос остается резервным
+и выполняется реже.
+"""
+import logging
+from pathlib import Path
+from threading import Event
+
+from watchfiles import Change, watch
+
+from app.core.config import settings
+from app.tasks.celery_tasks import sync_table_db
+from app.tasks.utils import get_source_path
+
+logger = logging.getLogger(__name__)
+
+
+class SourceFilter:
+    """Фильтр событий, относящихся к файлу с меню."""
+
+    def __init__(self, source_path: Path) -> None:
+        self.source_path = source_path
+
+    def __call__(self, change: Change, path: str) -> bool:
+        return Path(path) == self.source_path
+
+
+def watch_source(stop_event: Event | None = None) -> None:
+    """
+    Отслеживание изменений файла с меню.
+
+    События, произошедшие в пределах `sync_watch_debounce` миллисекунд,
+    объединяются в одну задачу синхронизации.
+    """
+    if settings.use_google_sheets:
+        raise RuntimeError('Наблюдение доступно только для локального файла')
+    source_path = get_source_path().resolve()
+    sync_table_db.delay()
+    for _ in watch(
+        source_path.parent,
+        watch_filter=SourceFilter(source_path),
+        debounce=settings.sync_watch_debounce,
+        stop_event=stop_event
+    ):
+        logger.info('Файл %s изменен, запуск синхронизации', source_path)
+        sync_table_db.delay()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    watch_source()
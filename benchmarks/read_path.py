@@ -0,0 +1,113 @@
+"""
+Сравнение стоимости чтения строк через ORM и через SQLAlchemy Core.
+
+Запуск: `python -m benchmarks.read_path [количество блюд] [количество повторов]`.
+Тестовые данные создаются в транзакции, которая откатывается по завершении.
+"""
+import asyncio
+import sys
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.db import engine
+from app.models import Dish, Menu, Submenu
+
+
+async def seed(connection: AsyncConnection, dishes_count: int) -> tuple[uuid.UUID, uuid.UUID]:
+    """Создание меню и подменю с `dishes_count` блюдами."""
+    menu_id, submenu_id = uuid.uuid4(), uuid.uuid4()
+    await connection.execute(
+        insert(Menu).values(id=menu_id, title=f'bench_{menu_id}', description='d' * 200)
+    )
+    await connection.execute(
+        insert(Submenu).values(
+            id=submenu_id,
+            title=f'bench_{submenu_id}',
+            description='d' * 200,
+            menu_id=menu_id
+        )
+    )
+    await connection.execute(
+        insert(Dish),
+        [
+            {
+                'title': f'bench_{submenu_id}_{number}',
+                'description': 'd' * 1000,
+                'price': number,
+                'submenu_id': submenu_id,
+                'menu_id': menu_id
+            } for number in range(dishes_count)
+        ]
+    )
+    return menu_id, submenu_id
+
+
+async def read_orm(session: AsyncSession, menu_id: uuid.UUID, submenu_id: uuid.UUID) -> list[dict[str, Any]]:
+    """Чтение блюд с созданием ORM-объектов (прежний способ)."""
+    db_objs = await session.execute(
+        select(Dish)
+        .join(Submenu, Submenu.id == Dish.submenu_id)
+        .where(Dish.submenu_id == submenu_id, Submenu.menu_id == menu_id)
+    )
+    dishes = [
+        {
+            'id': dish.id,
+            'title': dish.title,
+            'description': dish.description,
+            'price': dish.price,
+            'submenu_id': dish.submenu_id
+        } for dish in db_objs.scalars()
+    ]
+    session.expunge_all()
+    return dishes
+
+
+async def read_core(session: AsyncSession, menu_id: uuid.UUID, submenu_id: uuid.UUID) -> list[dict[str, Any]]:
+    """Чтение блюд через SQLAlchemy Core с преобразованием строк в словари."""
+    connection = await session.connection()
+    result = await connection.execute(
+        select(Dish.id, Dish.title, Dish.description, Dish.price, Dish.submenu_id)
+        .join(Submenu, Submenu.id == Dish.submenu_id)
+        .where(Dish.submenu_id == submenu_id, Submenu.menu_id == menu_id)
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+async def measure(
+    reader: Callable[..., Awaitable[list[dict[str, Any]]]],
+    session: AsyncSession,
+    menu_id: uuid.UUID,
+    submenu_id: uuid.UUID,
+    repeats: int
+) -> tuple[float, int]:
+    """Среднее время одного чтения и количество прочитанных строк."""
+    rows = await reader(session, menu_id, submenu_id)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        await reader(session, menu_id, submenu_id)
+    return (time.perf_counter() - start) / repeats, len(rows)
+
+
+async def main(dishes_count: int = 1000, repeats: int = 20) -> None:
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        menu_id, submenu_id = await seed(connection, dishes_count)
+        session = AsyncSession(bind=connection, join_transaction_mode='create_savepoint')
+        for name, reader in (('ORM', read_orm), ('Core', read_core)):
+            elapsed, rows = await measure(reader, session, menu_id, submenu_id, repeats)
+            print(
+                f'{name:>4}: {elapsed * 1000:8.2f} мс на запрос, '
+                f'{elapsed / rows * 1_000_000:6.2f} мкс на строку ({rows} строк)'
+            )
+        await session.close()
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*args))
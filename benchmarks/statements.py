@@ -0,0 +1,94 @@
+"""
+Сравнение построения запросов заново и через кэшируемые lambda-выражения.
+
+Запуск: `python -m benchmarks.statements [количество повторов]`.
+Измеряется подготовка запроса к выполнению (построение конструкции,
+генерация ключа кэша и получение скомпилированного SQL из кэша движка),
+а также полное выполнение запроса к базе данных.
+"""
+import asyncio
+import sys
+import time
+import uuid
+from typing import Any, Callable
+
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.db import engine
+from app.models import Dish, Submenu
+
+
+def build_plain(menu_id: uuid.UUID, obj_id: uuid.UUID) -> Any:
+    """Построение запроса с нуля (прежний способ)."""
+    return (
+        select(
+            Submenu.id,
+            Submenu.title,
+            Submenu.description,
+            Submenu.menu_id,
+            func.count(Dish.id).label('dishes_count')
+        )
+        .join(Dish, Dish.submenu_id == Submenu.id, isouter=True)
+        .where(Submenu.menu_id == menu_id)
+        .group_by(Submenu.id)
+        .where(Submenu.id == obj_id)
+    )
+
+
+def build_lambda(menu_id: uuid.UUID, obj_id: uuid.UUID) -> Any:
+    """Построение запроса через кэшируемое lambda-выражение."""
+    statement = lambda_stmt(
+        lambda: select(
+            Submenu.id,
+            Submenu.title,
+            Submenu.description,
+            Submenu.menu_id,
+            func.count(Dish.id).label('dishes_count')
+        )
+        .join(Dish, Dish.submenu_id == Submenu.id, isouter=True)
+        .where(Submenu.menu_id == menu_id)
+        .group_by(Submenu.id)
+    )
+    statement += lambda s: s.where(Submenu.id == obj_id)
+    return statement
+
+
+def measure_prepare(builder: Callable[..., Any], repeats: int) -> float:
+    """Среднее время построения запроса и генерации ключа кэша."""
+    builder(uuid.uuid4(), uuid.uuid4())._generate_cache_key()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        builder(uuid.uuid4(), uuid.uuid4())._generate_cache_key()
+    return (time.perf_counter() - start) / repeats
+
+
+async def measure_execute(
+    builder: Callable[..., Any],
+    connection: AsyncConnection,
+    repeats: int
+) -> float:
+    """Среднее время построения и выполнения запроса."""
+    await connection.execute(builder(uuid.uuid4(), uuid.uuid4()))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = await connection.execute(builder(uuid.uuid4(), uuid.uuid4()))
+        result.all()
+    return (time.perf_counter() - start) / repeats
+
+
+async def main(repeats: int = 2000) -> None:
+    async with engine.connect() as connection:
+        for name, builder in (('select', build_plain), ('lambda', build_lambda)):
+            prepare = measure_prepare(builder, repeats)
+            execute = await measure_execute(builder, connection, repeats)
+            print(
+                f'{name:>6}: подготовка {prepare * 1_000_000:7.1f} мкс, '
+                f'выполнение {execute * 1_000_000:7.1f} мкс'
+            )
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:2]]
+    asyncio.run(main(*args))
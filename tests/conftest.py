@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engin
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import text
 
-from app.core.db import get_async_session
+from app.core.db import SessionProvider, get_session_provider
 from app.main import app
 from app.models import Base, Dish, Menu, Submenu
 
@@ -32,12 +32,15 @@ TestingSessionLocal = sessionmaker(
 )
 
 
-async def override_get_async_session() -> AsyncIterator[AsyncSession]:
-    async with TestingSessionLocal() as session:
-        yield session
+async def override_get_session_provider() -> AsyncIterator[SessionProvider]:
+    provider = SessionProvider(TestingSessionLocal)
+    try:
+        yield provider
+    finally:
+        await provider.close()
 
 
-app.dependency_overrides[get_async_session] = override_get_async_session
+app.dependency_overrides[get_session_provider] = override_get_session_provider
 
 
 @pytest.fixture(scope='session')
@@ -66,6 +69,7 @@ async def clear_cache(redis_client: Redis):
 @pytest.fixture(autouse=True, scope='session')
 async def init_db() -> AsyncIterator[AsyncEngine]:
     async with engine.begin() as conn:
+        await conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
         await conn.run_sync(Base.metadata.create_all)
     yield engine
     async with engine.begin() as conn:
@@ -130,7 +134,8 @@ async def dish(submenu: Submenu) -> Dish:
             title='dish_title',
             description='dish_description',
             price=10.0,
-            submenu_id=submenu.id
+            submenu_id=submenu.id,
+            menu_id=submenu.menu_id
         )
         session.add(dish)
         await session.commit()
@@ -146,7 +151,25 @@ async def dish_another(submenu: Submenu) -> Dish:
             title='dish_another_title',
             description='dish_description',
             price=10.0,
-            submenu_id=submenu.id
+            submenu_id=submenu.id,
+            menu_id=submenu.menu_id
+        )
+        session.add(dish)
+        await session.commit()
+        await session.refresh(dish)
+    return dish
+
+
+@pytest.fixture()
+async def dish_expensive(submenu: Submenu) -> Dish:
+    """Фикстура блюда с высокой ценой."""
+    async with TestingSessionLocal() as session:
+        dish = Dish(
+            title='a_dish_expensive_title',
+            description='dish_description',
+            price=100.0,
+            submenu_id=submenu.id,
+            menu_id=submenu.menu_id
         )
         session.add(dish)
         await session.commit()
@@ -10,12 +10,18 @@ CREATE_SUBMENU = 'create_submenu'
 GET_SUBMENU = 'get_submenu'
 UPDATE_SUBMENU = 'update_submenu'
 DELETE_SUBMENU = 'delete_submenu'
+CREATE_SUBMENUS_BULK = 'create_submenus_bulk'
+UPDATE_SUBMENUS_BULK = 'update_submenus_bulk'
+DELETE_SUBMENUS_BULK = 'delete_submenus_bulk'
 
 GET_ALL_DISHES = 'get_all_dishes'
 CREATE_DISH = 'create_dish'
 GET_DISH = 'get_dish'
 UPDATE_DISH = 'update_dish'
 DELETE_DISH = 'delete_dish'
+CREATE_DISHES_BULK = 'create_dishes_bulk'
+UPDATE_DISHES_BULK = 'update_dishes_bulk'
+DELETE_DISHES_BULK = 'delete_dishes_bulk'
 
 UNEXISTING_UUID = '00000000-0000-0000-0000-000000000000'
 
@@ -25,3 +31,11 @@ SUBMENUS_URL = '/api/v1/menus/{menu_id}/submenus'
 SUBMENU_OBJ_URL = '/api/v1/menus/{menu_id}/submenus/{submenu_id}'
 DISHES_URL = '/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes'
 DISH_OBJ_URL = '/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}'
+SUBMENUS_BULK_URL = '/api/v1/menus/{menu_id}/submenus/bulk'
+DISHES_BULK_URL = '/api/v1/menus/{menu_id}/submenus/{submenu_id}/dishes/bulk'
+
+GET_DB_POOL_STATS = 'get_db_pool_stats'
+SEARCH_DISHES = 'search_dishes'
+
+DB_POOL_STATS_URL = '/api/v1/monitoring/db-pool'
+SEARCH_URL = '/api/v1/search/'
@@ -3,18 +3,23 @@ from typing import Any
 
 import pytest
 from httpx import AsyncClient
+from redis.asyncio.client import Redis
 from sqlalchemy import func, select
 
 from .conftest import Dish, Menu, Submenu, TestingSessionLocal
 from .constants import (
     CREATE_DISH,
+    CREATE_DISHES_BULK,
     DELETE_DISH,
+    DELETE_DISHES_BULK,
     DISH_OBJ_URL,
+    DISHES_BULK_URL,
     DISHES_URL,
     GET_ALL_DISHES,
     GET_DISH,
     UNEXISTING_UUID,
     UPDATE_DISH,
+    UPDATE_DISHES_BULK,
 )
 from .utils import reverse
 
@@ -57,6 +62,162 @@ class TestGetAllDishes:
         )
 
 
+class TestFilterDishes:
+
+    async def test_dish_filter_by_min_price(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        dish_expensive: Dish
+    ):
+        url = reverse(GET_ALL_DISHES, menu_id=menu.id, submenu_id=submenu.id)
+        response = await client.get(url, params={'min_price': 50})
+        assert [obj['id'] for obj in response.json()] == [str(dish_expensive.id)], (
+            f'GET-запрос к `{DISHES_URL}` с параметром `min_price` должен '
+            'возвращать только блюда с ценой не ниже указанной'
+        )
+
+    async def test_dish_filter_by_max_price(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        dish_expensive: Dish
+    ):
+        url = reverse(GET_ALL_DISHES, menu_id=menu.id, submenu_id=submenu.id)
+        await client.get(url)
+        response = await client.get(url, params={'max_price': 50})
+        assert [obj['id'] for obj in response.json()] == [str(dish.id)], (
+            f'GET-запрос к `{DISHES_URL}` с параметром `max_price` должен '
+            'возвращать только блюда с ценой не выше указанной'
+        )
+
+    @pytest.mark.parametrize('sort, expected_order', [
+        ('price', ['dish_title', 'a_dish_expensive_title']),
+        ('title', ['a_dish_expensive_title', 'dish_title']),
+    ])
+    async def test_dish_sort(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        dish_expensive: Dish,
+        sort: str,
+        expected_order: list[str]
+    ):
+        url = reverse(GET_ALL_DISHES, menu_id=menu.id, submenu_id=submenu.id)
+        response = await client.get(url, params={'sort': sort})
+        assert [obj['title'] for obj in response.json()] == expected_order, (
+            f'GET-запрос к `{DISHES_URL}` с параметром `sort={sort}` '
+            'должен возвращать отсортированный список блюд'
+        )
+
+    async def test_dish_filter_by_discount(
+        self,
+        client: AsyncClient,
+        redis_client: Redis,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        dish_expensive: Dish
+    ):
+        await redis_client.set(f'discount:{menu.id}:{submenu.id}:{dish_expensive.id}', '0.5')
+        url = reverse(GET_ALL_DISHES, menu_id=menu.id, submenu_id=submenu.id)
+        with_discount = await client.get(url, params={'has_discount': True})
+        without_discount = await client.get(url, params={'has_discount': False})
+        assert [obj['id'] for obj in with_discount.json()] == [str(dish_expensive.id)], (
+            f'GET-запрос к `{DISHES_URL}` с параметром `has_discount=true` '
+            'должен возвращать только блюда со скидкой'
+        )
+        assert [obj['id'] for obj in without_discount.json()] == [str(dish.id)], (
+            f'GET-запрос к `{DISHES_URL}` с параметром `has_discount=false` '
+            'должен возвращать только блюда без скидки'
+        )
+
+    @pytest.mark.parametrize('params, expected_order', [
+        ({'sort': 'price'}, ['a_dish_expensive_title', 'dish_title']),
+        ({'max_price': 8}, ['a_dish_expensive_title']),
+        ({'min_price': 8}, ['dish_title']),
+    ])
+    async def test_dish_filter_by_discounted_price(
+        self,
+        client: AsyncClient,
+        redis_client: Redis,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        dish_expensive: Dish,
+        params: dict[str, Any],
+        expected_order: list[str]
+    ):
+        await redis_client.set(f'discount:{menu.id}:{submenu.id}:{dish_expensive.id}', '0.95')
+        url = reverse(GET_ALL_DISHES, menu_id=menu.id, submenu_id=submenu.id)
+        response = await client.get(url, params=params)
+        assert [obj['title'] for obj in response.json()] == expected_order, (
+            f'GET-запрос к `{DISHES_URL}` с параметрами {params} должен '
+            'фильтровать и сортировать блюда по цене с учетом скидки'
+        )
+
+    async def test_dish_list_cache_lifetime_not_extended(
+        self,
+        client: AsyncClient,
+        redis_client: Redis,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(GET_ALL_DISHES, menu_id=menu.id, submenu_id=submenu.id)
+        key = f'list:{menu.id}:{submenu.id}'
+        await client.get(url)
+        await redis_client.expire(key, 5)
+        await client.get(url, params={'sort': 'price'})
+        ttl = await redis_client.ttl(key)
+        assert 0 < ttl <= 5, (
+            f'Кэширование списка блюд с новыми параметрами GET-запроса к `{DISHES_URL}` '
+            'не должно продлевать время жизни ранее закэшированных списков'
+        )
+
+    async def test_dish_compact_list(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(GET_ALL_DISHES, menu_id=menu.id, submenu_id=submenu.id)
+        await client.get(url)
+        response = await client.get(url, params={'compact': True})
+        assert response.json() == [
+            {
+                'id': str(dish.id),
+                'title': dish.title,
+                'price': f'{dish.price:.2f}',
+                'discount': '0%',
+                'submenu_id': str(submenu.id)
+            }
+        ], (
+            f'GET-запрос к `{DISHES_URL}` с параметром `compact=true` '
+            'не должен возвращать описания блюд'
+        )
+
+    async def test_dish_filter_negative_price(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu
+    ):
+        url = reverse(GET_ALL_DISHES, menu_id=menu.id, submenu_id=submenu.id)
+        response = await client.get(url, params={'min_price': -1})
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, (
+            f'GET-запрос к `{DISHES_URL}` с отрицательным `min_price` '
+            'должен возвращать статус 422'
+        )
+
+
 class TestCreateDish:
     async def test_dish_post_status(
         self,
@@ -158,6 +319,61 @@ class TestCreateDish:
             'равным `submenu_id` из `url`'
         )
 
+    async def test_dish_post_duplicate_title(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(CREATE_DISH, menu_id=menu.id, submenu_id=submenu.id)
+        json = {
+            'title': dish.title,
+            'description': 'dish_description',
+            'price': '10'
+        }
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'POST-запрос к `{DISHES_URL}` с названием уже существующего блюда '
+            'должен возвращать статус 400'
+        )
+
+    async def test_dish_post_if_submenu_404(
+        self,
+        client: AsyncClient,
+        menu: Menu
+    ):
+        url = reverse(CREATE_DISH, menu_id=menu.id, submenu_id=UNEXISTING_UUID)
+        json = {
+            'title': 'dish_title',
+            'description': 'dish_description',
+            'price': '10'
+        }
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'POST-запрос к `{DISHES_URL}` должен возвращать статус 404, '
+            'если подменю с `submenu_id` отсутствует в базе'
+        )
+
+    async def test_dish_post_duplicate_title_if_submenu_404(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        dish: Dish
+    ):
+        url = reverse(CREATE_DISH, menu_id=menu.id, submenu_id=UNEXISTING_UUID)
+        json = {
+            'title': dish.title,
+            'description': 'dish_description',
+            'price': '10'
+        }
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'POST-запрос к `{DISHES_URL}` с названием уже существующего блюда '
+            'должен возвращать статус 400, даже если подменю с `submenu_id` '
+            'отсутствует в базе'
+        )
+
     @pytest.mark.parametrize('dish_title', [None, True, 123])
     async def test_dish_post_invalid_title(
         self,
@@ -609,3 +825,158 @@ class TestDeleteDish:
             f'Убедитесь, что в результате DELETE-запроса к `{DISH_OBJ_URL}` '
             'блюдо с `id` равным `dish_id` удаляется из базы'
         )
+
+
+class TestBulkDishes:
+
+    async def test_dish_bulk_post(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu
+    ):
+        url = reverse(CREATE_DISHES_BULK, menu_id=menu.id, submenu_id=submenu.id)
+        json = [
+            {'title': f'dish_{i}', 'description': 'dish_description', 'price': '12.50'}
+            for i in range(3)
+        ]
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'POST-запрос к `{DISHES_BULK_URL}` должен возвращать статус 201'
+        )
+        assert [
+            (obj['title'], obj['price'], obj['submenu_id']) for obj in response.json()
+        ] == [
+            (obj['title'], obj['price'], str(submenu.id)) for obj in json
+        ], (
+            f'POST-запрос к `{DISHES_BULK_URL}` должен возвращать '
+            'созданные блюда в порядке их передачи'
+        )
+        async with TestingSessionLocal() as session:
+            dishes_count = await session.scalar(
+                select(func.count(Dish.id)).where(Dish.menu_id == menu.id)
+            )
+        assert dishes_count == len(json), (
+            f'Убедитесь, что в результате POST-запроса к `{DISHES_BULK_URL}` '
+            'в базе создаются все переданные блюда'
+        )
+
+    async def test_dish_bulk_post_if_submenu_404(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu
+    ):
+        url = reverse(CREATE_DISHES_BULK, menu_id=UNEXISTING_UUID, submenu_id=submenu.id)
+        json = [{'title': 'dish_title', 'description': 'dish_description', 'price': '1'}]
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'POST-запрос к `{DISHES_BULK_URL}` должен возвращать статус 404, '
+            'если подменю `submenu_id` не связано с меню `menu_id`'
+        )
+
+    async def test_dish_bulk_post_duplicate_title(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(CREATE_DISHES_BULK, menu_id=menu.id, submenu_id=submenu.id)
+        json = [
+            {'title': 'dish_new', 'description': 'dish_description', 'price': '1'},
+            {'title': dish.title, 'description': 'dish_description', 'price': '1'}
+        ]
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'POST-запрос к `{DISHES_BULK_URL}` с существующим названием '
+            'должен возвращать статус 400'
+        )
+        async with TestingSessionLocal() as session:
+            dishes_count = await session.scalar(select(func.count(Dish.id)))
+        assert dishes_count == 1, (
+            f'Убедитесь, что при ошибке POST-запроса к `{DISHES_BULK_URL}` '
+            'не создается ни одно блюдо'
+        )
+
+    async def test_dish_bulk_patch(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        dish_another: Dish
+    ):
+        url = reverse(UPDATE_DISHES_BULK, menu_id=menu.id, submenu_id=submenu.id)
+        json = [
+            {'id': str(dish.id), 'price': '20'},
+            {'id': str(dish_another.id), 'title': 'dish_another_title_changed'}
+        ]
+        response = await client.patch(url, json=json)
+        assert response.status_code == HTTPStatus.OK, (
+            f'PATCH-запрос к `{DISHES_BULK_URL}` должен возвращать статус 200'
+        )
+        updated = {obj['id']: (obj['title'], obj['price']) for obj in response.json()}
+        assert updated == {
+            str(dish.id): (dish.title, '20.00'),
+            str(dish_another.id): ('dish_another_title_changed', f'{dish_another.price:.2f}')
+        }, (
+            f'PATCH-запрос к `{DISHES_BULK_URL}` должен изменять '
+            'только переданные поля каждого блюда'
+        )
+
+    async def test_dish_bulk_patch_404(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(UPDATE_DISHES_BULK, menu_id=menu.id, submenu_id=UNEXISTING_UUID)
+        response = await client.patch(url, json=[{'id': str(dish.id), 'price': '20'}])
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'PATCH-запрос к `{DISHES_BULK_URL}` должен возвращать статус 404, '
+            'если блюдо не связано с подменю `submenu_id`'
+        )
+
+    async def test_dish_bulk_delete(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        dish_another: Dish
+    ):
+        url = reverse(DELETE_DISHES_BULK, menu_id=menu.id, submenu_id=submenu.id)
+        response = await client.request(
+            'DELETE', url, json=[str(dish.id), str(dish_another.id)]
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'DELETE-запрос к `{DISHES_BULK_URL}` должен возвращать статус 200'
+        )
+        async with TestingSessionLocal() as session:
+            dishes_count = await session.scalar(select(func.count(Dish.id)))
+        assert dishes_count == 0, (
+            f'Убедитесь, что в результате DELETE-запроса к `{DISHES_BULK_URL}` '
+            'блюда удаляются из базы'
+        )
+
+    async def test_dish_bulk_delete_404(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(DELETE_DISHES_BULK, menu_id=menu.id, submenu_id=submenu.id)
+        response = await client.request('DELETE', url, json=[str(dish.id), UNEXISTING_UUID])
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'DELETE-запрос к `{DISHES_BULK_URL}` должен возвращать статус 404, '
+            'если хотя бы одно блюдо отсутствует в базе'
+        )
+        async with TestingSessionLocal() as session:
+            dishes_count = await session.scalar(select(func.count(Dish.id)))
+        assert dishes_count == 1, (
+            f'Убедитесь, что при ошибке DELETE-запроса к `{DISHES_BULK_URL}` '
+            'ни одно блюдо не удаляется'
+        )
@@ -1,17 +1,27 @@
+import uuid
 from http import HTTPStatus
 from typing import Any
 
 import pytest
 from httpx import AsyncClient
+from redis.asyncio.client import Redis
 from sqlalchemy import func, select
 
+from app.core.config import settings
+from app.core.db import SessionProvider
+from app.crud.menu import CRUDMenu
+
 from .conftest import Dish, Menu, Submenu, TestingSessionLocal
 from .constants import (
+    CREATE_DISH,
     CREATE_MENU,
+    CREATE_SUBMENU,
     DELETE_MENU,
     GET_ALL_MENUS,
     GET_ALL_NESTED,
+    GET_DISH,
     GET_MENU,
+    GET_SUBMENU,
     MENU_OBJ_URL,
     MENUS_URL,
     UNEXISTING_UUID,
@@ -63,6 +73,65 @@ class TestGetAllMenusNested:
             'когда в базе присутствуют связанные с подменю блюда'
         )
 
+    async def test_menu_nested_filter_and_sort_dishes(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        dish_another: Dish,
+        dish_expensive: Dish
+    ):
+        url = reverse(GET_ALL_NESTED)
+        await client.get(url)
+        response = await client.get(url, params={'max_price': 50, 'sort': 'title'})
+        dishes_data = response.json()[0]['submenus'][0]['dishes']
+        assert [obj['title'] for obj in dishes_data] == ['dish_another_title', 'dish_title'], (
+            f'GET-запрос к `{url}` с параметрами `max_price` и `sort` должен '
+            'возвращать отфильтрованные и отсортированные блюда'
+        )
+
+    async def test_menu_nested_filter_by_discounted_price(
+        self,
+        client: AsyncClient,
+        redis_client: Redis,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        dish_expensive: Dish
+    ):
+        await redis_client.set(f'discount:{menu.id}:{submenu.id}:{dish_expensive.id}', '0.95')
+        url = reverse(GET_ALL_NESTED)
+        response = await client.get(url, params={'max_price': 20, 'sort': 'price'})
+        dishes_data = response.json()[0]['submenus'][0]['dishes']
+        assert [obj['title'] for obj in dishes_data] == ['a_dish_expensive_title', 'dish_title'], (
+            f'GET-запрос к `{url}` с параметрами `max_price` и `sort=price` '
+            'должен фильтровать и сортировать блюда по цене с учетом скидки'
+        )
+
+    async def test_menu_nested_compact(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(GET_ALL_NESTED)
+        await client.get(url)
+        response = await client.get(url, params={'compact': True})
+        menu_data = response.json()[0]
+        submenu_data = menu_data['submenus'][0]
+        dish_data = submenu_data['dishes'][0]
+        assert all('description' not in obj for obj in (menu_data, submenu_data, dish_data)), (
+            f'GET-запрос к `{url}` с параметром `compact=true` не должен '
+            'возвращать описания меню, подменю и блюд'
+        )
+        full_response = await client.get(url)
+        assert 'description' in full_response.json()[0]['submenus'][0]['dishes'][0], (
+            f'GET-запрос к `{url}` без параметра `compact` '
+            'должен возвращать описания'
+        )
+
 
 class TestGetAllMenus:
 
@@ -176,6 +245,35 @@ class TestCreateMenu:
             'должен возвращать статус 422'
         )
 
+    async def test_menu_post_duplicate_title(self, client: AsyncClient, menu: Menu):
+        url = reverse(CREATE_MENU)
+        json = {
+            'title': menu.title,
+            'description': 'menu_description'
+        }
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'POST-запрос к `{MENUS_URL}` с названием уже существующего меню '
+            'должен возвращать статус 400'
+        )
+
+    async def test_menu_post_ids_time_ordered(self, client: AsyncClient):
+        url = reverse(CREATE_MENU)
+        ids = []
+        for i in range(5):
+            response = await client.post(
+                url, json={'title': f'menu_{i}', 'description': 'menu_description'}
+            )
+            ids.append(uuid.UUID(response.json()['id']))
+        assert all(obj_id.version == 7 for obj_id in ids), (
+            f'POST-запрос к `{MENUS_URL}` должен создавать меню '
+            'с идентификатором UUID версии 7'
+        )
+        assert ids == sorted(ids), (
+            'Идентификаторы созданных меню должны возрастать '
+            'в порядке создания'
+        )
+
 
 class TestGetMenu:
 
@@ -280,6 +378,25 @@ class TestUpdateMenu:
             '`description` в теле запроса должен возвращать статус 422'
         )
 
+    async def test_menu_patch_duplicate_title(self, client: AsyncClient, menu: Menu):
+        async with TestingSessionLocal() as session:
+            session.add(Menu(title='menu_another_title', description='descr'))
+            await session.commit()
+        url = reverse(UPDATE_MENU, menu_id=menu.id)
+        response = await client.patch(url, json={'title': 'menu_another_title'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'PATCH-запрос к `{MENU_OBJ_URL}` с названием уже существующего меню '
+            'должен возвращать статус 400'
+        )
+
+    async def test_menu_patch_same_title(self, client: AsyncClient, menu: Menu):
+        url = reverse(UPDATE_MENU, menu_id=menu.id)
+        response = await client.patch(url, json={'title': menu.title})
+        assert response.status_code == HTTPStatus.OK, (
+            f'PATCH-запрос к `{MENU_OBJ_URL}` с неизменным названием меню '
+            'должен возвращать статус 200'
+        )
+
 
 class TestDeleteMenu:
 
@@ -313,3 +430,145 @@ class TestDeleteMenu:
             f'`{MENU_OBJ_URL}` меню с `id` равным `menu_id` '
             'удаляется из базы'
         )
+
+
+class TestSoftDeleteMenu:
+
+    @pytest.fixture(autouse=True)
+    def soft_delete(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(settings, 'menu_soft_delete', True)
+
+    async def test_menu_soft_delete_hides_menu(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        await client.get(reverse(GET_MENU, menu_id=menu.id))
+        response = await client.delete(reverse(DELETE_MENU, menu_id=menu.id))
+        assert response.status_code == HTTPStatus.OK, (
+            f'DELETE-запрос к `{MENU_OBJ_URL}` в режиме мягкого удаления '
+            'должен возвращать статус 200'
+        )
+        urls = [
+            reverse(GET_MENU, menu_id=menu.id),
+            reverse(GET_SUBMENU, menu_id=menu.id, submenu_id=submenu.id),
+            reverse(GET_DISH, menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id),
+            reverse(DELETE_MENU, menu_id=menu.id),
+        ]
+        for url in urls[:3]:
+            response = await client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'GET-запрос к `{url}` должен возвращать статус 404 '
+                'после мягкого удаления меню'
+            )
+        response = await client.delete(urls[3])
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Повторный DELETE-запрос к `{MENU_OBJ_URL}` должен возвращать '
+            'статус 404 после мягкого удаления меню'
+        )
+        for url in (reverse(GET_ALL_MENUS), reverse(GET_ALL_NESTED)):
+            response = await client.get(url)
+            assert response.json() == [], (
+                f'GET-запрос к `{url}` не должен возвращать меню, '
+                'помеченные удаленными'
+            )
+
+    async def test_menu_soft_delete_keeps_rows(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        dish: Dish
+    ):
+        await client.delete(reverse(DELETE_MENU, menu_id=menu.id))
+        async with TestingSessionLocal() as session:
+            deleted_at = await session.scalar(
+                select(Menu.deleted_at).where(Menu.id == menu.id)
+            )
+            dishes_count = await session.scalar(select(func.count(Dish.id)))
+        assert deleted_at is not None and dishes_count == 1, (
+            f'DELETE-запрос к `{MENU_OBJ_URL}` в режиме мягкого удаления '
+            'должен только помечать меню удаленным'
+        )
+
+    async def test_menu_purge_in_batches(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        dish: Dish,
+        dish_another: Dish
+    ):
+        await client.delete(reverse(DELETE_MENU, menu_id=menu.id))
+        sessions = SessionProvider(TestingSessionLocal)
+        crud = CRUDMenu(sessions)
+        try:
+            assert await crud.get_deleted_ids() == [menu.id]
+            batches = []
+            while deleted := await crud.purge_batch(menu.id, batch_size=1):
+                batches.append(deleted)
+        finally:
+            await sessions.close()
+        assert batches == [1, 1, 1], (
+            'Блюда и подменю удаленного меню должны удаляться '
+            'порциями не больше `batch_size` строк'
+        )
+        async with TestingSessionLocal() as session:
+            menus_count = await session.scalar(select(func.count(Menu.id)))
+            submenus_count = await session.scalar(select(func.count(Submenu.id)))
+        assert menus_count == 0 and submenus_count == 0, (
+            'После очистки меню, подменю и блюда должны быть удалены из базы'
+        )
+
+    async def test_menu_soft_delete_releases_titles(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        await client.delete(reverse(DELETE_MENU, menu_id=menu.id))
+        response = await client.post(
+            reverse(CREATE_MENU),
+            json={'title': menu.title, 'description': 'menu_description'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'POST-запрос к `{MENUS_URL}` с названием меню, помеченного '
+            'удаленным, должен возвращать статус 201'
+        )
+        menu_id = response.json()['id']
+        response = await client.post(
+            reverse(CREATE_SUBMENU, menu_id=menu_id),
+            json={'title': submenu.title, 'description': 'submenu_description'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'POST-запрос к подменю с названием подменю удаленного меню '
+            'должен возвращать статус 201'
+        )
+        response = await client.post(
+            reverse(CREATE_DISH, menu_id=menu_id, submenu_id=response.json()['id']),
+            json={'title': dish.title, 'description': 'dish_description', 'price': '10'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'POST-запрос к блюдам с названием блюда удаленного меню '
+            'должен возвращать статус 201'
+        )
+
+    async def test_menu_soft_delete_allows_rename(
+        self,
+        client: AsyncClient,
+        menu: Menu
+    ):
+        await client.delete(reverse(DELETE_MENU, menu_id=menu.id))
+        response = await client.post(
+            reverse(CREATE_MENU),
+            json={'title': 'menu_title', 'description': 'menu_description'}
+        )
+        response = await client.patch(
+            reverse(UPDATE_MENU, menu_id=response.json()['id']),
+            json={'title': menu.title}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'PATCH-запрос к `{MENU_OBJ_URL}` с названием меню, помеченного '
+            'удаленным, должен возвращать статус 200'
+        )
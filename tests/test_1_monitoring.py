@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db import SessionProvider
+
+from .conftest import Dish, Menu, Submenu, TestingSessionLocal
+from .constants import DB_POOL_STATS_URL, GET_ALL_NESTED, GET_DB_POOL_STATS, GET_DISH
+from .utils import reverse
+
+
+class TestGetDbPoolStats:
+
+    async def test_db_pool_stats_get(self, client: AsyncClient):
+        url = reverse(GET_DB_POOL_STATS)
+        response = await client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'GET-запрос к `{DB_POOL_STATS_URL}` должен возвращать статус 200'
+        )
+        expected_fields = {
+            'pool_size',
+            'checked_out',
+            'overflow',
+            'checkouts',
+            'wait_time_avg',
+            'wait_time_max',
+            'statement_timeouts',
+            'lock_timeouts'
+        }
+        assert set(response.json()) == expected_fields, (
+            f'GET-запрос к `{DB_POOL_STATS_URL}` должен возвращать '
+            f'поля {expected_fields}'
+        )
+
+
+class TestQueryTimeouts:
+
+    @pytest.mark.parametrize('statement_timeout, expected', [
+        (None, None),
+        (600000, '10min'),
+    ])
+    async def test_session_timeouts(
+        self,
+        statement_timeout: int | None,
+        expected: str | None,
+        monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, 'db_statement_timeout', 1500)
+        monkeypatch.setattr(settings, 'db_lock_timeout', 700)
+        sessions = SessionProvider(TestingSessionLocal, statement_timeout=statement_timeout)
+        try:
+            for _ in range(2):
+                statement = await sessions.session.scalar(text('SHOW statement_timeout'))
+                lock = await sessions.session.scalar(text('SHOW lock_timeout'))
+                await sessions.session.commit()
+                assert statement == (expected or '1500ms'), (
+                    'Ограничение времени запросов должно задаваться '
+                    'для каждой транзакции сессии'
+                )
+                assert lock == '700ms', (
+                    'Ограничение ожидания блокировок должно задаваться '
+                    'для каждой транзакции сессии'
+                )
+        finally:
+            await sessions.close()
+
+    async def test_point_read_timeout_returns_503(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish,
+        monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, 'db_statement_timeout', 100)
+        url = reverse(GET_DISH, menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id)
+        async with TestingSessionLocal() as session:
+            await session.execute(text('LOCK TABLE dish IN ACCESS EXCLUSIVE MODE'))
+            response = await client.get(url)
+            await session.rollback()
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE, (
+            'Запрос API должен прерываться по `db_statement_timeout` '
+            'и возвращать статус 503'
+        )
+
+    async def test_nested_timeout_returns_503(
+        self,
+        client: AsyncClient,
+        dish: Dish,
+        monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, 'db_nested_statement_timeout', 100)
+        stats_url = reverse(GET_DB_POOL_STATS)
+        timeouts_before = (await client.get(stats_url)).json()['statement_timeouts']
+        async with TestingSessionLocal() as session:
+            await session.execute(text('LOCK TABLE dish IN ACCESS EXCLUSIVE MODE'))
+            response = await client.get(reverse(GET_ALL_NESTED))
+            await session.rollback()
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE, (
+            'Запрос, прерванный по `statement_timeout`, '
+            'должен возвращать статус 503'
+        )
+        timeouts_after = (await client.get(stats_url)).json()['statement_timeouts']
+        assert timeouts_after == timeouts_before + 1, (
+            f'GET-запрос к `{DB_POOL_STATS_URL}` должен учитывать '
+            'запросы, прерванные по таймауту'
+        )
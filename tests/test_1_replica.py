@@ -0,0 +1,85 @@
+from typing import AsyncIterator
+
+import pytest
+from httpx import AsyncClient
+
+from app.core import redis_cache
+from app.core.db import SessionProvider
+from app.crud.menu import CRUDMenu
+
+from .conftest import Menu, TestingSessionLocal
+from .constants import CREATE_MENU, UPDATE_MENU
+from .utils import reverse
+
+
+@pytest.fixture
+def replicas(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Настройка чтения с реплики и закрепления за основной базой."""
+    monkeypatch.setattr(redis_cache, 'replica_urls', ['replica'])
+    monkeypatch.setattr(redis_cache.settings, 'db_replica_pin_seconds', 10)
+
+
+@pytest.fixture
+async def sessions() -> AsyncIterator[SessionProvider]:
+    """Источник сессий с отдельной сессией для чтения."""
+    sessions = SessionProvider(TestingSessionLocal, TestingSessionLocal)
+    yield sessions
+    await sessions.close()
+
+
+class TestReadSession:
+
+    async def test_read_session_without_replicas(self):
+        sessions = SessionProvider(TestingSessionLocal)
+        crud = CRUDMenu(sessions)
+        assert await crud.get_read_session() is sessions.session, (
+            'Без реплик чтение должно выполняться в основной базе'
+        )
+        await sessions.close()
+
+    async def test_read_session_uses_replica(
+        self,
+        replicas: None,
+        sessions: SessionProvider
+    ):
+        crud = CRUDMenu(sessions)
+        assert await crud.get_read_session() is sessions.read_session, (
+            'До изменения данных чтение должно выполняться с реплики'
+        )
+
+    async def test_read_session_pinned_after_write(
+        self,
+        replicas: None,
+        client: AsyncClient,
+        sessions: SessionProvider
+    ):
+        await client.post(
+            reverse(CREATE_MENU),
+            json={'title': 'menu_title', 'description': 'menu_description'}
+        )
+        crud = CRUDMenu(sessions)
+        assert await crud.get_read_session() is sessions.session, (
+            'После изменения данных чтение должно закрепляться '
+            'за основной базой'
+        )
+
+    async def test_primary_pinned_before_commit(
+        self,
+        replicas: None,
+        monkeypatch: pytest.MonkeyPatch,
+        client: AsyncClient,
+        menu: Menu
+    ):
+        pinned = []
+        update_or_404 = CRUDMenu.update_or_404
+
+        async def spy(self, *args, **kwargs):
+            pinned.append(await redis_cache.cache.is_primary_pinned())
+            return await update_or_404(self, *args, **kwargs)
+
+        monkeypatch.setattr(CRUDMenu, 'update_or_404', spy)
+        await client.patch(reverse(UPDATE_MENU, menu_id=menu.id), json={'title': 'menu_title_changed'})
+        assert pinned == [True], (
+            'Чтение должно закрепляться за основной базой '
+            'до фиксации изменений'
+        )
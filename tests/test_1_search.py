@@ -0,0 +1,142 @@
+from http import HTTPStatus
+
+from httpx import AsyncClient
+
+from app.core.redis_cache import SEARCH_PREFIX, cache
+
+from .conftest import Dish, Menu, Submenu
+from .constants import SEARCH_DISHES, SEARCH_URL, UPDATE_DISH
+from .utils import reverse
+
+
+class TestSearchDishes:
+
+    async def test_search_by_dish_title(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(SEARCH_DISHES)
+        response = await client.get(url, params={'q': 'dish_title'})
+        assert response.status_code == HTTPStatus.OK, (
+            f'GET-запрос к `{SEARCH_URL}` должен возвращать статус 200'
+        )
+        assert response.json() == [
+            {
+                'id': str(dish.id),
+                'title': dish.title,
+                'description': dish.description,
+                'price': f'{dish.price:.2f}',
+                'discount': '0%',
+                'submenu_id': str(submenu.id),
+                'menu_id': str(menu.id)
+            }
+        ], (
+            f'GET-запрос к `{SEARCH_URL}` должен возвращать блюда, '
+            'название которых соответствует запросу'
+        )
+
+    async def test_search_by_description(
+        self,
+        client: AsyncClient,
+        dish: Dish
+    ):
+        url = reverse(SEARCH_DISHES)
+        response = await client.get(url, params={'q': 'description'})
+        assert [obj['id'] for obj in response.json()] == [str(dish.id)], (
+            f'GET-запрос к `{SEARCH_URL}` должен находить блюда по описанию'
+        )
+
+    async def test_search_by_menu_title(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        dish: Dish
+    ):
+        url = reverse(SEARCH_DISHES)
+        response = await client.get(url, params={'q': menu.title})
+        assert [obj['id'] for obj in response.json()] == [str(dish.id)], (
+            f'GET-запрос к `{SEARCH_URL}` должен находить блюда '
+            'по названию меню'
+        )
+
+    async def test_search_with_typo(
+        self,
+        client: AsyncClient,
+        dish: Dish
+    ):
+        url = reverse(SEARCH_DISHES)
+        response = await client.get(url, params={'q': 'dish_titel'})
+        assert [obj['id'] for obj in response.json()] == [str(dish.id)], (
+            f'GET-запрос к `{SEARCH_URL}` должен находить блюда '
+            'по запросу с опечаткой'
+        )
+
+    async def test_search_no_results(
+        self,
+        client: AsyncClient,
+        dish: Dish
+    ):
+        url = reverse(SEARCH_DISHES)
+        response = await client.get(url, params={'q': 'unexisting'})
+        assert response.json() == [], (
+            f'GET-запрос к `{SEARCH_URL}` должен возвращать пустой список, '
+            'если подходящих блюд нет'
+        )
+
+    async def test_search_pagination(
+        self,
+        client: AsyncClient,
+        dish: Dish,
+        dish_another: Dish
+    ):
+        url = reverse(SEARCH_DISHES)
+        first_page = await client.get(url, params={'q': 'dish', 'limit': 1})
+        second_page = await client.get(url, params={'q': 'dish', 'limit': 1, 'offset': 1})
+        found = [obj['id'] for obj in first_page.json() + second_page.json()]
+        assert sorted(found) == sorted([str(dish.id), str(dish_another.id)]), (
+            f'GET-запрос к `{SEARCH_URL}` должен возвращать результаты '
+            'постранично в соответствии с `limit` и `offset`'
+        )
+
+    async def test_search_empty_query(self, client: AsyncClient):
+        url = reverse(SEARCH_DISHES)
+        response = await client.get(url, params={'q': ''})
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, (
+            f'GET-запрос к `{SEARCH_URL}` с пустым запросом '
+            'должен возвращать статус 422'
+        )
+
+    async def test_search_cache_invalidated_on_dish_update(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(SEARCH_DISHES)
+        await client.get(url, params={'q': 'dish_title'})
+        update_url = reverse(UPDATE_DISH, menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id)
+        await client.patch(update_url, json={'title': 'dish_title_changed'})
+        response = await client.get(url, params={'q': 'dish_title'})
+        assert [obj['title'] for obj in response.json()] == ['dish_title_changed'], (
+            f'GET-запрос к `{SEARCH_URL}` не должен возвращать устаревшие '
+            'результаты после изменения блюда'
+        )
+
+    async def test_search_results_cached_separately(
+        self,
+        client: AsyncClient,
+        dish: Dish
+    ):
+        url = reverse(SEARCH_DISHES)
+        await client.get(url, params={'q': 'dish_title'})
+        await client.get(url, params={'q': 'description'})
+        keys = [key async for key in cache.client.scan_iter(match=f'{SEARCH_PREFIX}:*')]
+        ttls = [await cache.client.ttl(key) for key in keys]
+        assert len(keys) == 2 and all(ttl > 0 for ttl in ttls), (
+            f'Результаты GET-запросов к `{SEARCH_URL}` должны кэшироваться '
+            'в отдельных ключах с собственным временем жизни'
+        )
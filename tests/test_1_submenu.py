@@ -8,13 +8,17 @@ from sqlalchemy import func, select
 from .conftest import Menu, Submenu, TestingSessionLocal
 from .constants import (
     CREATE_SUBMENU,
+    CREATE_SUBMENUS_BULK,
     DELETE_SUBMENU,
+    DELETE_SUBMENUS_BULK,
     GET_ALL_SUBMENUS,
     GET_SUBMENU,
     SUBMENU_OBJ_URL,
+    SUBMENUS_BULK_URL,
     SUBMENUS_URL,
     UNEXISTING_UUID,
     UPDATE_SUBMENU,
+    UPDATE_SUBMENUS_BULK,
 )
 from .utils import reverse
 
@@ -130,6 +134,40 @@ class TestCreateSubmenu:
             'равным `menu_id` из `url`'
         )
 
+    async def test_submenu_post_duplicate_title(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu
+    ):
+        url = reverse(CREATE_SUBMENU, menu_id=menu.id)
+        json = {
+            'title': submenu.title,
+            'description': 'submenu_description'
+        }
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'POST-запрос к `{SUBMENUS_URL}` с названием уже существующего субменю '
+            'должен возвращать статус 400'
+        )
+
+    async def test_submenu_post_duplicate_title_if_menu_404(
+        self,
+        client: AsyncClient,
+        submenu: Submenu
+    ):
+        url = reverse(CREATE_SUBMENU, menu_id=UNEXISTING_UUID)
+        json = {
+            'title': submenu.title,
+            'description': 'submenu_description'
+        }
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'POST-запрос к `{SUBMENUS_URL}` с названием уже существующего субменю '
+            'должен возвращать статус 400, даже если меню с `menu_id` '
+            'отсутствует в базе'
+        )
+
     @pytest.mark.parametrize('submenu_title', [None, True, 123])
     async def test_submenu_post_invalid_title(
         self,
@@ -424,3 +462,182 @@ class TestDeleteSubmenu:
             f'Убедитесь, что в результате DELETE-запроса к `{SUBMENU_OBJ_URL}` '
             'субменю с `id` равным `submenu_id` удаляется из базы'
         )
+
+
+class TestBulkSubmenus:
+
+    async def test_submenu_bulk_post(
+        self,
+        client: AsyncClient,
+        menu: Menu
+    ):
+        url = reverse(CREATE_SUBMENUS_BULK, menu_id=menu.id)
+        json = [
+            {'title': f'submenu_{i}', 'description': 'submenu_description'}
+            for i in range(3)
+        ]
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'POST-запрос к `{SUBMENUS_BULK_URL}` должен возвращать статус 201'
+        )
+        assert [obj['title'] for obj in response.json()] == [obj['title'] for obj in json], (
+            f'POST-запрос к `{SUBMENUS_BULK_URL}` должен возвращать '
+            'созданные субменю в порядке их передачи'
+        )
+        async with TestingSessionLocal() as session:
+            submenus_count = await session.scalar(
+                select(func.count(Submenu.id)).where(Submenu.menu_id == menu.id)
+            )
+        assert submenus_count == len(json), (
+            f'Убедитесь, что в результате POST-запроса к `{SUBMENUS_BULK_URL}` '
+            'в базе создаются все переданные субменю'
+        )
+
+    async def test_submenu_bulk_post_if_menu_404(self, client: AsyncClient):
+        url = reverse(CREATE_SUBMENUS_BULK, menu_id=UNEXISTING_UUID)
+        json = [{'title': 'submenu_title', 'description': 'submenu_description'}]
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'POST-запрос к `{SUBMENUS_BULK_URL}` должен возвращать статус 404, '
+            'если меню с `menu_id` отсутствует в базе'
+        )
+
+    async def test_submenu_bulk_post_duplicate_title(
+        self,
+        client: AsyncClient,
+        menu: Menu
+    ):
+        url = reverse(CREATE_SUBMENUS_BULK, menu_id=menu.id)
+        json = [
+            {'title': 'submenu_new', 'description': 'submenu_description'},
+            {'title': 'submenu_new', 'description': 'submenu_description'}
+        ]
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'POST-запрос к `{SUBMENUS_BULK_URL}` с повторяющимися '
+            'названиями должен возвращать статус 400'
+        )
+        async with TestingSessionLocal() as session:
+            submenus_count = await session.scalar(select(func.count(Submenu.id)))
+        assert submenus_count == 0, (
+            f'Убедитесь, что при ошибке POST-запроса к `{SUBMENUS_BULK_URL}` '
+            'не создается ни одно субменю'
+        )
+
+    @pytest.mark.parametrize('json', [[], [{'title': 'submenu_title'}]])
+    async def test_submenu_bulk_post_invalid(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        json: list[dict[str, Any]]
+    ):
+        url = reverse(CREATE_SUBMENUS_BULK, menu_id=menu.id)
+        response = await client.post(url, json=json)
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, (
+            f'POST-запрос к `{SUBMENUS_BULK_URL}` с пустым списком '
+            'или невалидным субменю должен возвращать статус 422'
+        )
+
+    async def test_submenu_bulk_patch(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu
+    ):
+        url = reverse(UPDATE_SUBMENUS_BULK, menu_id=menu.id)
+        json = [{'id': str(submenu.id), 'title': 'submenu_title_changed'}]
+        response = await client.patch(url, json=json)
+        assert response.status_code == HTTPStatus.OK, (
+            f'PATCH-запрос к `{SUBMENUS_BULK_URL}` должен возвращать статус 200'
+        )
+        assert response.json() == [
+            {
+                'id': str(submenu.id),
+                'title': 'submenu_title_changed',
+                'description': submenu.description,
+                'menu_id': str(menu.id)
+            }
+        ], (
+            f'PATCH-запрос к `{SUBMENUS_BULK_URL}` должен возвращать '
+            'обновленные субменю'
+        )
+
+    async def test_submenu_bulk_patch_404(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu
+    ):
+        url = reverse(UPDATE_SUBMENUS_BULK, menu_id=menu.id)
+        json = [
+            {'id': str(submenu.id), 'title': 'submenu_title_changed'},
+            {'id': UNEXISTING_UUID, 'title': 'submenu_title_unexisting'}
+        ]
+        response = await client.patch(url, json=json)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'PATCH-запрос к `{SUBMENUS_BULK_URL}` должен возвращать статус 404, '
+            'если хотя бы одно субменю отсутствует в базе'
+        )
+        async with TestingSessionLocal() as session:
+            title = await session.scalar(
+                select(Submenu.title).where(Submenu.id == submenu.id)
+            )
+        assert title == submenu.title, (
+            f'Убедитесь, что при ошибке PATCH-запроса к `{SUBMENUS_BULK_URL}` '
+            'ни одно субменю не изменяется'
+        )
+
+    async def test_submenu_bulk_delete(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu
+    ):
+        url = reverse(DELETE_SUBMENUS_BULK, menu_id=menu.id)
+        response = await client.request('DELETE', url, json=[str(submenu.id)])
+        assert response.status_code == HTTPStatus.OK, (
+            f'DELETE-запрос к `{SUBMENUS_BULK_URL}` должен возвращать статус 200'
+        )
+        async with TestingSessionLocal() as session:
+            submenus_count = await session.scalar(select(func.count(Submenu.id)))
+        assert submenus_count == 0, (
+            f'Убедитесь, что в результате DELETE-запроса к `{SUBMENUS_BULK_URL}` '
+            'субменю удаляются из базы'
+        )
+
+    async def test_submenu_bulk_delete_404(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu
+    ):
+        url = reverse(DELETE_SUBMENUS_BULK, menu_id=menu.id)
+        response = await client.request(
+            'DELETE', url, json=[str(submenu.id), UNEXISTING_UUID]
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'DELETE-запрос к `{SUBMENUS_BULK_URL}` должен возвращать статус 404, '
+            'если хотя бы одно субменю отсутствует в базе'
+        )
+        async with TestingSessionLocal() as session:
+            submenus_count = await session.scalar(select(func.count(Submenu.id)))
+        assert submenus_count == 1, (
+            f'Убедитесь, что при ошибке DELETE-запроса к `{SUBMENUS_BULK_URL}` '
+            'ни одно субменю не удаляется'
+        )
+
+    async def test_submenu_bulk_patch_invalidates_cache(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu
+    ):
+        obj_url = reverse(GET_SUBMENU, menu_id=menu.id, submenu_id=submenu.id)
+        await client.get(obj_url)
+        url = reverse(UPDATE_SUBMENUS_BULK, menu_id=menu.id)
+        await client.patch(url, json=[{'id': str(submenu.id), 'title': 'submenu_title_changed'}])
+        response = await client.get(obj_url)
+        assert response.json()['title'] == 'submenu_title_changed', (
+            f'Убедитесь, что после PATCH-запроса к `{SUBMENUS_BULK_URL}` '
+            'кэш измененных субменю инвалидируется'
+        )
@@ -0,0 +1,452 @@
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import openpyxl
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from watchfiles import Change
+
+from app.core.config import settings
+from app.core.db import SessionProvider
+from app.core.exceptions import IncorrectTableError
+from app.core.redis_cache import DISCOUNT_PREFIX, cache
+from app.schemas.table import DishTable, MenuTable, SubmenuTable
+from app.services import googke_service
+from app.services.googke_service import GoogleService
+from app.tasks import utils, watcher
+from app.tasks.utils import (
+    _check_table_data,
+    apply_table_data,
+    compare_data,
+    get_source_path,
+    get_table_data,
+    read_workbook_rows,
+    sync_table_source,
+)
+
+from .conftest import Dish, Menu, Submenu, TestingSessionLocal
+from .constants import CREATE_MENU, DELETE_MENU, GET_ALL_NESTED, GET_DISH
+from .utils import FakeDriveService, FakeSheetsService, reverse
+
+
+def make_table(
+    dish_title: str = 'dish_title',
+    discount: str | None = None
+) -> list[MenuTable]:
+    """Табличные данные с одним меню, подменю и блюдом."""
+    return [
+        MenuTable(
+            title='menu_title_fixture',
+            description='menu_description',
+            submenus=[
+                SubmenuTable(
+                    title='submenu_title',
+                    description='submenu_description',
+                    dishes=[
+                        DishTable(
+                            title=dish_title,
+                            description='dish_description',
+                            price=10.0,
+                            discount=discount
+                        )
+                    ]
+                )
+            ]
+        )
+    ]
+
+
+async def sync(table_data: list[MenuTable]) -> None:
+    """Синхронизация базы данных с табличными данными."""
+    sessions = SessionProvider(TestingSessionLocal)
+    try:
+        await apply_table_data(sessions, table_data)
+    finally:
+        await sessions.close()
+
+
+async def sync_source() -> None:
+    """Синхронизация базы данных с источником табличных данных."""
+    sessions = SessionProvider(TestingSessionLocal)
+    try:
+        await sync_table_source(sessions)
+    finally:
+        await sessions.close()
+
+
+class TestTableReader:
+
+    def test_read_workbook(self):
+        table_data = get_table_data()
+        assert table_data and all(menu.submenus for menu in table_data), (
+            'Данные из xlsx-файла должны преобразовываться в меню с подменю'
+        )
+
+    def test_read_workbook_skips_trailing_blank_rows(self):
+        rows = list(read_workbook_rows(get_source_path()))
+        assert rows and any(value is not None for value in rows[-1]), (
+            'Чтение xlsx-файла должно заканчиваться последней строкой с данными'
+        )
+
+    def test_read_workbook_rows_after_blank_gap(self, tmp_path: Path):
+        file_path = tmp_path / 'menu.xlsx'
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.append(['1', 'menu_title', 'menu_description'])
+        worksheet.cell(row=1000, column=1, value='2')
+        worksheet.cell(row=1000, column=2, value='menu_title_another')
+        worksheet.cell(row=1000, column=3, value='menu_description')
+        workbook.save(file_path)
+        rows = list(read_workbook_rows(file_path))
+        assert len(rows) == 1000 and rows[-1][1] == 'menu_title_another', (
+            'Строки с данными после большого числа пустых строк '
+            'должны читаться из xlsx-файла'
+        )
+
+    def test_check_table_first_row(self):
+        rows = [['', '', 'submenu_title', 'submenu_description', '', '', '']]
+        with pytest.raises(IncorrectTableError):
+            list(_check_table_data(rows))
+
+
+class TestCompareData:
+
+    def test_compare_matches_by_title(self):
+        db_data = [
+            {
+                'id': 'menu_id',
+                'title': 'menu_title_fixture',
+                'description': 'menu_description',
+                'submenus': [
+                    {
+                        'id': 'submenu_id',
+                        'title': 'submenu_title',
+                        'description': 'submenu_description',
+                        'menu_id': 'menu_id',
+                        'dishes': [
+                            {
+                                'id': 'dish_id',
+                                'title': 'dish_title',
+                                'description': 'dish_description',
+                                'price': 10.0,
+                                'submenu_id': 'submenu_id'
+                            },
+                            {
+                                'id': 'dish_removed_id',
+                                'title': 'dish_removed',
+                                'description': 'dish_description',
+                                'price': 10.0,
+                                'submenu_id': 'submenu_id'
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'id': 'menu_removed_id',
+                'title': 'menu_removed',
+                'description': 'menu_description',
+                'submenus': []
+            }
+        ]
+        diff = compare_data(make_table(), db_data)  # type: ignore[arg-type]
+        assert [menu['id'] for menu in diff.deleted_menus] == ['menu_removed_id'], (
+            'Меню, отсутствующие в таблице, должны попадать в список удаляемых'
+        )
+        assert diff.deleted_submenus == [], (
+            'Подменю, присутствующие в таблице, не должны удаляться'
+        )
+        assert [(menu_id, dish['id']) for menu_id, dish in diff.deleted_dishes] == [
+            ('menu_id', 'dish_removed_id')
+        ], (
+            'Блюда, отсутствующие в таблице, должны попадать в список удаляемых'
+        )
+        dish_pair = diff.menus[0].submenus[0].dishes[0]
+        assert dish_pair.db is not None and dish_pair.db['id'] == 'dish_id', (
+            'Блюдо из таблицы должно сопоставляться с блюдом из бд по названию'
+        )
+
+
+class TestSyncDatabaseData:
+
+    async def test_sync_creates_data(self):
+        await sync(make_table())
+        async with TestingSessionLocal() as session:
+            titles = (
+                await session.execute(
+                    select(Menu.title, Submenu.title, Dish.title)
+                    .join(Submenu, Submenu.menu_id == Menu.id)
+                    .join(Dish, Dish.submenu_id == Submenu.id)
+                )
+            ).all()
+        assert titles == [('menu_title_fixture', 'submenu_title', 'dish_title')], (
+            'Синхронизация должна создавать в бд данные из таблицы'
+        )
+
+    async def test_sync_replaces_missing_dish(self, dish: Dish):
+        await sync(make_table(dish_title='dish_new_title'))
+        async with TestingSessionLocal() as session:
+            dish_titles = (await session.scalars(select(Dish.title))).all()
+        assert dish_titles == ['dish_new_title'], (
+            'Синхронизация должна удалять из бд блюда, отсутствующие в таблице, '
+            'и создавать новые'
+        )
+
+    async def test_sync_skips_unchanged_table(self):
+        await sync(make_table())
+        async with TestingSessionLocal() as session:
+            await session.execute(delete(Dish))
+            await session.commit()
+        await sync(make_table())
+        async with TestingSessionLocal() as session:
+            dishes_count = len((await session.scalars(select(Dish.id))).all())
+        assert dishes_count == 0, (
+            'Синхронизация не должна сверять данные, если отпечаток '
+            'таблицы не изменился'
+        )
+
+    async def test_sync_reconciles_changed_menus_only(self):
+        table_data = make_table()
+        table_data.append(MenuTable(title='menu_other', description='menu_description'))
+        await sync(table_data)
+        async with TestingSessionLocal() as session:
+            await session.execute(delete(Menu).where(Menu.title == 'menu_other'))
+            await session.commit()
+        table_data[0].description = 'menu_description_changed'
+        await sync(table_data)
+        async with TestingSessionLocal() as session:
+            menus = dict((await session.execute(select(Menu.title, Menu.description))).all())
+        assert menus == {'menu_title_fixture': 'menu_description_changed'}, (
+            'Синхронизация должна сверять только меню, '
+            'отпечатки которых изменились'
+        )
+
+    async def test_sync_is_atomic(self):
+        table_data = make_table()
+        table_data.append(
+            MenuTable(
+                title='menu_other',
+                description='menu_description',
+                submenus=[
+                    SubmenuTable(title='submenu_title', description='submenu_description')
+                ]
+            )
+        )
+        with pytest.raises(IntegrityError):
+            await sync(table_data)
+        async with TestingSessionLocal() as session:
+            menus_count = await session.scalar(select(func.count(Menu.id)))
+        assert menus_count == 0, (
+            'При ошибке синхронизации не должно применяться ни одно изменение'
+        )
+
+    async def test_sync_recreates_soft_deleted_menu(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+        menu: Menu,
+        dish: Dish
+    ):
+        monkeypatch.setattr(settings, 'menu_soft_delete', True)
+        await client.delete(reverse(DELETE_MENU, menu_id=menu.id))
+        await sync(make_table())
+        async with TestingSessionLocal() as session:
+            menus = (await session.execute(select(Menu.id, Menu.deleted_at))).all()
+        assert len(menus) == 1 and menus[0].id != menu.id and menus[0].deleted_at is None, (
+            'Синхронизация должна удалять помеченное удаленным меню '
+            'и создавать его заново по данным таблицы'
+        )
+
+    async def test_sync_sets_discount(self, client: AsyncClient):
+        await sync(make_table(discount='10%'))
+        response = await client.get(reverse(GET_ALL_NESTED))
+        dish = response.json()[0]['submenus'][0]['dishes'][0]
+        assert (dish['discount'], dish['price']) == ('10%', '9.00'), (
+            'Синхронизация должна записывать скидки блюд в кэш'
+        )
+
+    async def test_sync_invalidates_cached_dish(
+        self,
+        client: AsyncClient,
+        menu: Menu,
+        submenu: Submenu,
+        dish: Dish
+    ):
+        url = reverse(GET_DISH, menu_id=menu.id, submenu_id=submenu.id, dish_id=dish.id)
+        await client.get(url)
+        await sync(make_table(discount='10%'))
+        response = await client.get(url)
+        assert response.json()['discount'] == '10%', (
+            'Синхронизация должна инвалидировать кэш блюд с изменившейся скидкой'
+        )
+
+    async def test_sync_removes_discount_of_deleted_dish(self):
+        await sync(make_table(discount='10%'))
+        async with TestingSessionLocal() as session:
+            menu_id, submenu_id, dish_id = (await session.execute(select(Dish.menu_id, Dish.submenu_id, Dish.id))).one()
+        await sync(make_table(dish_title='dish_new_title'))
+        assert await cache.get(f'{DISCOUNT_PREFIX}:{menu_id}:{submenu_id}:{dish_id}') is None, (
+            'Синхронизация должна удалять из кэша скидки удаленных блюд'
+        )
+
+
+class TestSourceChanges:
+
+    @pytest.fixture
+    def reads(self, monkeypatch: pytest.MonkeyPatch) -> list[int]:
+        """Подмена источника данных с подсчетом чтений таблицы."""
+        reads: list[int] = []
+
+        def read_table() -> list[MenuTable]:
+            reads.append(1)
+            return make_table()
+
+        monkeypatch.setattr(utils, 'get_source_signature', lambda: 'signature')
+        monkeypatch.setattr(utils, 'get_table_data', read_table)
+        return reads
+
+    async def test_sync_skips_unchanged_source(self, reads: list[int]):
+        await sync_source()
+        await sync_source()
+        assert len(reads) == 1, (
+            'Таблица не должна читаться, если сигнатура источника не изменилась'
+        )
+
+    async def test_sync_reads_changed_source(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        reads: list[int]
+    ):
+        await sync_source()
+        monkeypatch.setattr(utils, 'get_source_signature', lambda: 'signature_changed')
+        await sync_source()
+        assert len(reads) == 2, (
+            'Таблица должна читаться при изменении сигнатуры источника'
+        )
+
+    async def test_sync_reads_source_after_api_change(
+        self,
+        client: AsyncClient,
+        reads: list[int]
+    ):
+        await sync_source()
+        await client.post(reverse(CREATE_MENU), json={'title': 'menu_api', 'description': 'description'})
+        await sync_source()
+        async with TestingSessionLocal() as session:
+            titles = (await session.scalars(select(Menu.title))).all()
+        assert (len(reads), titles) == (2, ['menu_title_fixture']), (
+            'После изменения данных через API таблица должна читаться заново'
+        )
+
+    async def test_sync_does_not_block_event_loop(self, monkeypatch: pytest.MonkeyPatch):
+        def read_table() -> list[MenuTable]:
+            time.sleep(0.2)
+            return make_table()
+
+        async def tick() -> int:
+            ticks = 0
+            while not task.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return ticks
+
+        monkeypatch.setattr(utils, 'get_source_signature', lambda: 'signature')
+        monkeypatch.setattr(utils, 'get_table_data', read_table)
+        task = asyncio.create_task(sync_source())
+        assert await tick() > 5, (
+            'Чтение таблицы не должно блокировать цикл событий'
+        )
+
+
+class TestWatcher:
+
+    def test_watcher_enqueues_sync(self, monkeypatch: pytest.MonkeyPatch):
+        source_path = utils.get_source_path().resolve()
+        calls: list[int] = []
+        monkeypatch.setattr(watcher, 'sync_table_db', SimpleNamespace(delay=lambda: calls.append(1)))
+        monkeypatch.setattr(
+            watcher,
+            'watch',
+            lambda *args, **kwargs: iter([{(Change.modified, str(source_path))}])
+        )
+        watcher.watch_source()
+        assert len(calls) == 2, (
+            'Наблюдатель должен запускать синхронизацию при старте '
+            'и после изменения файла'
+        )
+
+    def test_watcher_filters_other_files(self):
+        source_path = utils.get_source_path().resolve()
+        source_filter = watcher.SourceFilter(source_path)
+        assert source_filter(Change.modified, str(source_path)), (
+            'Наблюдатель должен реагировать на изменения файла с меню'
+        )
+        assert not source_filter(Change.added, str(source_path.with_name('other.xlsx'))), (
+            'Наблюдатель не должен реагировать на изменения других файлов'
+        )
+
+
+class TestGoogleSheets:
+
+    def test_read_values_in_pages(self, monkeypatch: pytest.MonkeyPatch):
+        rows = [[str(index)] for index in range(2500)]
+        sheets = FakeSheetsService(rows)
+        monkeypatch.setattr(googke_service, 'GOOGLE_SHEET_PAGE_ROWS', 100)
+        monkeypatch.setattr(googke_service, 'GOOGLE_SHEET_BATCH_PAGES', 3)
+        values = list(GoogleService(sheets, FakeDriveService()).read_values('sheet_id'))
+        assert values == rows, (
+            'Строки гугл-таблицы должны читаться полностью и по порядку'
+        )
+        assert len(sheets.batch_requests) == 9, (
+            'Страницы гугл-таблицы должны запрашиваться пакетами'
+        )
+
+    def test_read_values_bounded_batches(self, monkeypatch: pytest.MonkeyPatch):
+        rows = [[str(index)] for index in range(2500)]
+        sheets = FakeSheetsService(rows)
+        monkeypatch.setattr(googke_service, 'GOOGLE_SHEET_PAGE_ROWS', 100)
+        monkeypatch.setattr(googke_service, 'GOOGLE_SHEET_BATCH_PAGES', 3)
+        monkeypatch.setattr(googke_service, 'GOOGLE_SHEET_WORKERS', 2)
+        values = GoogleService(sheets, FakeDriveService()).read_values('sheet_id')
+        assert next(values) == rows[0]
+        time.sleep(0.1)
+        assert len(sheets.batch_requests) <= 2, (
+            'Одновременно должно запрашиваться не больше '
+            '`GOOGLE_SHEET_WORKERS` пакетов страниц гугл-таблицы'
+        )
+        assert [rows[0], *values] == rows, (
+            'Строки гугл-таблицы должны читаться полностью и по порядку'
+        )
+
+    def test_get_table_data_from_large_sheet(self, monkeypatch: pytest.MonkeyPatch):
+        rows = [
+            ['1', 'menu_title', 'menu_description'],
+            ['', '1', 'submenu_title', 'submenu_description'],
+            *(
+                ['', '', str(index), f'dish_{index}', 'dish_description', '10.5']
+                for index in range(150)
+            )
+        ]
+        service = GoogleService(FakeSheetsService(rows), FakeDriveService())
+        monkeypatch.setattr(utils, 'google_service', service)
+        monkeypatch.setattr(utils.settings, 'use_google_sheets', True)
+        table_data = get_table_data()
+        assert len(table_data[0].submenus[0].dishes) == 150, (
+            'Данные гугл-таблицы не должны обрезаться по количеству строк'
+        )
+
+    def test_google_client_is_lazy(self):
+        code = (
+            'import sys; import app.tasks.utils; '
+            'print(any(name.startswith(("googleapiclient", "google.oauth2")) for name in sys.modules))'
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == 'False', (
+            'Библиотеки Google не должны импортироваться до обращения к гугл-таблице'
+        )
@@ -1,3 +1,6 @@
+import re
+from typing import Any
+
 from starlette.datastructures import URLPath
 
 from .conftest import app
@@ -10,3 +13,76 @@ def reverse(viewname: str, **kwargs) -> URLPath:
     Path-параметры передаются именованными аргументами.
     """
     return app.url_path_for(viewname, **kwargs)
+
+
+class FakeRequest:
+    """Запрос поддельного клиента, возвращающий заданный ответ."""
+
+    def __init__(self, response: dict[str, Any]) -> None:
+        self.response = response
+
+    def execute(self, http: Any = None) -> dict[str, Any]:
+        return self.response
+
+
+class FakeSheetsService:
+    """
+    Локальная подделка клиента Google Sheets API.
+
+    Хранит строки первого листа и записывает диапазоны
+    каждого запроса `batchGet`.
+    """
+
+    def __init__(self, rows: list[list[Any]], title: str = 'Лист1') -> None:
+        self.rows = rows
+        self.title = title
+        self.batch_requests: list[list[str]] = []
+
+    def spreadsheets(self) -> 'FakeSheetsService':
+        return self
+
+    def values(self) -> 'FakeSheetsService':
+        return self
+
+    def get(self, spreadsheetId: str, fields: str) -> FakeRequest:  # noqa: N803
+        return FakeRequest(
+            {
+                'sheets': [
+                    {
+                        'properties': {
+                            'title': self.title,
+                            'gridProperties': {'rowCount': len(self.rows) + 100}
+                        }
+                    }
+                ]
+            }
+        )
+
+    def batchGet(  # noqa: N802
+        self,
+        spreadsheetId: str,  # noqa: N803
+        ranges: list[str],
+        valueRenderOption: str  # noqa: N803
+    ) -> FakeRequest:
+        self.batch_requests.append(ranges)
+        value_ranges = []
+        for value_range in ranges:
+            start, end = re.fullmatch(r".+!A(\d+):G(\d+)", value_range).groups()  # type: ignore[union-attr]
+            values = self.rows[int(start) - 1:int(end)]
+            while values and not any(values[-1]):
+                values = values[:-1]
+            value_ranges.append({'range': value_range, 'values': values})
+        return FakeRequest({'valueRanges': value_ranges})
+
+
+class FakeDriveService:
+    """Локальная подделка клиента Google Drive API."""
+
+    def __init__(self, version: str = '1') -> None:
+        self.version = version
+
+    def files(self) -> 'FakeDriveService':
+        return self
+
+    def get(self, fileId: str, fields: str) -> FakeRequest:  # noqa: N803
+        return FakeRequest({'version': self.version})